@@ -0,0 +1,67 @@
+"""
+Per-call latency of AIService against the local stub NIM server:
+a fresh httpx.AsyncClient per request (old behaviour) vs. the shared pooled client.
+
+Run from backend/:  python -m benchmarks.bench_ai_client --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stub_nim import run_stub_server
+from services.ai_service import AIService
+
+MESSAGES = [{"role": "user", "content": "Translate: ఈ రోజు మా వీధిలో డ్రైనేజీ పారుతోంది"}]
+
+
+def summarize(label: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<22} p50={statistics.median(samples) * 1000:7.2f} ms  p95={p95 * 1000:7.2f} ms  mean={statistics.mean(samples) * 1000:7.2f} ms")
+
+
+async def bench_fresh_client(url: str, n: int) -> list[float]:
+    samples = []
+    payload = {"model": "stub", "messages": MESSAGES, "stream": False}
+    for _ in range(n):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json=payload, timeout=30.0)
+            response.json()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_pooled_client(url: str, n: int) -> list[float]:
+    service = AIService()
+    service.api_key = "bench"
+    service.invoke_url = url
+    await service.startup()
+    samples = []
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            await service._call_nvidia_api(MESSAGES)
+            samples.append(time.perf_counter() - start)
+    finally:
+        await service.shutdown()
+    return samples
+
+
+async def main(n: int, port: int):
+    with run_stub_server(port=port) as url:
+        # Warm up the stub so the first sample is not an outlier
+        await bench_fresh_client(url, 5)
+        summarize("fresh client/request", await bench_fresh_client(url, n))
+        summarize("shared pooled client", await bench_pooled_client(url, n))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.port))
@@ -0,0 +1,103 @@
+"""
+Peak Python heap per voice request while a recording is ingested and handed to its two consumers
+(storage upload + transcription), for growing recording lengths.
+Compares the shared SpooledUpload path against reading the whole body into memory first.
+
+Run from backend/:  python -m benchmarks.bench_audio_ingest --sizes 1 8 32 128
+"""
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import anyio
+from fastapi import UploadFile
+
+from benchmarks.synthetic_audio import wav_recording
+from services.ingest_service import SpooledUpload, validate_audio
+
+MB = 1024 * 1024
+# boto3 multipart parts are read one chunk at a time; mirror that for the storage consumer
+UPLOAD_CHUNK = 8 * MB
+
+
+def drain(source, chunk_size: int = UPLOAD_CHUNK) -> int:
+    total = 0
+    while chunk := source.read(chunk_size):
+        total += len(chunk)
+    return total
+
+
+def drain_path(path: str) -> int:
+    with open(path, "rb") as f:
+        return drain(f, MB)
+
+
+def multipart_upload(path: str) -> UploadFile:
+    # What Starlette hands the endpoint: the form parser has already spooled the part to a temp file
+    spool = tempfile.SpooledTemporaryFile(max_size=MB)
+    with open(path, "rb") as f:
+        shutil.copyfileobj(f, spool, MB)
+    spool.seek(0)
+    return UploadFile(file=spool, filename="recording.wav")
+
+
+async def spooled_path(upload: UploadFile) -> int:
+    audio = await SpooledUpload.receive(upload, spool_threshold=0)
+    try:
+        await validate_audio(audio, max_seconds=10**6)
+
+        async def store():
+            with audio.reader() as source:
+                return await anyio.to_thread.run_sync(drain, source)
+
+        sizes = await asyncio.gather(store(), anyio.to_thread.run_sync(drain_path, audio.path))
+        return sizes[0]
+    finally:
+        audio.close()
+
+
+async def in_memory_path(upload: UploadFile) -> int:
+    body = await upload.read()
+    sizes = await asyncio.gather(
+        anyio.to_thread.run_sync(drain, io.BytesIO(body)),
+        anyio.to_thread.run_sync(drain, io.BytesIO(body)),
+    )
+    return sizes[0]
+
+
+async def measure(variant, path: str) -> tuple[float, float]:
+    upload = multipart_upload(path)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        await variant(upload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await upload.close()
+    return peak / MB, time.perf_counter() - start
+
+
+async def main(sizes: list[int]):
+    print(f"{'recording':>10} {'seconds':>8} {'spooled peak':>13} {'in-memory peak':>15} {'spooled time':>13}")
+    for size_mb in sizes:
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            f.write(wav_recording(size_mb * MB, seed=size_mb))
+        try:
+            spooled_peak, spooled_time = await measure(spooled_path, f.name)
+            memory_peak, _ = await measure(in_memory_path, f.name)
+        finally:
+            os.unlink(f.name)
+        seconds = size_mb * MB / 32000
+        print(f"{size_mb:>8} MB {seconds:>8.0f} {spooled_peak:>10.1f} MB {memory_peak:>12.1f} MB {spooled_time * 1000:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    asyncio.run(main(parser.parse_args().sizes))
@@ -0,0 +1,59 @@
+"""
+Time-to-first-token of /chat/complaint/stream vs. time-to-response of /chat/complaint,
+against the stub NIM server streaming one token every --token-latency seconds.
+
+Run from backend/:  python -m benchmarks.bench_chat_stream
+"""
+import argparse
+import asyncio
+import os
+import time
+
+NIM_PORT = 9300
+API_PORT = 9301
+
+os.environ.setdefault("NVIDIA_API_KEY", "bench")
+os.environ.setdefault("NVIDIA_API_URL", f"http://127.0.0.1:{NIM_PORT}/v1/chat/completions")
+# Every request comes from 127.0.0.1; the per-client budget would cap the run, not the app
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+
+from benchmarks.servers import serve_in_thread
+from benchmarks.stub_nim import run_stub_server
+
+REPLY = "Thank you for reporting this. How long has the drainage been overflowing on your street?"
+PAYLOAD = {"history": [{"role": "user", "content": "Drainage is overflowing"}], "language": "en"}
+
+
+async def run(base_url: str, turns: int):
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        for _ in range(turns):
+            start = time.perf_counter()
+            await client.post(f"{base_url}/api/v1/chat/complaint", json=PAYLOAD)
+            full = time.perf_counter() - start
+
+            start = time.perf_counter()
+            first_token = None
+            async with client.stream("POST", f"{base_url}/api/v1/chat/complaint/stream", json=PAYLOAD) as response:
+                async for line in response.aiter_lines():
+                    if first_token is None and line.startswith("data:") and '"token"' in line:
+                        first_token = time.perf_counter() - start
+            streamed = time.perf_counter() - start
+            print(f"blocking: {full * 1000:7.1f} ms | stream first token: {first_token * 1000:7.1f} ms, last event: {streamed * 1000:7.1f} ms")
+
+
+def main(turns: int, latency: float, token_latency: float):
+    with run_stub_server(port=NIM_PORT, latency=latency, content=REPLY, token_latency=token_latency):
+        from main import app
+        with serve_in_thread(app, API_PORT) as base_url:
+            asyncio.run(run(base_url, turns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-latency", type=float, default=0.03)
+    args = parser.parse_args()
+    main(args.turns, args.latency, args.token_latency)
@@ -0,0 +1,67 @@
+"""
+Bytes sent to the vision model and preprocessing latency, raw upload vs. preprocessed.
+Uses the images in --corpus if given, otherwise a synthetic set of phone-sized photos.
+
+Run from backend/:  python -m benchmarks.bench_image_preprocess [--corpus path/to/images]
+"""
+import argparse
+import asyncio
+import base64
+import io
+import pathlib
+import statistics
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from services.image_service import image_service
+
+SYNTHETIC_SIZES = [(4032, 3024), (3024, 4032), (4000, 2250), (2560, 1920), (1600, 1200)]
+
+
+def synthetic_corpus() -> list[tuple[str, bytes]]:
+    corpus = []
+    for i, size in enumerate(SYNTHETIC_SIZES):
+        img = Image.effect_noise(size, 40 + i * 10).convert("RGB")
+        draw = ImageDraw.Draw(img)
+        for j in range(0, size[0], 300):
+            draw.rectangle([j, size[1] // 3, j + 150, size[1] // 2], fill=(120, 80 + j % 100, 40))
+        img = img.filter(ImageFilter.GaussianBlur(1))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=95)
+        corpus.append((f"synthetic_{size[0]}x{size[1]}.jpg", out.getvalue()))
+    return corpus
+
+
+def load_corpus(path: str) -> list[tuple[str, bytes]]:
+    files = sorted(p for p in pathlib.Path(path).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp", ".heic"})
+    return [(p.name, p.read_bytes()) for p in files]
+
+
+async def main(corpus_path: str | None):
+    corpus = load_corpus(corpus_path) if corpus_path else synthetic_corpus()
+    raw_total = processed_total = 0
+    latencies = []
+    for name, contents in corpus:
+        start = time.perf_counter()
+        processed, mime_type = await image_service.preprocess(contents, "image/jpeg")
+        latencies.append(time.perf_counter() - start)
+        raw_b64 = len(base64.b64encode(contents))
+        processed_b64 = len(base64.b64encode(processed))
+        raw_total += raw_b64
+        processed_total += processed_b64
+        print(f"{name:<32} {raw_b64 / 1024:9.0f} KB -> {processed_b64 / 1024:7.0f} KB ({mime_type}) in {latencies[-1] * 1000:6.1f} ms")
+
+    print(f"\nbase64 payload total: {raw_total / 1024 / 1024:.2f} MB -> {processed_total / 1024 / 1024:.2f} MB "
+          f"({processed_total / raw_total:.1%}), preprocessing p50 {statistics.median(latencies) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(image_service.preprocess(contents) for _, contents in corpus * 4))
+    print(f"{len(corpus) * 4} images preprocessed concurrently in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.corpus))
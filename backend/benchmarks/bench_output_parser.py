@@ -0,0 +1,78 @@
+"""
+Parse success rate and latency of services.output_parser against the previous inline parsing,
+over the model outputs in tests/fixtures/llm_outputs.jsonl (append real captures there as they
+turn up). The fuzz checks over mutated copies of those outputs live in tests/test_output_parser.py.
+
+Run from backend/:  python -m benchmarks.bench_output_parser [--rounds 200]
+"""
+import argparse
+import json
+import pathlib
+import re
+import time
+
+from services.output_parser import (
+    ConversationResult, ExtractionResult, ImageAnalysisResult, TranslateExtractResult, parse_model
+)
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "llm_outputs.jsonl"
+MODELS = {
+    "extraction": ExtractionResult,
+    "translate_extract": TranslateExtractResult,
+    "image": ImageAnalysisResult,
+    "conversation": ConversationResult,
+}
+
+
+def legacy_parse(kind: str, output: str) -> dict:
+    # What AIService did before the shared parser: fence stripping, or a greedy regex for image/conversation
+    if kind in ("image", "conversation"):
+        match = re.search(r'\{.*\}', output.replace('\n', '') if kind == "image" else output, re.DOTALL)
+        output = match.group(0) if match else output.replace("```json", "").replace("```", "").strip()
+    else:
+        output = output.replace("```json", "").replace("```", "").strip()
+    parsed = json.loads(output)
+    if not isinstance(parsed, dict):
+        raise ValueError("not an object")
+    return parsed
+
+
+def load_fixtures() -> list[tuple[str, str]]:
+    with open(FIXTURES, encoding="utf-8") as f:
+        return [(row["kind"], row["output"]) for row in map(json.loads, f) if row]
+
+
+def try_parse(fn, *args):
+    try:
+        return fn(*args)
+    except Exception:
+        return None
+
+
+def compare(fixtures: list[tuple[str, str]], rounds: int = 200):
+    legacy_ok = sum(try_parse(legacy_parse, kind, output) is not None for kind, output in fixtures)
+    new_ok = sum(try_parse(parse_model, output, MODELS[kind]) is not None for kind, output in fixtures)
+    print(f"{len(fixtures)} fixtures: legacy parsed {legacy_ok}, shared parser parsed {new_ok}")
+    for kind, output in fixtures:
+        if try_parse(parse_model, output, MODELS[kind]) is None:
+            print(f"  unparsed ({kind}): {output[:70]!r}")
+
+    # Timed separately: on outputs the legacy code can't parse it only pays for raising, while the
+    # shared parser runs its repair pipeline, so one average would mix two different workloads
+    clean = [(kind, output) for kind, output in fixtures if try_parse(legacy_parse, kind, output) is not None]
+    repaired = [(kind, output) for kind, output in fixtures if (kind, output) not in clean]
+    for label, group in (("well-formed", clean), ("legacy fails", repaired)):
+        for name, fn in (("legacy", lambda k, o: try_parse(legacy_parse, k, o)), ("shared", lambda k, o: try_parse(parse_model, o, MODELS[k]))):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for kind, output in group:
+                    fn(kind, output)
+            per_call = (time.perf_counter() - start) / (rounds * len(group))
+            print(f"{label:>12} {name:>7}: {per_call * 1e6:7.1f} µs per output ({len(group)} outputs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    compare(load_fixtures(), args.rounds)
@@ -0,0 +1,108 @@
+"""
+Event-loop responsiveness while voice uploads are in flight.
+Boots the API against a local moto S3 server (standing in for R2), fires N concurrent
+voice complaints with large audio bodies and probes a cheap endpoint meanwhile.
+
+Requires: pip install "moto[server]"
+Run from backend/:  python -m benchmarks.bench_r2_uploads --uploads 16 --size-mb 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+S3_PORT = 9200
+API_PORT = 9201
+
+os.environ.setdefault("R2_ENDPOINT_URL", f"http://127.0.0.1:{S3_PORT}")
+os.environ.setdefault("R2_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("R2_SECRET_ACCESS_KEY", "bench")
+os.environ.setdefault("R2_PUBLIC_URL_BASE", "http://bench.local")
+# Every request comes from 127.0.0.1; the per-client budget would cap the run, not the app
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Noise WAV runs ~33 s per MB, so lift the recording caps to fit the largest --size-mb
+os.environ.setdefault("INGEST_MAX_AUDIO_MB", "1024")
+os.environ.setdefault("INGEST_MAX_AUDIO_SECONDS", "100000")
+
+import boto3
+import httpx
+from moto.server import ThreadedMotoServer
+
+from benchmarks.servers import serve_in_thread
+from benchmarks.synthetic_audio import wav_recording
+from config import settings
+
+
+async def probe(client: httpx.AsyncClient, base_url: str, stop: asyncio.Event) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(f"{base_url}/openapi.json")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.02)
+    return samples
+
+
+async def upload(client: httpx.AsyncClient, base_url: str, audio: bytes):
+    response = await client.post(
+        f"{base_url}/api/v1/complaints/voice",
+        files={"audio_file": ("bench.wav", audio, "audio/wav")},
+        data={"language": "en", "latitude": "17.38", "longitude": "78.48", "userId": "bench"},
+        timeout=300.0,
+    )
+    response.raise_for_status()
+
+
+def report(label: str, samples: list[float]):
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    print(f"{label:<20} n={len(samples):<5} p50={statistics.median(samples) * 1000:8.2f} ms  p99={p99 * 1000:8.2f} ms  max={samples[-1] * 1000:8.2f} ms")
+
+
+async def run(base_url: str, uploads: int, size_mb: int):
+    audio = wav_recording(size_mb * 1024 * 1024)
+    async with httpx.AsyncClient() as client:
+        stop = asyncio.Event()
+        idle_task = asyncio.create_task(probe(client, base_url, stop))
+        await asyncio.sleep(1.0)
+        stop.set()
+        report("probe (idle)", await idle_task)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, base_url, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(client, base_url, audio) for _ in range(uploads)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        report("probe (uploading)", await probe_task)
+        print(f"{uploads} x {size_mb} MB voice uploads finished in {elapsed:.2f} s")
+
+
+def main(uploads: int, size_mb: int):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    s3_server = ThreadedMotoServer(ip_address="127.0.0.1", port=S3_PORT)
+    s3_server.start()
+    try:
+        boto3.client(
+            "s3",
+            endpoint_url=settings.R2_ENDPOINT_URL,
+            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+            region_name="us-east-1",
+        ).create_bucket(Bucket=settings.R2_BUCKET_NAME)
+
+        from main import app
+        with serve_in_thread(app, API_PORT) as base_url:
+            asyncio.run(run(base_url, uploads, size_mb))
+    finally:
+        s3_server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--size-mb", type=int, default=20)
+    args = parser.parse_args()
+    main(args.uploads, args.size_mb)
@@ -0,0 +1,83 @@
+"""
+AIService behaviour against a fault-injecting stub NIM server:
+  1. flapping upstream (a share of 503s)  -> success rate with retries + backoff
+  2. upstream down (every request 503)    -> circuit breaker fast-fails to the fallback
+  3. slow tail (a share of slow replies)  -> p99 with and without hedged requests
+
+Run from backend/:  python -m benchmarks.bench_resilience
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.stub_nim import run_stub_app
+from services.ai_service import AIService
+from services.resilience import CircuitBreaker, ResilientCaller
+
+MESSAGES = [{"role": "user", "content": "Summarise: garbage not collected for a week"}]
+
+
+def make_service(url: str, **caller_kwargs) -> AIService:
+    service = AIService()
+    service.api_key = "bench"
+    service.invoke_url = url
+    breaker = CircuitBreaker(caller_kwargs.pop("failure_threshold", 5), caller_kwargs.pop("reset_timeout", 30.0))
+    service.resilience = ResilientCaller(breaker, backoff_base=0.02, **caller_kwargs)
+    return service
+
+
+async def timed_calls(service: AIService, n: int, concurrency: int = 8) -> tuple[list[float], int]:
+    latencies, successes = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal successes
+        async with semaphore:
+            start = time.perf_counter()
+            result = await service._call_nvidia_api(MESSAGES)
+            latencies.append(time.perf_counter() - start)
+            successes += result is not None
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return sorted(latencies), successes
+
+
+def pct(samples: list[float], p: float) -> float:
+    return samples[min(int(len(samples) * p / 100), len(samples) - 1)] * 1000
+
+
+async def main(n: int, port: int):
+    with run_stub_app(port, latency=0.01) as (url, stub):
+        stub.state.faults.update(fail_rate=0.3)
+        for retries in (0, 2):
+            service = make_service(url, max_retries=retries, failure_threshold=10_000)
+            latencies, ok = await timed_calls(service, n)
+            print(f"[flapping 30% 503] retries={retries}: success {ok}/{n}, p50 {pct(latencies, 50):.1f} ms, p99 {pct(latencies, 99):.1f} ms")
+            await service.shutdown()
+
+        stub.state.faults.update(fail_rate=1.0)
+        service = make_service(url, max_retries=2, failure_threshold=5, reset_timeout=60)
+        before = stub.state.requests
+        latencies, ok = await timed_calls(service, n)
+        print(f"[upstream down] breaker: {stub.state.requests - before} upstream requests for {n} calls, "
+              f"p50 {pct(latencies, 50):.2f} ms, stats {service.resilience.stats()}")
+        await service.shutdown()
+
+        stub.state.faults.update(fail_rate=0.0, slow_rate=0.05, slow_latency=0.5)
+        for hedge in (False, True):
+            service = make_service(url, hedge_enabled=hedge)
+            # Warm the latency tracker so the hedge threshold is known
+            await timed_calls(service, 50)
+            latencies, ok = await timed_calls(service, n)
+            print(f"[5% slow tail] hedging={hedge}: p50 {pct(latencies, 50):.1f} ms, p99 {pct(latencies, 99):.1f} ms, "
+                  f"mean {statistics.mean(latencies) * 1000:.1f} ms, stats {service.resilience.stats()}")
+            await service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--port", type=int, default=9400)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.port))
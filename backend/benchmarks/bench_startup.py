@@ -0,0 +1,153 @@
+"""
+Cold-start cost of an API worker, measured in fresh interpreters:
+  - import time of `main`, plus the heaviest top-level packages it pulls in (python -X importtime)
+  - time to first response: process spawn -> first 200 from /metrics
+  - first and second voice complaint latency, with and without the background warm-up
+
+External services are left unconfigured so nothing leaves the machine: R2 and Firestore run in
+mock mode, STT uses the mock engine and the LLM calls short-circuit without an API key.
+--json saves the report; --baseline compares against a saved one and exits non-zero when
+import time or time to first response regresses beyond --tolerance.
+
+Run from backend/:  python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.synthetic_audio import wav_recording
+
+API_PORT = 9400
+ENV = {
+    "STT_ENGINE": "mock",
+    "AI_CACHE_ENABLED": "false",
+    "RATE_LIMIT_ENABLED": "false",
+    "NVIDIA_API_KEY": "",
+    "FIREBASE_CREDENTIALS": "",
+    "LOG_LEVEL": "ERROR",
+}
+IMPORT_PROBE = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+
+def measure_import() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        env={**os.environ, **ENV}, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def heaviest_imports(top: int) -> dict[str, float]:
+    """
+    Cumulative import time of the modules `main` imports directly, heaviest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env={**os.environ, **ENV}, capture_output=True, text=True, check=True,
+    )
+    # Lines look like "import time: <self us> | <cumulative us> | <indent><module>"; main's children sit at indent 3
+    children = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("   ") and not name.startswith("    "):
+            children[name.strip()] = int(cumulative) / 1e6
+    return dict(sorted(children.items(), key=lambda item: -item[1])[:top])
+
+
+def voice_request(client: httpx.Client) -> float:
+    start = time.perf_counter()
+    response = client.post(
+        f"http://127.0.0.1:{API_PORT}/api/v1/complaints/voice",
+        files={"audio_file": ("bench.wav", wav_recording(64 * 1024), "audio/wav")},
+        data={"language": "en", "latitude": "17.38", "longitude": "78.48", "userId": "bench"},
+        timeout=60,
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def measure_cold_start(warmup: bool, settle: float) -> dict:
+    env = {**os.environ, **ENV, "WARMUP_ON_STARTUP": "true" if warmup else "false"}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(API_PORT), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        with httpx.Client() as client:
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit("API process exited during startup")
+                try:
+                    if client.get(f"http://127.0.0.1:{API_PORT}/metrics", timeout=1).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+            ready = time.perf_counter() - start
+            # A real first request rarely lands the same millisecond the worker turns ready
+            time.sleep(settle)
+            first = voice_request(client)
+            second = voice_request(client)
+    finally:
+        process.terminate()
+        process.wait()
+    return {"ready_s": ready, "first_voice_s": first, "second_voice_s": second}
+
+
+def compare_baseline(report: dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    ok = True
+    for key in ("import_s", "ready_s"):
+        if report[key] > baseline[key] * (1 + tolerance):
+            print(f"REGRESSION {key}: {report[key] * 1000:.0f} ms vs baseline {baseline[key] * 1000:.0f} ms")
+            ok = False
+    if ok:
+        print(f"No regressions against {baseline_path} (tolerance {tolerance:.0%})")
+    return ok
+
+
+def main(args):
+    imports = [measure_import() for _ in range(args.runs)]
+    report = {"import_s": statistics.median(imports), "heaviest_imports_s": heaviest_imports(args.top)}
+    print(f"import main: median {report['import_s'] * 1000:.0f} ms over {args.runs} runs")
+    for name, seconds in report["heaviest_imports_s"].items():
+        print(f"  {name:<40} {seconds * 1000:7.1f} ms")
+
+    for warmup in (False, True):
+        runs = [measure_cold_start(warmup, args.settle) for _ in range(args.runs)]
+        row = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        label = "warm-up on " if warmup else "warm-up off"
+        print(
+            f"{label}: ready {row['ready_s'] * 1000:6.0f} ms  first voice {row['first_voice_s'] * 1000:6.1f} ms"
+            f"  second voice {row['second_voice_s'] * 1000:6.1f} ms"
+        )
+        report["warmup" if warmup else "lazy"] = row
+    report["ready_s"] = report["warmup"]["ready_s"]
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), **report}, f, indent=2)
+        print(f"Report written to {args.json}")
+    if args.baseline and not compare_baseline(report, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="how many of main's heaviest imports to list")
+    parser.add_argument("--settle", type=float, default=0.5, help="idle seconds between ready and the first request")
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    main(parser.parse_args())
@@ -0,0 +1,117 @@
+"""
+Real-time factor (compute seconds / audio seconds) and worker memory for the STT engine,
+at increasing numbers of concurrent transcriptions.
+Uses the recordings in --corpus if given (language taken from a `.te.` / `.en.` infix in the
+file name, default en), otherwise a synthetic set of 16 kHz WAV files. Synthetic audio is not
+speech, so it measures decode/compute cost only, not accuracy.
+
+Run from backend/:  python -m benchmarks.bench_stt [--corpus path/to/audio] [--concurrency 1 2 4]
+"""
+import argparse
+import asyncio
+import math
+import pathlib
+import random
+import statistics
+import tempfile
+import time
+import wave
+
+from config import settings
+from services.stt_service import STTService, SAMPLE_RATE
+
+SYNTHETIC_SECONDS = [8, 20, 45, 90]
+AUDIO_SUFFIXES = {".wav", ".mp3", ".m4a", ".ogg", ".webm", ".flac"}
+
+
+def synthetic_corpus(directory: str) -> list[tuple[str, str]]:
+    corpus = []
+    for seconds in SYNTHETIC_SECONDS:
+        path = pathlib.Path(directory) / f"synthetic_{seconds}s.wav"
+        frames = bytearray()
+        for i in range(seconds * SAMPLE_RATE):
+            # Warbling tone plus noise, so VAD doesn't drop everything as silence
+            t = i / SAMPLE_RATE
+            sample = 0.3 * math.sin(2 * math.pi * (220 + 80 * math.sin(2 * math.pi * 3 * t)) * t) + random.uniform(-0.05, 0.05)
+            frames += int(sample * 32767).to_bytes(2, "little", signed=True)
+        with wave.open(str(path), "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(SAMPLE_RATE)
+            out.writeframes(bytes(frames))
+        corpus.append((str(path), "en"))
+    return corpus
+
+
+def load_corpus(path: str) -> list[tuple[str, str]]:
+    files = sorted(p for p in pathlib.Path(path).iterdir() if p.suffix.lower() in AUDIO_SUFFIXES)
+    return [(str(p), "te" if ".te." in p.name else "en") for p in files]
+
+
+def audio_seconds(path: str) -> float:
+    import av
+    with av.open(path) as container:
+        return float(container.duration) / 1_000_000
+
+
+def worker_peak_rss_mb(service: STTService) -> list[float]:
+    # VmHWM is the peak resident set size of each worker process (Linux only)
+    peaks = []
+    if service.pool is None:
+        return peaks
+    for process in (service.pool._processes or {}).values():
+        try:
+            with open(f"/proc/{process.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmHWM:"):
+                        peaks.append(int(line.split()[1]) / 1024)
+        except FileNotFoundError:
+            continue
+    return peaks
+
+
+async def run_level(corpus: list[tuple[str, str]], durations: dict[str, float], concurrency: int):
+    service = STTService(engine_name=settings.STT_ENGINE, workers=concurrency)
+    service.startup()
+    try:
+        # Warm every worker so model loading isn't counted as transcription time
+        await asyncio.gather(*(service.transcribe(corpus[0][0], corpus[0][1]) for _ in range(concurrency)))
+
+        jobs = corpus * concurrency
+        ratios = []
+
+        async def _one(path: str, language: str):
+            start = time.perf_counter()
+            await service.transcribe(path, language)
+            ratios.append((time.perf_counter() - start) / durations[path])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_one(path, language) for path, language in jobs))
+        wall = time.perf_counter() - start
+        total_audio = sum(durations[path] for path, _ in jobs)
+        peaks = worker_peak_rss_mb(service)
+        print(f"concurrency {concurrency}: RTF p50 {statistics.median(ratios):.3f}  max {max(ratios):.3f}  "
+              f"throughput {total_audio / wall:5.1f} audio-s/s  worker peak RSS {max(peaks, default=0):.0f} MB "
+              f"(sum {sum(peaks):.0f} MB)")
+    finally:
+        service.shutdown()
+
+
+async def main(corpus_path: str | None, levels: list[int]):
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = load_corpus(corpus_path) if corpus_path else synthetic_corpus(tmp)
+        durations = {path: audio_seconds(path) for path, _ in corpus}
+        print(f"engine {settings.STT_ENGINE} model {settings.STT_MODEL} ({settings.STT_COMPUTE_TYPE}), "
+              f"{len(corpus)} files, {sum(durations.values()):.0f} s of audio")
+        for path, language in corpus:
+            print(f"  {pathlib.Path(path).name:<32} {language}  {durations[path]:6.1f} s")
+        for concurrency in levels:
+            await run_level(corpus, durations, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(main(args.corpus, args.concurrency))
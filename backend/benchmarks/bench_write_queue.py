@@ -0,0 +1,50 @@
+"""
+Per-complaint Firestore write cost: one blocking add() per request vs. the write-behind queue,
+against the in-memory fake with simulated RPC latency and failures.
+
+Run from backend/:  python -m benchmarks.bench_write_queue --complaints 2000 --rpc-latency 0.03
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_firestore import FakeFirestore
+from services.write_queue import FirestoreWriteQueue
+
+
+async def bench_direct(n: int, rpc_latency: float) -> float:
+    db = FakeFirestore(rpc_latency=rpc_latency)
+    start = time.perf_counter()
+    for i in range(n):
+        db.collection("complaints").add({"n": i})
+    return time.perf_counter() - start
+
+
+async def bench_queue(n: int, rpc_latency: float, fail_rate: float) -> tuple[float, float, FakeFirestore, FirestoreWriteQueue]:
+    db = FakeFirestore(rpc_latency=rpc_latency, fail_rate=fail_rate)
+    queue = FirestoreWriteQueue(flush_interval=0.05, max_queue=n)
+    queue.start(db)
+    start = time.perf_counter()
+    await asyncio.gather(*(queue.enqueue("complaints", {"n": i}) for i in range(n)))
+    accepted = time.perf_counter() - start
+    await queue.stop()
+    return accepted, time.perf_counter() - start, db, queue
+
+
+async def main(n: int, rpc_latency: float, fail_rate: float):
+    direct = await bench_direct(n, rpc_latency)
+    print(f"direct add():  {n} writes in {direct:.2f} s ({direct / n * 1000:.2f} ms on the request path each)")
+
+    accepted, drained, db, queue = await bench_queue(n, rpc_latency, fail_rate)
+    stored = len(db.documents.get("complaints", {}))
+    print(f"write-behind:  accepted in {accepted * 1000:.1f} ms, drained in {drained:.2f} s, {db.commits} batch commits")
+    print(f"               stored={stored} stats={queue.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=2000)
+    parser.add_argument("--rpc-latency", type=float, default=0.03)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.complaints, args.rpc_latency, args.fail_rate))
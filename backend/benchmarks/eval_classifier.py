@@ -0,0 +1,124 @@
+"""
+Offline evaluation of the local complaint classifier against the LLM's labels.
+Stored complaints carry the category/priority the LLM extracted, so k-fold cross-validation over
+them measures how often the local model agrees with the LLM, and how many extraction calls it
+would avoid, at each confidence threshold.
+
+Data: a JSONL export of complaint documents (default: tests/fixtures/complaints_labeled.jsonl) or, with
+--firestore, the live `complaints` collection. Complaints labelled by the local model itself are
+ignored. --save trains on everything and writes the model file the API loads (CLASSIFIER_MODEL_PATH).
+
+Run from backend/:  python -m benchmarks.eval_classifier --folds 5
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+from config import settings
+from services.classifier import ComplaintClassifier, UNTRUSTED_LABEL_SOURCES
+
+FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures", "complaints_labeled.jsonl")
+
+
+def load_jsonl(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_firestore() -> list[dict]:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    firebase_admin.initialize_app(credentials.Certificate(settings.FIREBASE_CREDENTIALS))
+    query = firestore.client().collection("complaints").select(["category", "priority", "description", "metadata"])
+    return [doc.to_dict() for doc in query.stream()]
+
+
+def folds(records: list[dict], k: int, seed: int):
+    shuffled = records[:]
+    random.Random(seed).shuffle(shuffled)
+    for i in range(k):
+        yield [r for j, r in enumerate(shuffled) if j % k != i], [r for j, r in enumerate(shuffled) if j % k == i]
+
+
+def input_text(record: dict, field: str) -> str:
+    metadata = record.get("metadata") or {}
+    return metadata.get(field) or record.get("description") or ""
+
+
+def cross_validate(records: list[dict], k: int, seed: int, field: str) -> list[dict]:
+    """
+    One prediction per record, each made by a model that never saw it.
+    """
+    predictions = []
+    for train, test in folds(records, k, seed):
+        classifier = ComplaintClassifier.train(train)
+        for record in test:
+            text = input_text(record, field)
+            start = time.perf_counter()
+            result = classifier.classify(text)
+            predictions.append({
+                **result,
+                "seconds": time.perf_counter() - start,
+                "language": (record.get("metadata") or {}).get("language", "en"),
+                "llm_category": record["category"],
+                "llm_priority": record["priority"],
+            })
+    return predictions
+
+
+def report(predictions: list[dict], thresholds: list[float], priority_threshold: float, label: str):
+    n = len(predictions)
+    argmax = sum(p["category"] == p["llm_category"] for p in predictions) / n
+    latency = statistics.median(p["seconds"] for p in predictions) * 1e6
+    print(f"\n{label}: {n} complaints, argmax category agreement {argmax:.1%}, median {latency:.0f} us/complaint")
+    for language in sorted({p["language"] for p in predictions}):
+        subset = [p for p in predictions if p["language"] == language]
+        print(f"  {language}: {sum(p['category'] == p['llm_category'] for p in subset) / len(subset):.1%} of {len(subset)}")
+
+    print(f"  {'threshold':>9} {'avoided':>8} {'cat agree':>10} {'pri agree':>10} {'end-to-end':>11}")
+    for threshold in thresholds:
+        local = [p for p in predictions if p["confidence"] >= threshold and p["priority_confidence"] >= priority_threshold]
+        if not local:
+            print(f"  {threshold:>9.2f} {0:>8.1%} {'-':>10} {'-':>10} {1:>11.1%}")
+            continue
+        category_errors = sum(p["category"] != p["llm_category"] for p in local)
+        priority_agree = sum(p["priority"] == p["llm_priority"] for p in local) / len(local)
+        # Escalated complaints get the LLM's own label, so only local decisions can disagree
+        print(
+            f"  {threshold:>9.2f} {len(local) / n:>8.1%} {1 - category_errors / len(local):>10.1%}"
+            f" {priority_agree:>10.1%} {1 - category_errors / n:>11.1%}"
+        )
+
+
+def main(args):
+    records = load_firestore() if args.firestore else load_jsonl(args.data)
+    records = [
+        r for r in records
+        if r.get("category") and r.get("priority") and (r.get("metadata") or {}).get("classifiedBy") not in UNTRUSTED_LABEL_SOURCES
+    ]
+    print(f"{len(records)} labelled complaints, {args.folds}-fold cross-validation, priority threshold {args.priority_threshold}")
+
+    # transcriptEnglish is what extract_details sees; transcriptOriginal shows Telugu handled directly
+    for field, label in (("transcriptEnglish", "English input"), ("transcriptOriginal", "Original-language input")):
+        predictions = cross_validate(records, args.folds, args.seed, field)
+        report(predictions, args.thresholds, args.priority_threshold, label)
+
+    if args.save:
+        ComplaintClassifier.train(records).save(args.save)
+        print(f"\nModel trained on {len(records)} complaints written to {args.save}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=FIXTURE)
+    parser.add_argument("--firestore", action="store_true", help="read the complaints collection instead of --data")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.7, 0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--priority-threshold", type=float, default=settings.CLASSIFIER_PRIORITY_THRESHOLD)
+    parser.add_argument("--save", default=None)
+    main(parser.parse_args())
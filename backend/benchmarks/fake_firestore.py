@@ -0,0 +1,237 @@
+"""
+Minimal in-memory stand-in for the firebase_admin Firestore client: just the surface the backend uses.
+Each RPC (add / get / batch commit / query) sleeps `rpc_latency` seconds and fails with probability `fail_rate`.
+SERVER_TIMESTAMP, Increment and ArrayUnion are applied on write the way the server would.
+"""
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1.transforms import ArrayUnion, Increment, Sentinel
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+}
+
+
+def _field(data: dict, path: str):
+    for part in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _apply(document: dict, data: dict, merge_maps: bool):
+    for key, value in data.items():
+        if isinstance(value, Sentinel):
+            value = datetime.now(timezone.utc)
+        elif isinstance(value, Increment):
+            value = (document.get(key) or 0) + value.value
+        elif isinstance(value, ArrayUnion):
+            existing = list(document.get(key) or [])
+            value = existing + [v for v in value.values if v not in existing]
+        elif isinstance(value, dict) and merge_maps:
+            # set(merge=True) merges nested maps instead of replacing them
+            nested = document.get(key)
+            nested = dict(nested) if isinstance(nested, dict) else {}
+            _apply(nested, value, merge_maps)
+            value = nested
+        document[key] = value
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, doc_id: str, data: dict | None):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data or {}
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self.exists else None
+
+    def get(self, field: str):
+        return _field(self._data, field)
+
+
+class FakeAggregateResult:
+    def __init__(self, value: int):
+        self.value = value
+
+
+class FakeCountQuery:
+    def __init__(self, query: "FakeQuery"):
+        self._query = query
+
+    def get(self):
+        return [[FakeAggregateResult(len(self._query._matching()))]]
+
+
+class FakeQuery:
+    def __init__(self, store: "FakeFirestore", collection: str):
+        self._store = store
+        self._collection = collection
+        self._filters = []
+        self._orders = []
+        self._limit = None
+        self._start_after = None
+
+    def _copy(self, **changes) -> "FakeQuery":
+        query = FakeQuery(self._store, self._collection)
+        query._filters, query._orders = list(self._filters), list(self._orders)
+        query._limit, query._start_after = self._limit, self._start_after
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+    def where(self, field: str, op: str, value):
+        return self._copy(_filters=self._filters + [(field, op, value)])
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        return self._copy(_orders=self._orders + [(field, direction == "DESCENDING")])
+
+    def limit(self, count: int):
+        return self._copy(_limit=count)
+
+    def start_after(self, values: dict):
+        return self._copy(_start_after=values)
+
+    def select(self, fields):
+        return self
+
+    def count(self):
+        return FakeCountQuery(self)
+
+    def _sort_key(self, doc_id: str, data: dict):
+        return [doc_id if field == "__name__" else _field(data, field) for field, _ in self._orders]
+
+    def _matching(self) -> list[FakeDocumentSnapshot]:
+        with self._store._lock:
+            docs = list(self._store.documents.get(self._collection, {}).items())
+        docs = [(doc_id, data) for doc_id, data in docs if all(_OPERATORS[op](_field(data, f), v) for f, op, v in self._filters)]
+        # Stable multi-key sort: apply orderings from last to first
+        for index in reversed(range(len(self._orders))):
+            field, descending = self._orders[index]
+            docs.sort(key=lambda d: (d[0] if field == "__name__" else _field(d[1], field)) or 0, reverse=descending)
+        if self._start_after is not None:
+            cursor = [self._start_after.get(field) for field, _ in self._orders]
+            for i, (doc_id, data) in enumerate(docs):
+                if self._sort_key(doc_id, data) == cursor:
+                    docs = docs[i + 1:]
+                    break
+        if self._limit is not None:
+            docs = docs[: self._limit]
+        return [FakeDocumentSnapshot(doc_id, data) for doc_id, data in docs]
+
+    def stream(self):
+        self._store._rpc()
+        return iter(self._matching())
+
+
+class FakeDocumentReference:
+    def __init__(self, store: "FakeFirestore", collection: str, doc_id: str):
+        self._store = store
+        self.collection_name = collection
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self.collection_name}/{self.id}"
+
+    def get(self):
+        self._store._rpc()
+        return FakeDocumentSnapshot(self.id, self._store.documents.get(self.collection_name, {}).get(self.id))
+
+    def set(self, data: dict):
+        self._store._rpc()
+        self._store._write(self, data)
+
+    def update(self, data: dict):
+        self._store._rpc()
+        if self.id not in self._store.documents.get(self.collection_name, {}):
+            raise NotFound(f"No document to update: {self.path}")
+        self._store._write(self, data, "update")
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, store: "FakeFirestore", name: str):
+        super().__init__(store, name)
+        self.name = name
+
+    def document(self, doc_id: str | None = None) -> FakeDocumentReference:
+        return FakeDocumentReference(self._store, self.name, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data: dict):
+        ref = self.document()
+        self._store._rpc()
+        self._store._write(ref, data)
+        return time.time(), ref
+
+
+class FakeWriteBatch:
+    def __init__(self, store: "FakeFirestore"):
+        self._store = store
+        self._writes = []
+
+    def set(self, ref: FakeDocumentReference, data: dict, merge: bool = False):
+        self._writes.append(("merge" if merge else "set", ref, data))
+
+    def update(self, ref: FakeDocumentReference, data: dict):
+        self._writes.append(("update", ref, data))
+
+    def delete(self, ref: FakeDocumentReference):
+        self._writes.append(("delete", ref, None))
+
+    def commit(self):
+        if len(self._writes) > 500:
+            raise ValueError("Firestore batches are limited to 500 writes")
+        self._store._rpc()
+        for op, ref, data in self._writes:
+            # Like the server, update() of a missing document fails the whole batch
+            if op == "update" and ref.id not in self._store.documents.get(ref.collection_name, {}):
+                raise NotFound(f"No document to update: {ref.path}")
+        for op, ref, data in self._writes:
+            if op == "delete":
+                self._store._delete(ref)
+            else:
+                self._store._write(ref, data, op)
+        self._store.commits += 1
+
+
+class FakeFirestore:
+    def __init__(self, rpc_latency: float = 0.0, fail_rate: float = 0.0):
+        self.rpc_latency = rpc_latency
+        self.fail_rate = fail_rate
+        self.documents: dict[str, dict[str, dict]] = {}
+        self.commits = 0
+        self._lock = threading.Lock()
+
+    def _rpc(self):
+        if self.rpc_latency:
+            time.sleep(self.rpc_latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            raise ConnectionError("Injected Firestore failure")
+
+    def _write(self, ref: FakeDocumentReference, data: dict, op: str = "set"):
+        with self._lock:
+            collection = self.documents.setdefault(ref.collection_name, {})
+            document = collection.setdefault(ref.id, {}) if op != "set" else {}
+            _apply(document, data, merge_maps=op == "merge")
+            collection[ref.id] = document
+
+    def _delete(self, ref: FakeDocumentReference):
+        with self._lock:
+            self.documents.get(ref.collection_name, {}).pop(ref.id, None)
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
@@ -0,0 +1,329 @@
+"""
+End-to-end load test of the API against local stand-ins for every external service:
+stub NIM (NVIDIA), moto S3 (R2), stub Cloudinary and the in-memory Firestore fake.
+
+The API runs in its own process (benchmarks.loadtest_server) so the load generator doesn't share its
+GIL. Workers drive a weighted mix of voice, image and chat traffic plus dashboard reads, then the
+run reports RPS and p50/p95/p99 per scenario along with the API process's resident memory.
+--json saves the report; --baseline compares against a saved one and exits non-zero when any
+scenario's p95 or error rate regresses beyond --tolerance.
+
+Requires: pip install "moto[server]"
+Run from backend/:  python -m benchmarks.loadtest --duration 30 --concurrency 32 \
+                        --mix voice=2,image=1,chat=4,stats=2,list=1 --nim-latency 0.3
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import boto3
+import httpx
+from moto.server import ThreadedMotoServer
+from PIL import Image, ImageFilter
+
+from benchmarks import stub_cloudinary, stub_nim
+from benchmarks.synthetic_audio import wav_recording
+from benchmarks.servers import serve_in_thread
+
+NIM_PORT = 9300
+S3_PORT = 9301
+CLOUDINARY_PORT = 9302
+API_PORT = 9303
+BUCKET = "loadtest-voice"
+
+# One completion that satisfies every structured call (extraction, combined translate+extract, vision)
+NIM_CONTENT = json.dumps({
+    "translation": "The drainage on our street is overflowing, please fix it.",
+    "category": "drainage",
+    "title": "Drainage overflow",
+    "summary": "Drainage overflowing on the street",
+    "description": "Drain water overflowing onto the road",
+    "priority": "high",
+    "location_details": "Main street",
+})
+
+CHAT_MESSAGES = ["There is a big pothole on my street", "It is about two feet wide", "Yes, bikes keep falling", "Near the bus stop"]
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    unknown = set(mix) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(SCENARIOS)})")
+    return mix
+
+
+def make_photo(rng: random.Random) -> bytes:
+    # Blurred noise compresses roughly like a phone photo; raw noise would be far larger
+    img = Image.effect_noise((3024, 4032), 30 + rng.randint(0, 40)).convert("RGB").filter(ImageFilter.GaussianBlur(2))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+class Fixtures:
+    def __init__(self, audio_kb: int, seed: int):
+        rng = random.Random(seed)
+        self.audio = wav_recording(audio_kb * 1024, seed)
+        self.photos = [make_photo(rng) for _ in range(3)]
+
+
+async def scenario_voice(client: httpx.AsyncClient, fixtures: Fixtures, rng: random.Random, state: dict):
+    return await client.post(
+        "/api/v1/complaints/voice",
+        files={"audio_file": ("recording.wav", fixtures.audio, "audio/wav")},
+        data={
+            "language": rng.choice(["en", "te"]),
+            "latitude": f"{17.38 + rng.uniform(-0.05, 0.05):.6f}",
+            "longitude": f"{78.48 + rng.uniform(-0.05, 0.05):.6f}",
+            "userId": f"load-user-{rng.randint(1, 200)}",
+        },
+    )
+
+
+async def scenario_image(client: httpx.AsyncClient, fixtures: Fixtures, rng: random.Random, state: dict):
+    return await client.post(
+        "/api/v1/ingest-image",
+        files={"image": ("photo.jpg", rng.choice(fixtures.photos), "image/jpeg")},
+    )
+
+
+async def scenario_chat(client: httpx.AsyncClient, fixtures: Fixtures, rng: random.Random, state: dict):
+    # Each worker keeps one conversation going for a few turns, like a real user would
+    turn = state.get("turn", 0)
+    response = await client.post("/api/v1/chat/complaint", json={
+        "message": CHAT_MESSAGES[turn % len(CHAT_MESSAGES)],
+        "session_id": state.get("session_id"),
+        "location_context": "17.38, 78.48",
+        "language": "en",
+    })
+    if response.status_code == 200 and turn < len(CHAT_MESSAGES) - 1:
+        state["session_id"], state["turn"] = response.json().get("session_id"), turn + 1
+    else:
+        state.pop("session_id", None)
+        state["turn"] = 0
+    return response
+
+
+async def scenario_stats(client: httpx.AsyncClient, fixtures: Fixtures, rng: random.Random, state: dict):
+    return await client.get("/api/v1/stats")
+
+
+async def scenario_list(client: httpx.AsyncClient, fixtures: Fixtures, rng: random.Random, state: dict):
+    user_id = f"load-user-{rng.randint(1, 200)}"
+    return await client.get("/api/v1/complaints", params={"limit": 20}, headers={"Authorization": f"Bearer {user_id}"})
+
+
+SCENARIOS = {
+    "voice": scenario_voice,
+    "image": scenario_image,
+    "chat": scenario_chat,
+    "stats": scenario_stats,
+    "list": scenario_list,
+}
+
+
+async def worker(client, fixtures, mix, deadline, results, seed):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    state = {}
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, fixtures, rng, state)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        results.append((name, time.perf_counter() - start, ok))
+
+
+def read_rss_mb(pid: int) -> tuple[float, float]:
+    values = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                key, value = line.split()[:2]
+                values[key] = int(value) / 1024
+    return values.get("VmRSS:", 0.0), values.get("VmHWM:", 0.0)
+
+
+async def sample_memory(pid: int, stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        samples.append(read_rss_mb(pid)[0])
+        await asyncio.sleep(0.5)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results: list[tuple[str, float, bool]], elapsed: float) -> dict:
+    report = {}
+    for name in sorted({r[0] for r in results}) + ["all"]:
+        rows = [r for r in results if name == "all" or r[0] == name]
+        latencies = sorted(r[1] for r in rows)
+        errors = sum(not r[2] for r in rows)
+        report[name] = {
+            "requests": len(rows),
+            "rps": round(len(rows) / elapsed, 2),
+            "error_rate": round(errors / len(rows), 4),
+            "p50_ms": round(statistics.median(latencies) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        }
+    return report
+
+
+def print_report(report: dict, memory: dict):
+    print(f"\n{'scenario':<8} {'requests':>9} {'rps':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in report.items():
+        print(f"{name:<8} {row['requests']:>9} {row['rps']:>8.1f} {row['error_rate']:>7.1%} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+    print(f"\nAPI process RSS: start {memory['start_mb']:.0f} MB, end {memory['end_mb']:.0f} MB, peak {memory['peak_mb']:.0f} MB")
+
+
+def compare_baseline(report: dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["scenarios"]
+    regressions = []
+    for name, row in report.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} -> {row['p95_ms']} ms")
+        if row["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {base['error_rate']:.1%} -> {row['error_rate']:.1%}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions against {baseline_path} (tolerance {tolerance:.0%})")
+    return not regressions
+
+
+def start_api(args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "NVIDIA_API_KEY": "loadtest",
+        "NVIDIA_API_URL": f"http://127.0.0.1:{NIM_PORT}/v1/chat/completions",
+        "R2_ENDPOINT_URL": f"http://127.0.0.1:{S3_PORT}",
+        "R2_ACCESS_KEY_ID": "loadtest",
+        "R2_SECRET_ACCESS_KEY": "loadtest",
+        "R2_BUCKET_NAME": BUCKET,
+        "R2_PUBLIC_URL_BASE": "http://r2.loadtest.local",
+        "CLOUDINARY_UPLOAD_PREFIX": f"http://127.0.0.1:{CLOUDINARY_PORT}",
+        "STT_ENGINE": args.stt_engine,
+        "AI_CACHE_ENABLED": "true" if args.cache else "false",
+        "LOG_LEVEL": "ERROR",
+        # Every simulated user shares 127.0.0.1, so per-client buckets would measure the limiter, not the app
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest_server", "--port", str(API_PORT), "--firestore-latency", str(args.firestore_latency)],
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("API process exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{API_PORT}/openapi.json", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("API process did not become ready within 60 s")
+
+
+async def drive(args, pid: int) -> tuple[dict, dict]:
+    mix = parse_mix(args.mix)
+    fixtures = Fixtures(args.audio_kb, args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{API_PORT}", timeout=120, limits=limits) as client:
+        if args.warmup:
+            await asyncio.gather(*(
+                worker(client, fixtures, mix, time.monotonic() + args.warmup, [], args.seed + 1000 + i)
+                for i in range(args.concurrency)
+            ))
+
+        start_rss = read_rss_mb(pid)[0]
+        samples, stop = [], asyncio.Event()
+        sampler = asyncio.create_task(sample_memory(pid, stop, samples))
+        results = []
+        start = time.perf_counter()
+        deadline = time.monotonic() + args.duration
+        await asyncio.gather(*(worker(client, fixtures, mix, deadline, results, args.seed + i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await sampler
+
+    end_rss, peak_rss = read_rss_mb(pid)
+    memory = {"start_mb": start_rss, "end_mb": end_rss, "peak_mb": max(samples + [peak_rss])}
+    return summarize(results, elapsed), memory
+
+
+def main(args):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    s3_server = ThreadedMotoServer(ip_address="127.0.0.1", port=S3_PORT)
+    s3_server.start()
+    api = None
+    try:
+        boto3.client(
+            "s3", endpoint_url=f"http://127.0.0.1:{S3_PORT}", region_name="us-east-1",
+            aws_access_key_id="loadtest", aws_secret_access_key="loadtest",
+        ).create_bucket(Bucket=BUCKET)
+
+        nim_app = stub_nim.create_stub_app(latency=args.nim_latency, content=NIM_CONTENT)
+        cloudinary_app = stub_cloudinary.create_stub_app(latency=args.cloudinary_latency)
+        with serve_in_thread(nim_app, NIM_PORT), serve_in_thread(cloudinary_app, CLOUDINARY_PORT):
+            api = start_api(args)
+            print(f"Driving {args.concurrency} workers for {args.duration:.0f} s, mix {args.mix}, "
+                  f"NIM latency {args.nim_latency * 1000:.0f} ms, Firestore RPC {args.firestore_latency * 1000:.0f} ms")
+            report, memory = asyncio.run(drive(args, api.pid))
+            print(f"NIM requests: {nim_app.state.requests}, Cloudinary uploads: {cloudinary_app.state.uploads}")
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait(timeout=30)
+        s3_server.stop()
+
+    print_report(report, memory)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "scenarios": report, "memory": memory}, f, indent=2)
+        print(f"Report written to {args.json}")
+    if args.baseline and not compare_baseline(report, args.baseline, args.tolerance):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default="voice=2,image=1,chat=4,stats=2,list=1")
+    parser.add_argument("--nim-latency", type=float, default=0.3)
+    parser.add_argument("--cloudinary-latency", type=float, default=0.1)
+    parser.add_argument("--firestore-latency", type=float, default=0.02)
+    parser.add_argument("--audio-kb", type=int, default=300)
+    parser.add_argument("--stt-engine", default="mock")
+    parser.add_argument("--cache", action="store_true", help="keep the AI response cache on (off by default: the stub returns identical completions)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    main(parser.parse_args())
@@ -0,0 +1,26 @@
+"""
+The API process for benchmarks.loadtest: the real app with Firestore swapped for the in-memory fake.
+Every other external service is redirected through environment variables set by the load test.
+"""
+import argparse
+
+import uvicorn
+
+import main
+from benchmarks.fake_firestore import FakeFirestore
+
+
+def serve(port: int, firestore_latency: float):
+    # The app's lifespan picks this up in place of the real client (and binds the query store to it)
+    main.firestore_provider.override(FakeFirestore(rpc_latency=firestore_latency))
+    # The load generator sends its user ID as the bearer token; there is no Firebase project to verify against
+    main.auth_service.verifier = lambda token: {"uid": token}
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--firestore-latency", type=float, default=0.02)
+    args = parser.parse_args()
+    serve(args.port, args.firestore_latency)
@@ -0,0 +1,31 @@
+"""
+Local stand-in for the Cloudinary upload API, used by the load test.
+Point the backend at it with CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:<port>.
+"""
+import asyncio
+import uuid
+
+from fastapi import FastAPI, Request
+
+
+def create_stub_app(latency: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Stub Cloudinary")
+    app.state.uploads = 0
+
+    @app.post("/v1_1/{cloud_name}/{resource_type}/upload")
+    async def upload(cloud_name: str, resource_type: str, request: Request):
+        # Drain the multipart body so the client pays the real transfer cost
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        if latency:
+            await asyncio.sleep(latency)
+        app.state.uploads += 1
+        public_id = uuid.uuid4().hex
+        return {
+            "public_id": public_id,
+            "bytes": size,
+            "secure_url": f"https://res.cloudinary.local/{cloud_name}/{resource_type}/upload/{public_id}.jpg",
+        }
+
+    return app
@@ -0,0 +1,103 @@
+"""
+Local stand-in for the NVIDIA NIM chat completions endpoint, used by the benchmarks.
+
+Run standalone:  python -m benchmarks.stub_nim --port 9100 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+from contextlib import contextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.servers import serve_in_thread
+
+
+def create_stub_app(
+    latency: float = 0.0,
+    content: str = "Stub response",
+    token_latency: float = 0.0,
+    fail_rate: float = 0.0,
+    fail_status: int = 503,
+    slow_rate: float = 0.0,
+    slow_latency: float = 2.0,
+    retry_after: float | None = None,
+) -> FastAPI:
+    """
+    latency: delay before the first byte; token_latency: delay between streamed tokens.
+    Fault injection: `fail_rate` of requests return `fail_status` (with a Retry-After header when
+    `retry_after` is set), `slow_rate` of requests take an extra `slow_latency` seconds.
+    Faults live in app.state.faults so a running benchmark or test can change them.
+    """
+    app = FastAPI(title="Stub NIM")
+    app.state.faults = {
+        "fail_rate": fail_rate, "fail_status": fail_status, "slow_rate": slow_rate, "slow_latency": slow_latency,
+        "retry_after": retry_after,
+    }
+    app.state.requests = 0
+
+    async def stream_tokens():
+        for token in re.findall(r"\S+\s*", content):
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            if token_latency:
+                await asyncio.sleep(token_latency)
+        yield "data: [DONE]\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        faults = app.state.faults
+        if random.random() < faults["fail_rate"]:
+            headers = {"Retry-After": str(faults["retry_after"])} if faults["retry_after"] is not None else None
+            return JSONResponse({"error": "injected fault"}, status_code=faults["fail_status"], headers=headers)
+        if random.random() < faults["slow_rate"]:
+            await asyncio.sleep(faults["slow_latency"])
+        if latency:
+            await asyncio.sleep(latency)
+        if body.get("stream"):
+            return StreamingResponse(stream_tokens(), media_type="text/event-stream")
+        if token_latency:
+            # A non-streamed completion still pays for generating every token
+            await asyncio.sleep(token_latency * len(content.split()))
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+@contextmanager
+def run_stub_server(port: int = 9100, **app_kwargs):
+    """
+    Serves the stub app on 127.0.0.1:<port> in a background thread and yields its completions URL.
+    Use run_stub_app() instead when the caller needs app.state to adjust faults mid-run.
+    """
+    with run_stub_app(port, **app_kwargs) as (url, _):
+        yield url
+
+
+@contextmanager
+def run_stub_app(port: int = 9100, **app_kwargs):
+    app = create_stub_app(**app_kwargs)
+    with serve_in_thread(app, port) as base_url:
+        yield f"{base_url}/v1/chat/completions", app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    app = create_stub_app(latency=args.latency, fail_rate=args.fail_rate, slow_rate=args.slow_rate)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
@@ -0,0 +1,22 @@
+"""
+Noise recordings in a container the voice endpoint accepts (16 kHz mono 16-bit WAV).
+"""
+import io
+import random
+import wave
+
+SAMPLE_RATE = 16000
+
+
+def wav_recording(num_bytes: int, seed: int | None = None) -> bytes:
+    """
+    A WAV body of roughly `num_bytes` (32 KB per second of audio).
+    """
+    frames = random.Random(seed).randbytes(max(num_bytes - 44, 2) // 2 * 2)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(frames)
+    return out.getvalue()
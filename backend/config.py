@@ -13,14 +13,121 @@ class Settings:
     R2_SECRET_ACCESS_KEY: str = os.getenv("R2_SECRET_ACCESS_KEY", "")
     R2_BUCKET_NAME: str = os.getenv("R2_BUCKET_NAME", "civic-voice-complaints")
     R2_PUBLIC_URL_BASE: str = os.getenv("R2_PUBLIC_URL_BASE", "")
+    R2_ENDPOINT_URL: str = os.getenv("R2_ENDPOINT_URL", "")  # Overrides the account endpoint (e.g. local S3 stand-in)
+    R2_UPLOAD_CONCURRENCY: int = int(os.getenv("R2_UPLOAD_CONCURRENCY", 8))
+    R2_MULTIPART_THRESHOLD_MB: int = int(os.getenv("R2_MULTIPART_THRESHOLD_MB", 8))
+    R2_MULTIPART_CHUNKSIZE_MB: int = int(os.getenv("R2_MULTIPART_CHUNKSIZE_MB", 8))
 
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str = os.getenv("CLOUDINARY_CLOUD_NAME", "drphvzgmm")
     CLOUDINARY_API_KEY: str = os.getenv("CLOUDINARY_API_KEY", "919868192347161")
     CLOUDINARY_API_SECRET: str = os.getenv("CLOUDINARY_API_SECRET", "IMtJcl5UrOfCvCV6aP4FDK4upKw")
+    CLOUDINARY_UPLOAD_PREFIX: str = os.getenv("CLOUDINARY_UPLOAD_PREFIX", "")  # Overrides https://api.cloudinary.com (e.g. local stand-in)
+    # Files and disk spools are uploaded in chunks of this size (Cloudinary's minimum is 5 MB), bounding memory per upload
+    CLOUDINARY_CHUNK_MB: int = int(os.getenv("CLOUDINARY_CHUNK_MB", 6))
     
     NVIDIA_API_KEY: str = os.getenv("NVIDIA_API_KEY", "")
+    NVIDIA_API_URL: str = os.getenv("NVIDIA_API_URL", "https://integrate.api.nvidia.com/v1/chat/completions")
+
+    # NVIDIA HTTP client (shared, pooled across all AIService calls)
+    NVIDIA_HTTP2: bool = os.getenv("NVIDIA_HTTP2", "false").lower() == "true"
+    NVIDIA_MAX_CONNECTIONS: int = int(os.getenv("NVIDIA_MAX_CONNECTIONS", 20))
+    NVIDIA_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("NVIDIA_MAX_KEEPALIVE_CONNECTIONS", 10))
+    NVIDIA_KEEPALIVE_EXPIRY: float = float(os.getenv("NVIDIA_KEEPALIVE_EXPIRY", 30.0))
+    NVIDIA_CONNECT_TIMEOUT: float = float(os.getenv("NVIDIA_CONNECT_TIMEOUT", 5.0))
+    NVIDIA_TIMEOUT: float = float(os.getenv("NVIDIA_TIMEOUT", 30.0))
+    NVIDIA_VISION_TIMEOUT: float = float(os.getenv("NVIDIA_VISION_TIMEOUT", 25.0))
+
+    # NVIDIA resilience (retries, circuit breaker, hedging, concurrency cap)
+    NVIDIA_MAX_RETRIES: int = int(os.getenv("NVIDIA_MAX_RETRIES", 2))
+    NVIDIA_BACKOFF_BASE: float = float(os.getenv("NVIDIA_BACKOFF_BASE", 0.25))
+    NVIDIA_BACKOFF_MAX: float = float(os.getenv("NVIDIA_BACKOFF_MAX", 4.0))
+    NVIDIA_BREAKER_THRESHOLD: int = int(os.getenv("NVIDIA_BREAKER_THRESHOLD", 5))
+    NVIDIA_BREAKER_RESET: float = float(os.getenv("NVIDIA_BREAKER_RESET", 30.0))
+    NVIDIA_MAX_CONCURRENCY: int = int(os.getenv("NVIDIA_MAX_CONCURRENCY", 16))
+    NVIDIA_HEDGE_ENABLED: bool = os.getenv("NVIDIA_HEDGE_ENABLED", "false").lower() == "true"
+    NVIDIA_HEDGE_PERCENTILE: float = float(os.getenv("NVIDIA_HEDGE_PERCENTILE", 95))
+    NVIDIA_GUIDED_JSON: bool = os.getenv("NVIDIA_GUIDED_JSON", "true").lower() == "true"
+    COMBINED_EXTRACTION_ENABLED: bool = os.getenv("COMBINED_EXTRACTION_ENABLED", "true").lower() == "true"
     
+    # Image preprocessing before vision analysis
+    IMAGE_MAX_SIDE: int = int(os.getenv("IMAGE_MAX_SIDE", 1120))
+    IMAGE_QUALITY: int = int(os.getenv("IMAGE_QUALITY", 80))
+    IMAGE_FORMAT: str = os.getenv("IMAGE_FORMAT", "JPEG")  # JPEG or WEBP
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", 4))
+
+    # Speech-to-text (offline engine in a process pool)
+    STT_ENGINE: str = os.getenv("STT_ENGINE", "faster-whisper")  # faster-whisper or mock
+    STT_MODEL: str = os.getenv("STT_MODEL", "small")
+    STT_COMPUTE_TYPE: str = os.getenv("STT_COMPUTE_TYPE", "int8")
+    STT_WORKERS: int = int(os.getenv("STT_WORKERS", 2))
+    STT_CPU_THREADS: int = int(os.getenv("STT_CPU_THREADS", 2))
+    STT_CHUNK_SECONDS: float = float(os.getenv("STT_CHUNK_SECONDS", 30))
+
+    # Local category/priority classifier; only low-confidence complaints go to the LLM for extraction
+    LOCAL_CLASSIFIER_ENABLED: bool = os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() == "true"
+    CLASSIFIER_MODEL_PATH: str = os.getenv("CLASSIFIER_MODEL_PATH", "classifier_model.json")  # keyword seeds only when missing
+    CLASSIFIER_THRESHOLD: float = float(os.getenv("CLASSIFIER_THRESHOLD", 0.99))
+    CLASSIFIER_PRIORITY_THRESHOLD: float = float(os.getenv("CLASSIFIER_PRIORITY_THRESHOLD", 0.6))
+
+    # Cold start: build the R2/Cloudinary clients and load the STT worker models in the background right after startup
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+    # Admission control for the LLM-backed endpoints
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_RATE: float = float(os.getenv("RATE_LIMIT_RATE", 0.2))  # tokens per second per client (12/min)
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", 10))
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    RATE_LIMIT_URL: str = os.getenv("RATE_LIMIT_URL", "")  # e.g. redis://localhost:6379/1; per-process buckets when empty
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", 32))
+    RATE_LIMIT_TRUSTED_PROXIES: str = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "")  # IPs/CIDRs whose X-Forwarded-For is believed
+
+    # Background jobs (async voice processing)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", 4))
+    JOB_QUEUE_MAX_SIZE: int = int(os.getenv("JOB_QUEUE_MAX_SIZE", 1000))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", 3600))
+    JOB_QUEUE_URL: str = os.getenv("JOB_QUEUE_URL", "")  # e.g. redis://localhost:6379/0; in-process queue when empty
+
+    # Shared upload ingestion
+    INGEST_SPOOL_THRESHOLD_MB: int = int(os.getenv("INGEST_SPOOL_THRESHOLD_MB", 4))
+    INGEST_MAX_IMAGE_MB: int = int(os.getenv("INGEST_MAX_IMAGE_MB", 25))
+    INGEST_MAX_AUDIO_MB: int = int(os.getenv("INGEST_MAX_AUDIO_MB", 50))
+    INGEST_MAX_AUDIO_SECONDS: float = float(os.getenv("INGEST_MAX_AUDIO_SECONDS", 600))
+
+    # AI response cache (in-process LRU + optional SQLite tier)
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_MAX_ENTRIES: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", 1024))
+    AI_CACHE_TTL: float = float(os.getenv("AI_CACHE_TTL", 86400))
+    AI_CACHE_DB_PATH: str = os.getenv("AI_CACHE_DB_PATH", "")
+
+    # Chat sessions (server-side conversation history)
+    CHAT_SESSION_TTL: float = float(os.getenv("CHAT_SESSION_TTL", 1800))
+    CHAT_SESSION_MAX: int = int(os.getenv("CHAT_SESSION_MAX", 10000))
+    CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", 1500))
+
+    # Firestore write-behind queue
+    WRITE_QUEUE_MAX_BATCH: int = int(os.getenv("WRITE_QUEUE_MAX_BATCH", 500))
+    WRITE_QUEUE_FLUSH_INTERVAL: float = float(os.getenv("WRITE_QUEUE_FLUSH_INTERVAL", 0.5))
+    WRITE_QUEUE_MAX_SIZE: int = int(os.getenv("WRITE_QUEUE_MAX_SIZE", 5000))
+    WRITE_QUEUE_PUT_TIMEOUT: float = float(os.getenv("WRITE_QUEUE_PUT_TIMEOUT", 2.0))
+    WRITE_QUEUE_MAX_RETRIES: int = int(os.getenv("WRITE_QUEUE_MAX_RETRIES", 3))
+    WRITE_QUEUE_DEAD_LETTER_PATH: str = os.getenv("WRITE_QUEUE_DEAD_LETTER_PATH", "write_queue_dead_letters.jsonl")  # in-memory only when empty
+
+    # Near-duplicate complaint detection
+    DUPLICATE_RADIUS_M: float = float(os.getenv("DUPLICATE_RADIUS_M", 150))
+    DUPLICATE_WINDOW_HOURS: float = float(os.getenv("DUPLICATE_WINDOW_HOURS", 72))
+    DUPLICATE_MODE: str = os.getenv("DUPLICATE_MODE", "flag")  # flag: mark the new complaint; merge: fold into the existing one
+
+    # Auth: Firebase ID tokens on endpoints that read complaints or act on a complaint ID
+    AUTH_ROLE_CACHE_TTL: float = float(os.getenv("AUTH_ROLE_CACHE_TTL", 60))
+
+    # Dashboard aggregates
+    STATS_CACHE_TTL: float = float(os.getenv("STATS_CACHE_TTL", 60))
+
+    # Logging
+    LOG_JSON: bool = os.getenv("LOG_JSON", "true").lower() == "true"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
     # Server
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", 8000))
@@ -1,16 +1,122 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import logging
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import base64
+import hashlib
 import json
+from datetime import datetime, timezone
+import os
+import time
+# Configure logging before the services below log during their own initialization
+from services.observability import configure_logging, register_stats, render_metrics, REQUEST_LATENCY, span
+configure_logging()
 from services.r2_service import r2_service
 from services.ai_service import ai_service
 from services.cloudinary_service import cloudinary_service
-import firebase_admin
-from firebase_admin import credentials, firestore
+from services.image_service import image_service
+from services.ingest_service import SpooledUpload, UploadTooLarge, InvalidAudio, validate_audio
+from services.stt_service import SUPPORTED_LANGUAGES
+from services.cache_service import response_cache
+from services.pipeline import StageTimer
+from services.session_service import session_service
+from services.write_queue import write_queue, WriteQueueFull
+from services.job_queue import job_queue, JobQueueFull
+from services.geo_index import geo_index
+from services.stats_service import stats_service
+from services.complaint_query import complaint_query_service, FirestoreComplaintStore, InvalidQuery, MAX_PAGE_SIZE
+from services.rate_limit import admission, client_key, RateLimited
+from services.auth_service import auth_service, AuthError, AuthUnavailable, Caller
+from services.providers import LazyProvider, warm_up
+from services import providers
 from config import settings
 
-app = FastAPI(title="Civic Connect Voice API")
+logger = logging.getLogger(__name__)
+
+def _init_firestore():
+    # firebase_admin + google-cloud-firestore take ~0.5 s to import; mock mode never loads them
+    if not (settings.FIREBASE_CREDENTIALS and os.path.exists(settings.FIREBASE_CREDENTIALS)):
+        logger.warning("Firebase Creds not found. Running in Mock DB mode.")
+        return None
+    try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS)
+        firebase_admin.initialize_app(cred)
+        return firestore.client()
+    except Exception as e:
+        logger.error(f"Firebase Init Error: {e}")
+        return None
+
+firestore_provider = LazyProvider("firestore", _init_firestore)
+db = None
+
+async def warm_up_services():
+    async def warm_stt():
+        try:
+            await ai_service.stt.warm_up()
+        except Exception as e:
+            logger.error(f"STT warm-up failed: {e}")
+
+    await asyncio.gather(warm_up(), warm_stt())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global db
+    # The write queue, duplicate index and stats need Firestore up front; everything else is lazy
+    db = await firestore_provider.aget()
+    # Without Firestore the query API serves the (empty) in-memory read model
+    if db:
+        complaint_query_service.bind(FirestoreComplaintStore(db))
+    auth_service.bind(db)
+    await ai_service.startup()
+    ai_service.stt.startup()
+    write_queue.start(db)
+    await geo_index.warm_load(db)
+    stats_service.bind(db)
+    await stats_service.ensure_counters()
+    job_queue.start()
+    # Build the upload clients and load the STT models in the background so the first requests don't pay for them
+    warmup_task = asyncio.create_task(warm_up_services()) if settings.WARMUP_ON_STARTUP else None
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await job_queue.stop()
+    # Drain pending complaint writes before the process exits
+    await write_queue.stop()
+    await ai_service.shutdown()
+    ai_service.stt.shutdown()
+    response_cache.close()
+    await admission.close()
+
+app = FastAPI(title="Civic Connect Voice API", lifespan=lifespan)
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        with span(f"{request.method} {request.url.path}"):
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep metric cardinality bounded
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(request.method, getattr(route, "path", "unmatched"), str(status)).observe(time.perf_counter() - start)
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    logger.info(f"Rejected {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests, please retry shortly."},
+        headers={"Retry-After": admission.retry_after_header(exc)}
+    )
 
 # CORS setup
 app.add_middleware(
@@ -21,89 +127,407 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Firebase (Mock/Try)
-try:
-    if settings.FIREBASE_CREDENTIALS and os.path.exists(settings.FIREBASE_CREDENTIALS):
-        cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS)
-        firebase_admin.initialize_app(cred)
-        db = firestore.client()
-    else:
-        print("Firebase Creds not found. Running in Mock DB mode.")
-        db = None
-except Exception as e:
-    print(f"Firebase Init Error: {e}")
-    db = None
+register_stats("ai_cache", response_cache.stats)
+register_stats("write_queue", write_queue.stats)
+register_stats("nvidia", ai_service.resilience.stats)
+register_stats("duplicate_index", geo_index.stats)
+register_stats("stt", ai_service.stt.stats)
+register_stats("jobs", job_queue.stats)
+register_stats("rate_limit", admission.stats)
+register_stats("startup", providers.stats)
+register_stats("classifier", ai_service.classifier.stats)
+
+async def current_caller(request: Request) -> Caller:
+    """
+    The verified Firebase user behind the request (Authorization: Bearer <ID token>).
+    """
+    try:
+        return await auth_service.authenticate(request.headers.get("Authorization"))
+    except AuthUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except AuthError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+async def verified_client_key(request: Request) -> str:
+    """
+    Rate-limit key for endpoints that also take a userId form field: the uid behind a valid bearer
+    token, otherwise the client IP. The form field is never used, since anyone could spread requests
+    over made-up IDs or spend someone else's budget with it.
+    """
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        try:
+            return client_key(request, (await auth_service.authenticate(authorization)).uid)
+        except AuthError:
+            pass
+    return client_key(request)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 class VoiceResponse(BaseModel):
     status: str
     complaintId: str
     data: dict
+    timings: dict[str, float] = {}
+
+async def run_voice_pipeline(
+    audio: SpooledUpload,
+    language: str,
+    latitude: float,
+    longitude: float,
+    userId: str,
+    address: Optional[str]
+) -> dict:
+    """
+    Upload + STT -> translation -> extraction -> dedupe -> queued write for one recording.
+    Storage and transcription each read the spooled recording through their own reader.
+    """
+    timer = StageTimer()
+
+    async def upload_audio():
+        with audio.reader() as source:
+            return await r2_service.upload_audio_source(source, audio.filename)
+
+    async def run_ai_chain():
+        # STT worker processes open the spool file by path; in-memory recordings get a reader over the shared bytes
+        stt_source = audio.path if audio.on_disk else audio.reader()
+        # Transcription -> (translation) -> extraction must stay sequential
+        transcript = await timer.run("transcribe", ai_service.transcribe(stt_source, language))
+
+        location_context = address or f"{latitude}, {longitude}"
+        if language == 'te' and settings.COMBINED_EXTRACTION_ENABLED:
+            # One round trip for translation + extraction; None means fall back to the two-call path
+            combined = await timer.run(
+                "translate_extract",
+                ai_service.translate_and_extract(transcript, 'te', location_context)
+            )
+            if combined is not None:
+                transcript_english, extraction = combined
+                return transcript, transcript_english, extraction
+
+        transcript_english = transcript
+        if language == 'te':
+            transcript_english = await timer.run("translate", ai_service.translate(transcript, 'te', 'en'))
+
+        extraction = await timer.run(
+            "extract",
+            ai_service.extract_details(transcript_english, location_context)
+        )
+        return transcript, transcript_english, extraction
+
+    # 1-3. Audio upload to R2 is independent of the AI chain, so both run concurrently
+    audio_url, (transcript, transcript_english, extraction) = await asyncio.gather(
+        timer.run("upload", upload_audio()),
+        run_ai_chain(),
+    )
+    
+    # 4. Construct Record
+    complaint_record = {
+        "userId": userId,
+        "callType": "Voice Complaint",
+        "source": "voice",
+        "audioUrl": audio_url,
+        "title": extraction.get('summary', 'Voice Complaint'),
+        "description": extraction.get('summary', 'No description'),
+        "category": extraction.get('category', 'others'),
+        "priority": extraction.get('priority', 'medium'),
+        "status": "pending",
+        "location": {
+            "latitude": latitude,
+            "longitude": longitude,
+            "address": address or extraction.get('location_details', 'Unknown')
+        },
+        "metadata": {
+            "language": language,
+            "transcriptOriginal": transcript,
+            "transcriptEnglish": transcript_english,
+            # Training skips locally classified complaints so the model never learns from itself
+            "classifiedBy": extraction.get("source", "llm")
+        },
+        "createdAt": "NOW"
+    }
+    if db:
+        from firebase_admin import firestore
+        complaint_record["createdAt"] = firestore.SERVER_TIMESTAMP
+    
+    # 5. Near-duplicate check against recent complaints of the same category close by
+    with timer.stage("dedupe"):
+        # A fallback extraction's category is a placeholder, so it can't identify a duplicate
+        duplicates = [] if extraction.get("source") == "fallback" else geo_index.find_duplicates(
+            latitude, longitude, complaint_record["category"]
+        )
+    status = "success"
+    if duplicates:
+        complaint_record["possibleDuplicates"] = [d["id"] for d in duplicates[:5]]
+
+    # 6. Queue the Firestore write (ID is assigned locally, batch commit happens in the background)
+    complaint_id = "mock-id-123"
+    with timer.stage("firestore"):
+        if db and duplicates and settings.DUPLICATE_MODE == "merge":
+            # Fold this report into the nearest existing complaint instead of creating a new one
+            complaint_id = duplicates[0]["id"]
+            status = "duplicate"
+            await write_queue.enqueue_update('complaints', complaint_id, {
+                "reportCount": firestore.Increment(1),
+                "reporters": firestore.ArrayUnion([userId]),
+                "updatedAt": firestore.SERVER_TIMESTAMP
+            })
+        elif db:
+            complaint_id = await write_queue.enqueue('complaints', complaint_record)
+            await stats_service.record_created(complaint_record)
+            geo_index.add(complaint_id, latitude, longitude, complaint_record["category"])
+
+    timings = timer.report()
+    logger.info("Voice complaint processed", extra={"complaint_id": complaint_id, "duplicates": len(duplicates), "timings_ms": timings})
+        
+    return {
+        "status": status,
+        "complaintId": complaint_id,
+        # Returning data for client-side fallback/confirmation (SERVER_TIMESTAMP sentinel isn't JSON-serializable)
+        "data": {**complaint_record, "createdAt": datetime.now(timezone.utc).isoformat()},
+        "timings": timings
+    }
+
+async def run_voice_job(payload: dict) -> dict:
+    # The job owns the spool file written at enqueue time; close() deletes it
+    audio = SpooledUpload.from_path(payload["audioPath"], payload["filename"])
+    try:
+        return await run_voice_pipeline(
+            audio, payload["language"], payload["latitude"], payload["longitude"],
+            payload["userId"], payload.get("address")
+        )
+    finally:
+        audio.close()
+
+job_queue.register("voice", run_voice_job)
+
+async def receive_voice_upload(audio_file: UploadFile, spool_threshold: int | None = None) -> SpooledUpload:
+    """
+    Reads the recording once into a size-capped spool and validates format and duration
+    before any upload or transcription work starts.
+    """
+    try:
+        audio = await SpooledUpload.receive(
+            audio_file, spool_threshold=spool_threshold, max_bytes=settings.INGEST_MAX_AUDIO_MB * 1024 * 1024
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    try:
+        await validate_audio(audio, settings.INGEST_MAX_AUDIO_SECONDS)
+    except UploadTooLarge as e:
+        audio.close()
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidAudio as e:
+        audio.close()
+        raise HTTPException(status_code=400 if audio.size == 0 else 415, detail=str(e))
+    return audio
 
 @app.post("/api/v1/complaints/voice", response_model=VoiceResponse)
 async def process_voice_complaint(
+    http_request: Request,
     audio_file: UploadFile = File(...),
     language: str = Form(...),
     latitude: float = Form(...),
     longitude: float = Form(...),
     userId: str = Form(...),
-    address: Optional[str] = Form(None)
+    address: Optional[str] = Form(None),
+    mode: str = Form("sync")
 ):
+    """
+    mode=async spools the recording, queues it and returns 202 with a job ID straight away;
+    poll /api/v1/jobs/{jobId} for the result. Meant for clients on slow or flaky networks.
+    """
+    # Reject before anything is spooled or queued; an async job would only fail later
+    if language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"language must be one of: {', '.join(SUPPORTED_LANGUAGES)}")
+    key = await verified_client_key(http_request)
+    if mode == "async":
+        # Queued jobs are bounded by the job workers, so only the per-client budget applies
+        await admission.check_client(key)
+        return await enqueue_voice_job(audio_file, language, latitude, longitude, userId, address)
+    async with admission.guard(key):
+        # A pooled STT engine reads from disk anyway, so spool straight there and share that one copy
+        audio = await receive_voice_upload(audio_file, spool_threshold=0 if ai_service.stt.engine.pooled else None)
+        try:
+            return await run_voice_pipeline(audio, language, latitude, longitude, userId, address)
+        except WriteQueueFull as e:
+            logger.warning(f"Voice complaint rejected, write queue full: {e}")
+            raise HTTPException(status_code=503, detail="Server busy, please retry shortly.", headers={"Retry-After": "2"})
+        except Exception as e:
+            logger.error(f"Error processing voice complaint: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            audio.close()
+
+async def enqueue_voice_job(audio_file: UploadFile, language, latitude, longitude, userId, address) -> JSONResponse:
+    # The job outlives this request, so the recording always goes to a temp file the job owns
+    spooled = await receive_voice_upload(audio_file, spool_threshold=0)
+
+    payload = {
+        "audioPath": spooled.path,
+        "filename": audio_file.filename or "recording.webm",
+        "language": language,
+        "latitude": latitude,
+        "longitude": longitude,
+        "userId": userId,
+        "address": address
+    }
     try:
-        # 1. Upload to R2
-        audio_url = await r2_service.upload_audio(audio_file)
-        
-        # 2. Transcription
-        # Save temp file for OpenAI usage if needed, or pass stream
-        # Here we mock passing the file object directly for the service logic
-        transcript = await ai_service.transcribe(audio_file.file, language)
-        
-        transcript_english = transcript
-        if language == 'te':
-            transcript_english = await ai_service.translate(transcript, 'te', 'en')
-            
-        # 3. AI Extraction
-        extraction = await ai_service.extract_details(transcript_english, address or f"{latitude}, {longitude}")
-        
-        # 4. Construct Record
-        complaint_record = {
-            "userId": userId,
-            "callType": "Voice Complaint",
-            "source": "voice",
-            "audioUrl": audio_url,
-            "title": extraction.get('summary', 'Voice Complaint'),
-            "description": extraction.get('summary', 'No description'),
-            "category": extraction.get('category', 'others'),
-            "priority": extraction.get('priority', 'medium'),
-            "status": "pending",
-            "location": {
-                "latitude": latitude,
-                "longitude": longitude,
-                "address": address or extraction.get('location_details', 'Unknown')
-            },
-            "metadata": {
-                "language": language,
-                "transcriptOriginal": transcript,
-                "transcriptEnglish": transcript_english
-            },
-            "createdAt": firestore.SERVER_TIMESTAMP if db else "NOW"
-        }
-        
-        # 5. Save to Firestore
-        complaint_id = "mock-id-123"
-        if db:
-            doc_ref = db.collection('complaints').add(complaint_record)
-            complaint_id = doc_ref[1].id
-            
-        return {
-            "status": "success",
-            "complaintId": complaint_id,
-            "data": complaint_record  # Returning data for client-side fallback/confirmation
-        }
+        job_id = await job_queue.submit("voice", payload)
+    except JobQueueFull as e:
+        spooled.close()
+        logger.warning(f"Voice job rejected: {e}")
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly.", headers={"Retry-After": "5"})
+
+    status_url = f"/api/v1/jobs/{job_id}"
+    return JSONResponse(
+        status_code=202,
+        content={"status": "queued", "jobId": job_id, "statusUrl": status_url},
+        headers={"Location": status_url}
+    )
 
+@app.get("/api/v1/jobs/{job_id}")
+async def job_status(job_id: str):
+    status = await job_queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return status
+
+@app.get("/api/v1/complaints")
+async def list_complaints(
+    caller: Caller = Depends(current_caller),
+    userId: Optional[str] = None,
+    assignedTo: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Newest-first page of complaints. Pass the returned nextCursor back to fetch the following page.
+    Supports one scope (userId or assignedTo) plus one of status/category/priority, each backed by
+    a composite index in firestore.indexes.json.
+    Mirrors firestore.rules, which the admin SDK bypasses: citizens only ever see their own complaints,
+    admins and employees can query all of them.
+    """
+    if not caller.is_staff:
+        if (userId and userId != caller.uid) or assignedTo:
+            raise HTTPException(status_code=403, detail="Citizens can only list their own complaints")
+        userId = caller.uid
+    try:
+        filters = complaint_query_service.build_filters(
+            userId=userId, assignedTo=assignedTo, status=status, category=category, priority=priority
+        )
+        return await complaint_query_service.list_page(filters, start, end, limit, cursor)
+    except InvalidQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Error processing voice complaint: {e}")
+        logger.error(f"Complaint query failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/complaints/duplicates")
+async def find_duplicates_endpoint(latitude: float, longitude: float, category: str):
+    """
+    Lets clients that write complaints directly (form, chat) check for a nearby open report first.
+    """
+    duplicates = geo_index.find_duplicates(latitude, longitude, category)
+    return {"duplicates": duplicates, "radiusMeters": geo_index.radius_m}
+
+@app.post("/api/v1/complaints/duplicates/register")
+async def register_complaint_location(complaintId: str = Form(...), caller: Caller = Depends(current_caller)):
+    """
+    Keeps the duplicate index and the dashboard counters current for complaints created outside this API.
+    Location and category come from the stored complaint, which must exist and belong to the caller,
+    so merge mode can never queue updates against an ID that isn't a real complaint.
+    """
+    complaint = await complaint_query_service.get(complaintId)
+    if complaint is None:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    if complaint.get("userId") != caller.uid and not caller.is_staff:
+        raise HTTPException(status_code=403, detail="Not your complaint")
+    location = complaint.get("location") or {}
+    if location.get("latitude") is None or location.get("longitude") is None:
+        raise HTTPException(status_code=400, detail="Complaint has no coordinates")
+
+    if complaintId not in geo_index:
+        created = complaint.get("createdAt")
+        created_ts = created.timestamp() if hasattr(created, "timestamp") else None
+        geo_index.add(complaintId, location["latitude"], location["longitude"], complaint.get("category", "others"), created_ts)
+    await stats_service.record_registered(complaintId, complaint)
+    return {"status": "indexed"}
+
+class ComplaintUpdate(BaseModel):
+    status: Optional[Literal["pending", "in_progress", "resolved", "closed"]] = None
+    assignedTo: Optional[str] = None
+    adminNote: Optional[str] = None
+    resolutionImage: Optional[str] = None
+
+@app.patch("/api/v1/complaints/{complaint_id}")
+async def update_complaint(complaint_id: str, changes: ComplaintUpdate, caller: Caller = Depends(current_caller)):
+    """
+    Status, assignment and resolution changes by staff. Going through the API (not straight to
+    Firestore) is what keeps the dashboard counters in step.
+    """
+    if not caller.is_staff:
+        raise HTTPException(status_code=403, detail="Only staff can update complaints")
+    complaint = await complaint_query_service.get(complaint_id)
+    if complaint is None:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    update = changes.model_dump(exclude_unset=True)
+    if not update:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+
+    from firebase_admin import firestore
+    update["updatedAt"] = firestore.SERVER_TIMESTAMP
+    if update.get("status") == "resolved":
+        update["resolvedAt"] = firestore.SERVER_TIMESTAMP
+    await write_queue.enqueue_update('complaints', complaint_id, update)
+    await stats_service.record_updated(complaint, {**complaint, **update})
+    return {"status": "queued", "complaintId": complaint_id}
+
+@app.delete("/api/v1/complaints/{complaint_id}")
+async def delete_complaint(complaint_id: str, caller: Caller = Depends(current_caller)):
+    """
+    Same rule as firestore.rules: citizens may delete their own pending complaints, admins any.
+    """
+    complaint = await complaint_query_service.get(complaint_id)
+    if complaint is None:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    owns_pending = complaint.get("userId") == caller.uid and complaint.get("status") == "pending"
+    if not owns_pending and caller.role != "admin":
+        raise HTTPException(status_code=403, detail="Not allowed to delete this complaint")
+    await write_queue.enqueue_delete('complaints', complaint_id)
+    await stats_service.record_deleted(complaint)
+    return {"status": "queued", "complaintId": complaint_id}
+
+@app.get("/api/v1/stats")
+async def stats_endpoint():
+    """
+    Dashboard aggregates (DashboardStats plus breakdowns) from the cached counters document.
+    """
+    try:
+        return await stats_service.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Stats unavailable: {e}")
+
+@app.post("/api/v1/stats/rebuild")
+async def rebuild_stats_endpoint(caller: Caller = Depends(current_caller)):
+    """
+    Recounts the dashboard counters from every complaint (admins only; a full collection scan).
+    """
+    if caller.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can rebuild stats")
+    try:
+        return await stats_service.rebuild()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Stats rebuild failed: {e}")
+
 class AnalysisResponse(BaseModel):
     category: str
     title: str
@@ -111,19 +535,27 @@ class AnalysisResponse(BaseModel):
     priority: str
 
 @app.post("/api/v1/analyze-image", response_model=AnalysisResponse)
-async def analyze_image_endpoint(image: UploadFile = File(...)):
-    try:
-        # Read file
-        contents = await image.read()
-        
-        import base64
-        image_b64 = base64.b64encode(contents).decode("utf-8")
-        
-        result = await ai_service.analyze_image(image_b64)
-        return result
-    except Exception as e:
-        print(f"Error analyzing image: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def analyze_image_endpoint(http_request: Request, image: UploadFile = File(...)):
+    async with admission.guard(client_key(http_request)):
+        try:
+            # Read file
+            contents = await image.read()
+
+            # A repeat upload is answered before any decoding
+            cache_key = ai_service.image_cache_key(hashlib.sha256(contents).hexdigest())
+            cached = await ai_service.cached_image_analysis(cache_key)
+            if cached is not None:
+                return cached
+
+            # Downscale/recompress off the event loop before the 33% base64 inflation
+            contents, mime_type = await image_service.preprocess(contents, image.content_type)
+            image_b64 = base64.b64encode(contents).decode("utf-8")
+
+            result = await ai_service.analyze_image(image_b64, mime_type, cache_key=cache_key)
+            return result
+        except Exception as e:
+            logger.error(f"Error analyzing image: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/upload-image")
 async def upload_image_endpoint(image: UploadFile = File(...)):
@@ -134,11 +566,63 @@ async def upload_image_endpoint(image: UploadFile = File(...)):
         url = await cloudinary_service.upload_image(image)
         return {"url": url}
     except Exception as e:
-        print(f"Error in upload-image endpoint: {e}")
+        logger.error(f"Error in upload-image endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+class IngestImageResponse(BaseModel):
+    # None when storage failed; the client then uploads the photo itself on submit
+    url: Optional[str] = None
+    analysis: AnalysisResponse
+
+@app.post("/api/v1/ingest-image", response_model=IngestImageResponse)
+async def ingest_image_endpoint(http_request: Request, image: UploadFile = File(...)):
+    """
+    Single-upload path for a complaint photo: the body is read once into a shared spooled buffer,
+    then analysed and stored on Cloudinary concurrently.
+    """
+    async with admission.guard(client_key(http_request)):
+        return await _ingest_image(image)
+
+async def _ingest_image(image: UploadFile):
+    try:
+        upload = await SpooledUpload.receive(image, max_bytes=settings.INGEST_MAX_IMAGE_MB * 1024 * 1024)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        async def analyze():
+            # The digest was taken while the body streamed in, so a repeat upload skips preprocessing
+            cache_key = ai_service.image_cache_key(upload.digest)
+            cached = await ai_service.cached_image_analysis(cache_key)
+            if cached is not None:
+                return cached
+            contents, mime_type = await image_service.preprocess_upload(upload)
+            image_b64 = base64.b64encode(contents).decode("utf-8")
+            return await ai_service.analyze_image(image_b64, mime_type, cache_key=cache_key)
+
+        # A disk spool is uploaded from its path in CLOUDINARY_CHUNK_MB chunks; in-memory bodies share their bytes
+        store_source = upload.path if upload.on_disk else await upload.read_bytes()
+        analysis, url = await asyncio.gather(
+            analyze(), cloudinary_service.upload_source(store_source), return_exceptions=True
+        )
+        if isinstance(analysis, BaseException):
+            raise analysis
+        if isinstance(url, BaseException):
+            # A storage outage shouldn't throw away a finished analysis
+            logger.warning(f"Ingest-image storage failed, returning analysis only: {url}")
+            url = None
+        return {"url": url, "analysis": analysis}
+    except Exception as e:
+        logger.error(f"Error in ingest-image endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.close()
+
 class ChatRequest(BaseModel):
-    history: list[dict]
+    # Either resend the full history (legacy clients) or send session_id + the new message only
+    history: list[dict] = []
+    session_id: Optional[str] = None
+    message: Optional[str] = None
     location_context: str = ""
     language: str = "en"
 
@@ -146,28 +630,116 @@ class ChatResponse(BaseModel):
     response_text: str
     is_complete: bool
     extracted_data: dict | None = None
+    session_id: str | None = None
+
+async def _load_chat_history(request: ChatRequest) -> tuple[str | None, list]:
+    """
+    Returns (session_id, full history including the new user turn).
+    session_id is None for legacy clients that manage history themselves.
+    """
+    if request.message is None and request.session_id is None:
+        return None, request.history
+
+    session_id = request.session_id or session_service.new_session_id()
+    history = await session_service.load(session_id) if request.session_id else list(request.history)
+    if request.message:
+        history.append({"role": "user", "content": request.message})
+    return session_id, history
+
+async def _save_chat_turn(session_id: str | None, history: list, result: dict):
+    if session_id is None:
+        return
+    if result.get("error"):
+        # Leave the stored history untouched so the client can simply resend the same message
+        return
+    if result["is_complete"]:
+        await session_service.end(session_id)
+    else:
+        await session_service.save(session_id, history + [{"role": "assistant", "content": result["response_text"]}])
 
 @app.post("/api/v1/chat/complaint", response_model=ChatResponse)
-async def chat_complaint_endpoint(request: ChatRequest):
+async def chat_complaint_endpoint(request: ChatRequest, http_request: Request):
+    async with admission.guard(client_key(http_request)):
+        try:
+            session_id, history = await _load_chat_history(request)
+
+            # Pass the token-budgeted window of history to AI service
+            result = await ai_service.run_complaint_conversation(
+                session_service.window(history),
+                request.location_context,
+                request.language
+            )
+            await _save_chat_turn(session_id, history, result)
+
+            return ChatResponse(
+                response_text=result["response_text"],
+                is_complete=result["is_complete"],
+                extracted_data=result.get("extracted_data"),
+                session_id=session_id
+            )
+        except Exception as e:
+            logger.error(f"Chat Error: {e}")
+            return ChatResponse(
+                response_text="I'm sorry, I encountered an error. Please try again.",
+                is_complete=False,
+                session_id=request.session_id
+            )
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    Holds an admission slot for the life of the stream. Released when the response finishes however
+    it ends, including a client that disconnects before the generator is first iterated (whose
+    finally would then never run).
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            admission.release_slot()
+
+@app.post("/api/v1/chat/complaint/stream")
+async def chat_complaint_stream_endpoint(request: ChatRequest, http_request: Request):
+    """
+    Server-Sent Events variant of /chat/complaint.
+    Emits 'token' events as the reply streams in (so TTS can start early) and a final 'result'
+    event shaped like ChatResponse.
+    """
+    # Admit before the 200 goes out; the response holds the slot until the stream finishes
+    await admission.check_client(client_key(http_request))
+    admission.acquire_slot()
     try:
-        # Pass history to AI service
-        result = await ai_service.run_complaint_conversation(
-            request.history, 
-            request.location_context,
-            request.language
-        )
-        
-        return ChatResponse(
-            response_text=result["response_text"],
-            is_complete=result["is_complete"],
-            extracted_data=result.get("extracted_data")
-        )
-    except Exception as e:
-        print(f"Chat Error: {e}")
-        return ChatResponse(
-            response_text="I'm sorry, I encountered an error. Please try again.",
-            is_complete=False
-        )
+        session_id, history = await _load_chat_history(request)
+    except Exception:
+        admission.release_slot()
+        raise
+
+    async def event_stream():
+        try:
+            async for event in ai_service.stream_complaint_conversation(
+                session_service.window(history),
+                request.location_context,
+                request.language
+            ):
+                if event["type"] == "result":
+                    await _save_chat_turn(session_id, history, event)
+                    event["session_id"] = session_id
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"Chat Stream Error: {e}")
+            error_event = {
+                "type": "result",
+                "response_text": "I'm sorry, I encountered an error. Please try again.",
+                "is_complete": False,
+                "session_id": session_id
+            }
+            yield f"data: {json.dumps(error_event)}\n\n"
+
+    return AdmittedStreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 if __name__ == "__main__":
     import uvicorn
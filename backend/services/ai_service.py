@@ -1,67 +1,282 @@
+import logging
 import httpx
 import json
+import textwrap
+from functools import lru_cache
 from config import settings
+from services.cache_service import response_cache
+from services.resilience import nvidia_caller, RETRYABLE_STATUS
+from services.observability import record_usage, span
+from services.output_parser import (
+    ConversationResult, ExtractionResult, ImageAnalysisResult, OutputParseError, TranslateExtractResult, parse_model
+)
+from services.stt_service import stt_service
+from services.classifier import local_classifier
+
+logger = logging.getLogger(__name__)
+
+# Conversation system prompts, formatted once per (language, location) by _conversation_prompt
+CONVERSATION_PROMPT_EN = """
+        You are a helpful civic complaint intake assistant for 'CivicConnect'.
+        Your goal is to gather the following details from the user:
+        1. Category (road, garbage, drainage, water, streetlight, others)
+        2. Description (What exactly is the problem?)
+        3. Priority/Severity (Does it look dangerous/urgent?)
+        
+        CONTEXT:
+        - The user's GPS location is ALREADY CAPTURED ({location_context}). You verify this location only if necessary.
+        - Act as a polite interviewer.
+        - Ask ONE short clarifying question at a time.
+        - Keep your responses BRIEF (max 1-2 sentences) as they will be spoken aloud.
+        
+        TERMINATION:
+        - When you have obtained Category, Description, and Priority, output the special token [COMPLETE] followed immediately by a JSON object.
+        - JSON Format: {{"category": "...", "title": "...", "description": "...", "priority": "..."}}
+        
+        Example:
+        Assistant: "How large is the pothole?"
+        User: "It's big."
+        Assistant: [COMPLETE] {{"category": "road", "title": "Large Pothole", "description": "Big pothole blocking traffic", "priority": "high"}}
+        """
+
+CONVERSATION_PROMPT_TE = """
+        మీరు 'CivicConnect' కోసం సహాయక పౌర ఫిర్యాదు స్వీకరణ సహాయకులు.
+        మీ లక్ష్యం వినియోగదారు నుండి కింది వివరాలను సేకరించడం:
+        1. వర్గం (రోడ్డు, చెత్త, డ్రైనేజీ, నీరు, వీధి దీపం, ఇతర)
+        2. వివరణ (సమస్య ఏమిటి?)
+        3. తీవ్రత (అది ప్రమాదకరంగా ఉందా?)
+        
+        సందర్భం:
+        - వినియోగదారు GPS స్థానం ఇప్పటికే తీసుకోబడింది ({location_context}).
+        - మర్యాదపూర్వక ఇంటర్వ్యూయర్‌గా వ్యవహరించండి.
+        - ఒక సమయంలో ఒక చిన్న ప్రశ్న అడగండి.
+        - మీ సమాధానాలు చాలా క్లుప్తంగా (గరిష్టంగా 1-2 వాక్యాలు) ఉండాలి ఎందుకంటే అవి బిగ్గరగా చదవబడతాయి.
+        - **ముఖ్య గమనిక**: మీరు మీ ప్రతిస్పందనను పూర్తిగా తెలుగులో (Telugu Script) ఇవ్వాలి.
+        
+        ముగింపు:
+        - మీరు వర్గం, వివరణ మరియు తీవ్రతను పొందినప్పుడు, [COMPLETE] అనే ప్రత్యేక టోకెన్‌ను అవుట్‌పుట్ చేయండి, దాని వెంటనే JSON ఆబ్జెక్ట్ ఉంటుంది.
+        - JSON ఫార్మాట్ (ఇంగ్లీష్ కీలతో): {{"category": "...", "title": "...", "description": "...", "priority": "..."}}
+        
+        ఉదాహరణ:
+        Assistant: "ఆ గుంత ఎంత పెద్దది?"
+        User: "చాలా పెద్దది."
+        Assistant: [COMPLETE] {{"category": "road", "title": "Large Pothole", "description": "Big pothole blocking traffic", "priority": "high"}}
+        """
+
+LANGUAGE_NAMES = {"te": "Telugu", "en": "English"}
+
+IMAGE_ANALYSIS_PROMPT = """
+        Analyze this image of a civic issue. 
+        Extract the following details in JSON format:
+        1. category: (road, garbage, drainage, water, streetlight, streetlight, other)
+        2. title: A short, clear title.
+        3. description: A detailed description of the visual issue.
+        4. priority: (low, medium, high, critical)
+        
+        Output ONLY valid JSON: {"category": "...", "title": "...", "description": "...", "priority": "..."}
+        """
+
+TRANSLATE_EXTRACT_PROMPT = textwrap.dedent("""
+    The civic complaint below is in {source_lang}. In one JSON object:
+    1. translation: faithful English translation of the complaint
+    2. category: one of road, garbage, drainage, water, streetlight, others
+    3. summary: short English description
+    4. priority: one of low, medium, high, critical
+    5. location_details: any place names mentioned, in English
+
+    Output ONLY valid JSON like:
+    {{"translation": "...", "category": "...", "summary": "...", "priority": "...", "location_details": "..."}}
+    """).strip()
+
+TRANSLATE_EXTRACT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "translation": {"type": "string"},
+        "category": {"type": "string", "enum": ["road", "garbage", "drainage", "water", "streetlight", "others"]},
+        "summary": {"type": "string"},
+        "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]},
+        "location_details": {"type": "string"},
+    },
+    "required": ["translation", "category", "summary", "priority", "location_details"],
+}
+
+@lru_cache(maxsize=256)
+def _conversation_prompt(language: str, location_context: str) -> str:
+    template = CONVERSATION_PROMPT_TE if language == 'te' else CONVERSATION_PROMPT_EN
+    # Dedent so the source indentation isn't billed as input tokens on every turn
+    return textwrap.dedent(template).strip().format(location_context=location_context)
 
 class AIService:
     def __init__(self):
         self.api_key = settings.NVIDIA_API_KEY
-        self.invoke_url = "https://integrate.api.nvidia.com/v1/chat/completions"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Accept": "application/json"
-        }
+        self.invoke_url = settings.NVIDIA_API_URL
+        self.chat_model = "mistralai/mistral-large-3-675b-instruct-2512"
+        self.vision_model = "meta/llama-3.2-11b-vision-instruct"
+        self.cache = response_cache
+        self.resilience = nvidia_caller
+        self.stt = stt_service
+        self.classifier = local_classifier
+        self.client: httpx.AsyncClient | None = None
+        # Per-request timeouts must be a full Timeout: a bare float would replace the pool's connect timeout too
+        self.vision_timeout = httpx.Timeout(settings.NVIDIA_VISION_TIMEOUT, connect=settings.NVIDIA_CONNECT_TIMEOUT)
 
-    async def _call_nvidia_api(self, messages, max_tokens=512, temperature=0.1):
-        if not self.api_key:
-            return None
-            
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.NVIDIA_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("NVIDIA_HTTP2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+                http2 = False
+
+        return httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.api_key}", "Accept": "application/json"},
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.NVIDIA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.NVIDIA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.NVIDIA_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.NVIDIA_TIMEOUT, connect=settings.NVIDIA_CONNECT_TIMEOUT),
+        )
+
+    async def startup(self):
+        """
+        Opens the shared, connection-pooled client. Called from the FastAPI lifespan.
+        """
+        if self.client is None or self.client.is_closed:
+            self.client = self._build_client()
+
+    async def shutdown(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Lazily open the pool if the service is used outside the app lifespan (scripts, benchmarks)
+        if self.client is None or self.client.is_closed:
+            self.client = self._build_client()
+        return self.client
+
+    def _chat_payload(self, messages, stream: bool = False, guided_json: dict | None = None) -> dict:
         payload = {
-            "model": "mistralai/mistral-large-3-675b-instruct-2512",
+            "model": self.chat_model,
             "messages": messages,
             "max_tokens": 2048,
             "temperature": 0.15,
             "top_p": 1.00,
             "frequency_penalty": 0.00,
             "presence_penalty": 0.00,
-            "stream": False
+            "stream": stream
         }
+        if guided_json is not None and settings.NVIDIA_GUIDED_JSON:
+            # NIM structured generation: decoding is constrained to the JSON schema
+            payload["nvext"] = {"guided_json": guided_json}
+        return payload
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(self.invoke_url, headers=self.headers, json=payload, timeout=30.0)
+    async def _call_nvidia_api(self, messages, max_tokens=512, temperature=0.1, guided_json: dict | None = None):
+        if not self.api_key:
+            return None
+            
+        payload = self._chat_payload(messages, guided_json=guided_json)
+
+        client = self._get_client()
+        try:
+            # Retries, circuit breaking, hedging and the concurrency cap live in the resilience layer
+            with span("nvidia.chat", model=self.chat_model):
+                response = await self.resilience.call(
+                    lambda: client.post(self.invoke_url, json=payload),
+                    route="chat"
+                )
+            response.raise_for_status()
+            data = response.json()
+            record_usage(self.chat_model, data)
+            return data['choices'][0]['message']['content']
+        except httpx.HTTPStatusError as e:
+            logger.error(f"NVIDIA API Call Failed: Status {e.response.status_code}")
+            logger.info(f"Response Body: {e.response.text}")
+            return None
+        except Exception as e:
+            logger.error(f"NVIDIA API Call Failed: {e}")
+            return None
+
+    async def _stream_nvidia_api(self, messages):
+        """
+        Yields content deltas from a streamed (SSE) chat completion. Yields nothing on failure.
+        """
+        if not self.api_key:
+            return
+
+        # Streams aren't retried once tokens flow, but they honour the breaker and concurrency cap
+        breaker = self.resilience.breaker
+        if not breaker.allow():
+            logger.warning("NVIDIA Streaming Call skipped: circuit is open")
+            return
+
+        probing = breaker.state == "half_open"
+        client = self._get_client()
+        try:
+            async with self.resilience.semaphore, client.stream(
+                "POST",
+                self.invoke_url,
+                json=self._chat_payload(messages, stream=True),
+                headers={"Accept": "text/event-stream"}
+            ) as response:
                 response.raise_for_status()
-                data = response.json()
-                return data['choices'][0]['message']['content']
-            except httpx.HTTPStatusError as e:
-                print(f"NVIDIA API Call Failed: Status {e.response.status_code}")
-                print(f"Response Body: {e.response.text}")
-                return None
-            except Exception as e:
-                print(f"NVIDIA API Call Failed: {e}")
-                return None
+                breaker.record_success()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                    except (json.JSONDecodeError, KeyError, IndexError):
+                        continue
+                    if delta:
+                        yield delta
+        except httpx.HTTPStatusError as e:
+            # A 4xx is the upstream answering, so it resolves a half-open probe like a success would
+            if e.response.status_code in RETRYABLE_STATUS:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            logger.error(f"NVIDIA Streaming Call Failed: Status {e.response.status_code}")
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            logger.error(f"NVIDIA Streaming Call Failed: {e}")
+        except Exception as e:
+            logger.error(f"NVIDIA Streaming Call Failed: {e}")
+        finally:
+            # Other errors and cancellation (client went away) leave no verdict; don't hold the probe slot
+            if probing:
+                breaker.release_probe()
 
     async def transcribe(self, audio_file, language: str) -> str:
         """
-        Transcribes audio. 
-        NOTE: OpenAI Whisper removed. 
-        In production, integrate Google Cloud Speech or NVIDIA Riva ASR here.
-        For now, returning Mock text to enable flow.
+        Transcribes audio (a path or binary file object) with the configured offline STT engine.
         """
-        # Mock Transcription logic
-        print("Mocking Transcription (STT Service required)")
-        if language == 'te':
-            return "ఈ రోజు మా వీధిలో డ్రైనేజీ పారుతోంది, దయచేసి బాగు చేయండి."
-        return "There is a severe drainage overflow in our street, please fix it."
+        with span("stt.transcribe", engine=self.stt.engine_name, language=language):
+            return await self.stt.transcribe(audio_file, language)
 
     async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         if source_lang == target_lang:
             return text
             
+        prompt = f"Translate the following {source_lang} text to {target_lang} strictly. Output only the translation:"
+        cache_key = self.cache.make_key(self.chat_model, prompt, self.cache.normalize_text(text))
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         messages = [
-            {"role": "user", "content": f"Translate the following {source_lang} text to {target_lang} strictly. Output only the translation:\n\n{text}"}
+            {"role": "user", "content": f"{prompt}\n\n{text}"}
         ]
         
         result = await self._call_nvidia_api(messages)
+        if result:
+            await self.cache.set(cache_key, result)
         return result if result else f"[Mock Translation] {text}"
 
     async def extract_details(self, transcript: str, location_context: str = ""):
@@ -79,6 +294,22 @@ class AIService:
         {"category": "...", "summary": "...", "priority": "...", "location_details": "..."}
         """
 
+        # Easy cases are settled in-process; only low-confidence complaints reach the LLM
+        with span("classifier.local"):
+            local = self.classifier.try_classify(transcript, location_context)
+        if local is not None:
+            return local
+
+        cache_key = self.cache.make_key(
+            self.chat_model,
+            system_prompt,
+            self.cache.normalize_text(transcript),
+            self.cache.normalize_text(location_context),
+        )
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         messages = [
             {"role": "user", "content": f"{system_prompt}\n\nComplaint: {transcript}\nLocation Context: {location_context}"}
         ]
@@ -86,26 +317,78 @@ class AIService:
         result = await self._call_nvidia_api(messages)
         
         if result:
-            # Cleanup JSON markdown if present
-            clean_result = result.replace("```json", "").replace("```", "").strip()
             try:
-                return json.loads(clean_result)
-            except json.JSONDecodeError:
-                print(f"JSON Decode Failed. Raw: {result}")
+                parsed = parse_model(result, ExtractionResult)
+                await self.cache.set(cache_key, parsed)
+                return parsed
+            except OutputParseError as e:
+                logger.error(f"Extraction parse failed: {e}")
                 
         return {
             "category": "others",
             "summary": transcript[:50] + "...",
             "priority": "medium",
-            "location_details": "Extracted from speech"
+            "location_details": "Extracted from speech",
+            # Nothing was classified; dedupe and training must not trust this category
+            "source": "fallback"
         }
 
-    async def analyze_image(self, image_b64: str) -> dict:
+    async def translate_and_extract(self, transcript: str, source_lang: str, location_context: str = "") -> tuple[str, dict] | None:
+        """
+        Translates a non-English transcript and extracts the complaint fields in a single call.
+        Returns (english_text, extraction), or None if the response is unusable so the caller can
+        fall back to translate() + extract_details().
+        """
+        system_prompt = TRANSLATE_EXTRACT_PROMPT.format(source_lang=LANGUAGE_NAMES.get(source_lang, source_lang))
+        cache_key = self.cache.make_key(
+            self.chat_model,
+            system_prompt,
+            self.cache.normalize_text(transcript),
+            self.cache.normalize_text(location_context),
+        )
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached["translation"], cached["extraction"]
+
+        messages = [
+            {"role": "user", "content": f"{system_prompt}\n\nComplaint: {transcript}\nLocation Context: {location_context}"}
+        ]
+        result = await self._call_nvidia_api(messages, guided_json=TRANSLATE_EXTRACT_SCHEMA)
+        if not result:
+            return None
+
+        try:
+            parsed = parse_model(result, TranslateExtractResult)
+        except OutputParseError as e:
+            logger.warning(f"Combined translate+extract unusable, falling back: {e}")
+            return None
+
+        translation = parsed.pop("translation")
+        extraction = parsed
+        await self.cache.set(cache_key, {"translation": translation, "extraction": extraction})
+        return translation, extraction
+
+    def image_cache_key(self, upload_digest: str) -> str:
+        """
+        Cache key for an image analysis, from the sha256 of the upload as received. Keying on the
+        raw bytes lets a repeat upload be answered before it is decoded and resized.
+        """
+        return self.cache.make_key(self.vision_model, IMAGE_ANALYSIS_PROMPT, upload_digest)
+
+    async def cached_image_analysis(self, cache_key: str) -> dict | None:
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Image analysis served from cache.")
+        return cached
+
+    async def analyze_image(self, image_b64: str, mime_type: str = "image/jpeg", cache_key: str | None = None) -> dict:
         """
         Analyzes an image using NVIDIA Llama-3.2-11b-vision-instruct to extract complaint details.
+        Pass cache_key (from image_cache_key) when the caller has already checked the cache with it;
+        otherwise the processed image itself is hashed and looked up.
         """
         if not self.api_key:
-            print("CRITICAL: NVIDIA_API_KEY is missing from environment variables.")
+            logger.error("CRITICAL: NVIDIA_API_KEY is missing from environment variables.")
             return {
                 "category": "others",
                 "title": "Config Error",
@@ -113,16 +396,14 @@ class AIService:
                 "priority": "medium"
             }
 
-        system_prompt = """
-        Analyze this image of a civic issue. 
-        Extract the following details in JSON format:
-        1. category: (road, garbage, drainage, water, streetlight, streetlight, other)
-        2. title: A short, clear title.
-        3. description: A detailed description of the visual issue.
-        4. priority: (low, medium, high, critical)
-        
-        Output ONLY valid JSON: {"category": "...", "title": "...", "description": "...", "priority": "..."}
-        """
+        system_prompt = IMAGE_ANALYSIS_PROMPT
+
+        if cache_key is None:
+            cache_key = self.cache.make_key(self.vision_model, system_prompt, image_b64)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Image analysis served from cache.")
+                return cached
 
         messages = [
             {
@@ -132,18 +413,18 @@ class AIService:
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_b64}"
+                            "url": f"data:{mime_type};base64,{image_b64}"
                         }
                     }
                 ]
             }
         ]
 
-        print(f"Sending image analysis request to NVIDIA NIM (Llama-3.2 Vision)...")
+        logger.info("Sending image analysis request to NVIDIA NIM (Llama-3.2 Vision)...")
         
         # Using the standard vision NIM endpoint format
         vision_payload = {
-            "model": "meta/llama-3.2-11b-vision-instruct",
+            "model": self.vision_model,
             "messages": messages,
             "max_tokens": 1024,
             "temperature": 0.2,
@@ -151,49 +432,41 @@ class AIService:
             "stream": False
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(self.invoke_url, headers=self.headers, json=vision_payload, timeout=25.0)
-                if response.status_code == 401:
-                    print(f"Vision API Error: 401 Unauthorized. Check if your NVIDIA_API_KEY is valid.")
-                    return {
-                        "category": "others",
-                        "title": "Auth Error",
-                        "description": "NVIDIA_API_KEY is invalid or unauthorized. Please check your NVIDIA account.",
-                        "priority": "medium"
-                    }
-                
-                response.raise_for_status()
-                data = response.json()
-                result = data['choices'][0]['message']['content']
-            except Exception as e:
-                print(f"Vision API Call Failed: {e}")
-                result = None
+        client = self._get_client()
+        try:
+            with span("nvidia.vision", model=self.vision_model):
+                response = await self.resilience.call(
+                    lambda: client.post(self.invoke_url, json=vision_payload, timeout=self.vision_timeout),
+                    route="vision"
+                )
+            if response.status_code == 401:
+                logger.error("Vision API Error: 401 Unauthorized. Check if your NVIDIA_API_KEY is valid.")
+                return {
+                    "category": "others",
+                    "title": "Auth Error",
+                    "description": "NVIDIA_API_KEY is invalid or unauthorized. Please check your NVIDIA account.",
+                    "priority": "medium"
+                }
+            
+            response.raise_for_status()
+            data = response.json()
+            record_usage(self.vision_model, data)
+            result = data['choices'][0]['message']['content']
+        except Exception as e:
+            logger.error(f"Vision API Call Failed: {e}")
+            result = None
 
-        print(f"Raw AI Response: {result}")
+        logger.debug(f"Raw AI Response: {result}")
 
         if result:
-            # Try to find JSON content if it's wrapped in markdown or just messy
-            import re
-            json_match = re.search(r'\{.*\}', result.replace('\n', ''), re.DOTALL)
-            
-            clean_result = result
-            if json_match:
-                 clean_result = json_match.group(0)
-            else:
-                 # Fallback cleanup
-                 clean_result = result.replace("```json", "").replace("```", "").strip()
-            
             try:
-                parsed = json.loads(clean_result)
-                # Ensure keys exist/lowercase category
-                if "category" in parsed:
-                    parsed["category"] = parsed["category"].lower()
+                parsed = parse_model(result, ImageAnalysisResult)
+                await self.cache.set(cache_key, parsed)
                 return parsed
-            except json.JSONDecodeError:
-                print(f"Image Analysis JSON Decode Failed. Raw: {result} | Cleaned: {clean_result}")
+            except OutputParseError as e:
+                logger.error(f"Image Analysis parse failed: {e}")
         else:
-            print("NVIDIA API returned None/Empty result.")
+            logger.info("NVIDIA API returned None/Empty result.")
         
         return {
             "category": "others",
@@ -202,72 +475,66 @@ class AIService:
             "priority": "medium"
         }
 
+    def _build_conversation_messages(self, history: list, location_context: str, language: str) -> list:
+        selected_prompt = _conversation_prompt(language, location_context)
+        return [{"role": "system", "content": selected_prompt}] + history
+
     async def run_complaint_conversation(self, history: list, location_context: str = "", language: str = "en") -> dict:
         """
         Drives the conversational complaint intake.
         Returns a dict with 'response_text' (for TTS) and optional 'extracted_data' if complete.
         """
-        
-        # English System Prompt
-        system_prompt_en = f"""
-        You are a helpful civic complaint intake assistant for 'CivicConnect'.
-        Your goal is to gather the following details from the user:
-        1. Category (road, garbage, drainage, water, streetlight, others)
-        2. Description (What exactly is the problem?)
-        3. Priority/Severity (Does it look dangerous/urgent?)
-        
-        CONTEXT:
-        - The user's GPS location is ALREADY CAPTURED ({location_context}). You verify this location only if necessary.
-        - Act as a polite interviewer.
-        - Ask ONE short clarifying question at a time.
-        - Keep your responses BRIEF (max 1-2 sentences) as they will be spoken aloud.
-        
-        TERMINATION:
-        - When you have obtained Category, Description, and Priority, output the special token [COMPLETE] followed immediately by a JSON object.
-        - JSON Format: {{"category": "...", "title": "...", "description": "...", "priority": "..."}}
-        
-        Example:
-        Assistant: "How large is the pothole?"
-        User: "It's big."
-        Assistant: [COMPLETE] {{"category": "road", "title": "Large Pothole", "description": "Big pothole blocking traffic", "priority": "high"}}
-        """
+        messages = self._build_conversation_messages(history, location_context, language)
 
-        # Telugu System Prompt
-        system_prompt_te = f"""
-        మీరు 'CivicConnect' కోసం సహాయక పౌర ఫిర్యాదు స్వీకరణ సహాయకులు.
-        మీ లక్ష్యం వినియోగదారు నుండి కింది వివరాలను సేకరించడం:
-        1. వర్గం (రోడ్డు, చెత్త, డ్రైనేజీ, నీరు, వీధి దీపం, ఇతర)
-        2. వివరణ (సమస్య ఏమిటి?)
-        3. తీవ్రత (అది ప్రమాదకరంగా ఉందా?)
-        
-        సందర్భం:
-        - వినియోగదారు GPS స్థానం ఇప్పటికే తీసుకోబడింది ({location_context}).
-        - మర్యాదపూర్వక ఇంటర్వ్యూయర్‌గా వ్యవహరించండి.
-        - ఒక సమయంలో ఒక చిన్న ప్రశ్న అడగండి.
-        - మీ సమాధానాలు చాలా క్లుప్తంగా (గరిష్టంగా 1-2 వాక్యాలు) ఉండాలి ఎందుకంటే అవి బిగ్గరగా చదవబడతాయి.
-        - **ముఖ్య గమనిక**: మీరు మీ ప్రతిస్పందనను పూర్తిగా తెలుగులో (Telugu Script) ఇవ్వాలి.
-        
-        ముగింపు:
-        - మీరు వర్గం, వివరణ మరియు తీవ్రతను పొందినప్పుడు, [COMPLETE] అనే ప్రత్యేక టోకెన్‌ను అవుట్‌పుట్ చేయండి, దాని వెంటనే JSON ఆబ్జెక్ట్ ఉంటుంది.
-        - JSON ఫార్మాట్ (ఇంగ్లీష్ కీలతో): {{"category": "...", "title": "...", "description": "...", "priority": "..."}}
-        
-        ఉదాహరణ:
-        Assistant: "ఆ గుంత ఎంత పెద్దది?"
-        User: "చాలా పెద్దది."
-        Assistant: [COMPLETE] {{"category": "road", "title": "Large Pothole", "description": "Big pothole blocking traffic", "priority": "high"}}
+        logger.info(f"Running conversation step with {len(history)} user turns (Lang: {language})...")
+        result = await self._call_nvidia_api(messages)
+        return self._parse_conversation_result(result, language)
+
+    async def stream_complaint_conversation(self, history: list, location_context: str = "", language: str = "en"):
+        """
+        Streaming variant of run_complaint_conversation.
+        Yields {"type": "token", "text": ...} events as speakable text arrives, holding back anything
+        from the [COMPLETE] marker onwards, then one final {"type": "result", ...} event with the parsed turn.
         """
+        messages = self._build_conversation_messages(history, location_context, language)
+        marker = "[COMPLETE]"
+
+        logger.info(f"Streaming conversation step with {len(history)} user turns (Lang: {language})...")
+        buffer = ""
+        emitted = 0
+        completed = False
+        async for delta in self._stream_nvidia_api(messages):
+            buffer += delta
+            if completed:
+                continue
 
-        selected_prompt = system_prompt_te if language == 'te' else system_prompt_en
+            marker_at = buffer.find(marker)
+            if marker_at != -1:
+                completed = True
+                safe_end = marker_at
+            else:
+                # Keep back a tail that could be the start of a marker split across chunks
+                safe_end = len(buffer)
+                for size in range(min(len(marker) - 1, len(buffer)), 0, -1):
+                    if marker.startswith(buffer[-size:]):
+                        safe_end = len(buffer) - size
+                        break
 
-        messages = [{"role": "system", "content": selected_prompt}] + history
+            if safe_end > emitted:
+                yield {"type": "token", "text": buffer[emitted:safe_end]}
+                emitted = safe_end
 
-        print(f"Running conversation step with {len(history)} user turns (Lang: {language})...")
-        result = await self._call_nvidia_api(messages)
-        
+        if not completed and len(buffer) > emitted:
+            yield {"type": "token", "text": buffer[emitted:]}
+
+        yield {"type": "result", **self._parse_conversation_result(buffer or None, language)}
+
+    def _parse_conversation_result(self, result: str | None, language: str) -> dict:
         if not result:
             return {
                 "response_text": "I'm having trouble connecting to the server. Please try again." if language == 'en' else "సర్వర్‌కి కనెక్ట్ చేయడంలో సమస్య ఉంది. దయచేసి మళ్లీ ప్రయత్నించండి.",
-                "is_complete": False
+                "is_complete": False,
+                "error": True
             }
 
         # Check for completion token
@@ -276,19 +543,11 @@ class AIService:
             response_text = parts[0].strip() 
             json_text = parts[1].strip()
             
-            # Simple cleanup if the model chatters after JSON
-            import re
-            json_match = re.search(r'\{.*\}', json_text, re.DOTALL)
             extracted_data = None
-            
-            if json_match:
-                try:
-                    clean_json = json_match.group(0)
-                    extracted_data = json.loads(clean_json)
-                    if "category" in extracted_data:
-                        extracted_data["category"] = extracted_data["category"].lower()
-                except:
-                    print(f"Failed to parse final JSON: {json_text}")
+            try:
+                extracted_data = parse_model(json_text, ConversationResult)
+            except OutputParseError as e:
+                logger.error(f"Failed to parse final JSON: {e}")
 
             # If the model didn't say anything before [COMPLETE], provide a generic success message
             if not response_text:
@@ -0,0 +1,84 @@
+import logging
+import time
+
+import anyio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Roles that firestore.rules lets read every complaint
+STAFF_ROLES = ("admin", "employee")
+
+class AuthError(Exception):
+    pass
+
+class AuthUnavailable(AuthError):
+    pass
+
+class Caller:
+    def __init__(self, uid: str, role: str | None):
+        self.uid = uid
+        self.role = role
+
+    @property
+    def is_staff(self) -> bool:
+        return self.role in STAFF_ROLES
+
+def _verify_firebase_token(token: str) -> dict:
+    from firebase_admin import auth
+    return auth.verify_id_token(token)
+
+class AuthService:
+    """
+    Verifies Firebase ID tokens (Authorization: Bearer <token>) and looks up the caller's role in
+    users/{uid}, the same profile document firestore.rules reads. Roles are cached for role_ttl seconds.
+    The admin SDK bypasses firestore.rules, so endpoints that read complaints must check the caller here.
+    Until bound to Firestore (mock DB mode) nothing can vouch for a token and every request is refused.
+    """
+
+    def __init__(self, role_ttl: float = 60.0, max_cached: int = 10000, verifier=None):
+        self.role_ttl = role_ttl
+        self.max_cached = max_cached
+        # Token -> claims; replaced by local stand-ins (load tests)
+        self.verifier = verifier
+        self.db = None
+        self._roles: dict[str, tuple[float, str | None]] = {}
+
+    def bind(self, db):
+        self.db = db
+
+    async def authenticate(self, authorization: str | None) -> Caller:
+        if self.db is None:
+            raise AuthUnavailable("Authentication is unavailable")
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            raise AuthError("Missing bearer token")
+
+        verifier = self.verifier or _verify_firebase_token
+        try:
+            # Verification may fetch Google's signing keys; keep it off the event loop
+            claims = await anyio.to_thread.run_sync(verifier, token.strip())
+        except Exception as e:
+            logger.info(f"Rejected ID token: {e}")
+            raise AuthError("Invalid or expired ID token")
+        uid = claims["uid"]
+        return Caller(uid, await self._role(uid))
+
+    async def _role(self, uid: str) -> str | None:
+        now = time.monotonic()
+        cached = self._roles.get(uid)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        def _load():
+            profile = self.db.collection('users').document(uid).get().to_dict() or {}
+            return profile.get('role')
+
+        role = await anyio.to_thread.run_sync(_load)
+        if len(self._roles) >= self.max_cached:
+            self._roles.pop(next(iter(self._roles)))
+        self._roles[uid] = (now + self.role_ttl, role)
+        return role
+
+auth_service = AuthService(role_ttl=settings.AUTH_ROLE_CACHE_TTL)
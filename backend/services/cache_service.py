@@ -0,0 +1,133 @@
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import anyio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Content-addressed cache for AI responses.
+    Tier 1 is an in-process LRU with TTL; tier 2 is an optional SQLite file that survives restarts.
+    Values are copied in and out of the memory tier, so callers may mutate what they get back.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400.0, db_path: str = "", enabled: bool = True):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        if enabled and db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS ai_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"AI Cache disk tier disabled: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Hashes (model, prompt, normalized input / image bytes) into a stable key.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(text.split())
+
+    async def get(self, key: str):
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.counters["hits"] += 1
+                return copy.deepcopy(value)
+            del self._memory[key]
+            self.counters["expirations"] += 1
+
+        if self._db is not None:
+            value = await anyio.to_thread.run_sync(self._disk_get, key, now)
+            if value is not None:
+                self.counters["disk_hits"] += 1
+                self._memory_set(key, copy.deepcopy(value), now)
+                return value
+
+        self.counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        self._memory_set(key, copy.deepcopy(value), now)
+        if self._db is not None:
+            await anyio.to_thread.run_sync(self._disk_set, key, value, now + self.ttl)
+
+    def _memory_set(self, key: str, value, now: float):
+        self._memory[key] = (now + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _disk_get(self, key: str, now: float):
+        with self._db_lock:
+            row = self._db.execute("SELECT value, expires_at FROM ai_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                self._db.commit()
+                self.counters["expirations"] += 1
+                return None
+        return json.loads(row[0])
+
+    def _disk_set(self, key: str, value, expires_at: float):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        return {**self.counters, "size": len(self._memory), "disk_enabled": self._db is not None}
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+response_cache = ResponseCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    ttl=settings.AI_CACHE_TTL,
+    db_path=settings.AI_CACHE_DB_PATH,
+    enabled=settings.AI_CACHE_ENABLED,
+)
@@ -0,0 +1,291 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, defaultdict
+
+from config import settings
+from services.output_parser import CATEGORIES, PRIORITIES
+from services.providers import LazyProvider
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+
+# metadata.classifiedBy values whose labels didn't come from the LLM: the model's own guesses and the
+# extractor's "others" placeholder when the LLM failed
+UNTRUSTED_LABEL_SOURCES = ("local", "fallback")
+
+_LATIN_WORD = re.compile(r"[a-z0-9]+")
+_TELUGU_WORD = re.compile(r"[\u0C00-\u0C7F]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?\u0964])\s")
+_STOPWORDS = frozenset(
+    "a an the is are was were be been there here this that these those it its in on at of to for from with by and or "
+    "but not no near our my we i you your he she they them please sir madam very also has have had do does did will "
+    "would can could should since from so some any all just".split()
+)
+
+# Keyword seeds give the model a vocabulary before any complaints are stored; trained models include them too
+SEED_CATEGORY_EXAMPLES = {
+    "road": [
+        "pothole on the road", "road damaged broken", "potholes causing accidents", "road repair needed",
+        "speed breaker footpath damaged", "road dug up not repaired", "రోడ్డు గుంతలు", "రోడ్డు పాడైపోయింది", "గుంత",
+    ],
+    "garbage": [
+        "garbage not collected", "trash piled up dustbin overflowing", "waste dumped on street smell",
+        "garbage truck has not come", "dead animal carcass", "చెత్త పేరుకుపోయింది", "చెత్త తీయడం లేదు", "చెత్త కుండీ",
+    ],
+    "drainage": [
+        "drain blocked overflowing", "sewage water on road", "manhole open", "gutter clogged mosquitoes",
+        "sewer line leaking", "మురుగు నీరు", "డ్రైనేజీ పొంగుతోంది", "మ్యాన్‌హోల్",
+    ],
+    "water": [
+        "no water supply", "drinking water pipeline leaking", "contaminated dirty tap water",
+        "water tanker not coming", "low water pressure", "తాగునీరు రావడం లేదు", "నీటి సరఫరా లేదు", "పైపు లీక్",
+    ],
+    "streetlight": [
+        "street light not working", "streetlight off dark at night", "electric pole wire hanging",
+        "lamp post broken", "light flickering", "వీధి దీపం పని చేయడం లేదు", "వీధి లైట్", "కరెంట్ స్తంభం",
+    ],
+    "others": [
+        "stray dogs menace", "illegal encroachment", "noise pollution loudspeaker", "tree fallen", "park maintenance",
+        "వీధి కుక్కలు", "ఆక్రమణ",
+    ],
+}
+SEED_PRIORITY_EXAMPLES = {
+    "critical": [
+        "accident injured", "live wire electric shock danger", "manhole open child fell", "fire", "building collapse",
+        "flooding houses", "ప్రమాదం", "కరెంట్ షాక్",
+    ],
+    "high": ["many days not resolved", "dangerous at night", "overflowing into houses", "health hazard mosquitoes", "చాలా రోజులుగా"],
+    "medium": ["not working", "needs repair", "problem in our street"],
+    "low": ["minor issue", "small request", "cosmetic paint faded", "when possible", "చిన్న సమస్య"],
+}
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> set[str]:
+    """
+    Binary features: English word unigrams + bigrams, and Telugu words + character trigrams
+    (Telugu is agglutinative, so suffixed forms of a word still share most trigrams).
+    """
+    text = (text or "").lower()
+    features = set()
+    words = [_stem(w) for w in _LATIN_WORD.findall(text) if w not in _STOPWORDS and len(w) > 1]
+    features.update(f"w:{w}" for w in words)
+    features.update(f"b:{a}_{b}" for a, b in zip(words, words[1:]))
+    for word in _TELUGU_WORD.findall(text):
+        features.add(f"t:{word}")
+        padded = f"<{word}>"
+        features.update(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+class NaiveBayesModel:
+    """
+    Bernoulli-style multinomial naive Bayes over binary features, small enough to classify a
+    complaint in tens of microseconds and to serialize as plain JSON.
+    """
+
+    def __init__(self, labels: tuple[str, ...], alpha: float = 0.5):
+        self.labels = labels
+        self.alpha = alpha
+        self.doc_counts = Counter()
+        self.feature_counts: dict[str, Counter] = defaultdict(Counter)
+        self._log_prior: dict[str, float] = {}
+        self._log_likelihood: dict[str, dict[str, float]] = {}
+
+    def add(self, text: str, label: str, weight: int = 1):
+        if label not in self.labels:
+            return
+        self.doc_counts[label] += weight
+        for feature in tokenize(text):
+            self.feature_counts[feature][label] += weight
+
+    def fit(self) -> "NaiveBayesModel":
+        total_docs = sum(self.doc_counts.values())
+        vocabulary = len(self.feature_counts)
+        totals = Counter()
+        for counts in self.feature_counts.values():
+            totals.update(counts)
+        self._log_prior = {
+            label: math.log((self.doc_counts[label] + 1) / (total_docs + len(self.labels))) for label in self.labels
+        }
+        self._log_likelihood = {
+            feature: {
+                label: math.log((counts[label] + self.alpha) / (totals[label] + self.alpha * vocabulary))
+                for label in self.labels
+            }
+            for feature, counts in self.feature_counts.items()
+        }
+        return self
+
+    def predict(self, text: str) -> tuple[str | None, float]:
+        """
+        (label, posterior probability), or (None, 0.0) when no feature of the text is known.
+        """
+        known = [self._log_likelihood[f] for f in tokenize(text) if f in self._log_likelihood]
+        if not known:
+            return None, 0.0
+        scores = {}
+        for label in self.labels:
+            scores[label] = self._log_prior[label] + sum(likelihood[label] for likelihood in known)
+        best = max(scores, key=scores.get)
+        # Softmax over log scores, shifted by the max to stay finite
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / normalizer
+
+    def to_dict(self) -> dict:
+        return {
+            "labels": list(self.labels),
+            "alpha": self.alpha,
+            "doc_counts": dict(self.doc_counts),
+            "feature_counts": {feature: dict(counts) for feature, counts in self.feature_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NaiveBayesModel":
+        model = cls(tuple(data["labels"]), data["alpha"])
+        model.doc_counts = Counter(data["doc_counts"])
+        for feature, counts in data["feature_counts"].items():
+            model.feature_counts[feature] = Counter(counts)
+        return model.fit()
+
+def complaint_texts(record: dict) -> list[str]:
+    """
+    The texts a stored complaint contributes to training: the original transcript (English or
+    Telugu) and, when it differs, the English translation.
+    """
+    metadata = record.get("metadata") or {}
+    texts = [metadata.get("transcriptOriginal") or record.get("description") or ""]
+    english = metadata.get("transcriptEnglish")
+    if english and english != texts[0]:
+        texts.append(english)
+    return [text for text in texts if text.strip()]
+
+class ComplaintClassifier:
+    """
+    Local category + priority classifier. Confident predictions let AIService skip the LLM.
+    """
+
+    def __init__(self, category_model: NaiveBayesModel, priority_model: NaiveBayesModel, trained_on: int = 0):
+        self.category_model = category_model
+        self.priority_model = priority_model
+        self.trained_on = trained_on
+
+    @classmethod
+    def train(cls, records) -> "ComplaintClassifier":
+        """
+        Trains on stored complaint records. Complaints the local model labelled itself are skipped,
+        so it only ever learns from LLM (or human) decisions.
+        """
+        category_model = NaiveBayesModel(CATEGORIES)
+        priority_model = NaiveBayesModel(PRIORITIES)
+        for label, examples in SEED_CATEGORY_EXAMPLES.items():
+            for example in examples:
+                category_model.add(example, label)
+        for label, examples in SEED_PRIORITY_EXAMPLES.items():
+            for example in examples:
+                priority_model.add(example, label)
+
+        trained_on = 0
+        for record in records:
+            if (record.get("metadata") or {}).get("classifiedBy") in UNTRUSTED_LABEL_SOURCES:
+                continue
+            for text in complaint_texts(record):
+                category_model.add(text, record.get("category"))
+                priority_model.add(text, record.get("priority"))
+            trained_on += 1
+        return cls(category_model.fit(), priority_model.fit(), trained_on)
+
+    def classify(self, text: str) -> dict:
+        category, confidence = self.category_model.predict(text)
+        priority, priority_confidence = self.priority_model.predict(text)
+        return {
+            "category": category or "others",
+            "confidence": confidence,
+            "priority": priority or "medium",
+            "priority_confidence": priority_confidence,
+        }
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MODEL_VERSION,
+                "trained_on": self.trained_on,
+                "category": self.category_model.to_dict(),
+                "priority": self.priority_model.to_dict(),
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "ComplaintClassifier":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Unsupported classifier model version {data.get('version')}")
+        return cls(
+            NaiveBayesModel.from_dict(data["category"]),
+            NaiveBayesModel.from_dict(data["priority"]),
+            data.get("trained_on", 0),
+        )
+
+def summarize(text: str, max_chars: int = 120) -> str:
+    # First sentence, cut at a word boundary; stands in for the LLM summary on the local path
+    text = " ".join(text.split())
+    summary = _SENTENCE_END.split(text, maxsplit=1)[0]
+    if len(summary) <= max_chars:
+        return summary
+    return summary[:max_chars].rsplit(" ", 1)[0] + "..."
+
+class LocalClassifierService:
+    def __init__(self, model_path: str, threshold: float = 0.9, priority_threshold: float = 0.6, enabled: bool = True):
+        self.model_path = model_path
+        self.threshold = threshold
+        self.priority_threshold = priority_threshold
+        self.enabled = enabled
+        self.provider = LazyProvider("classifier", self._load)
+        self.counters = {"local": 0, "escalated": 0}
+
+    def _load(self) -> ComplaintClassifier:
+        if self.model_path and os.path.exists(self.model_path):
+            try:
+                classifier = ComplaintClassifier.load(self.model_path)
+                logger.info(f"Loaded complaint classifier trained on {classifier.trained_on} complaints")
+                return classifier
+            except Exception as e:
+                logger.error(f"Classifier model load failed, using keyword seeds only: {e}")
+        return ComplaintClassifier.train([])
+
+    def try_classify(self, text: str, location_context: str = "") -> dict | None:
+        """
+        Extraction-shaped result when the local model is confident enough, otherwise None
+        (the caller escalates to the LLM).
+        """
+        if not self.enabled or not text or not text.strip():
+            return None
+        result = self.provider.get().classify(text)
+        if result["confidence"] < self.threshold or result["priority_confidence"] < self.priority_threshold:
+            self.counters["escalated"] += 1
+            return None
+        self.counters["local"] += 1
+        return {
+            "category": result["category"],
+            "summary": summarize(text),
+            "priority": result["priority"],
+            "location_details": location_context,
+            "source": "local",
+            "confidence": round(result["confidence"], 3),
+        }
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+local_classifier = LocalClassifierService(
+    settings.CLASSIFIER_MODEL_PATH,
+    threshold=settings.CLASSIFIER_THRESHOLD,
+    priority_threshold=settings.CLASSIFIER_PRIORITY_THRESHOLD,
+    enabled=settings.LOCAL_CLASSIFIER_ENABLED,
+)
@@ -1,42 +1,66 @@
+import logging
+from functools import partial
+
 import anyio
-import cloudinary
-import cloudinary.uploader
 from config import settings
 from fastapi import UploadFile
-import io
+from services.providers import LazyProvider
+
+logger = logging.getLogger(__name__)
+
+def _configure_uploader():
+    # Deferred until the first image upload (or warm-up) so cold starts skip the SDK import
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET,
+        secure=True
+    )
+    if settings.CLOUDINARY_UPLOAD_PREFIX:
+        cloudinary.config(upload_prefix=settings.CLOUDINARY_UPLOAD_PREFIX)
+    return cloudinary.uploader
 
 class CloudinaryService:
     def __init__(self):
-        cloudinary.config(
-            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-            api_key=settings.CLOUDINARY_API_KEY,
-            api_secret=settings.CLOUDINARY_API_SECRET,
-            secure=True
-        )
+        self.uploader_provider = LazyProvider("cloudinary", _configure_uploader)
 
     async def upload_image(self, file: UploadFile) -> str:
         """
         Uploads an image to Cloudinary and returns the URL.
         Includes automatic compression and optimization in a non-blocking thread.
         """
-        try:
-            content = await file.read()
-            await file.seek(0)
+        # Hand the SDK the spooled upload instead of a copy; it is sent in chunks
+        return await self.upload_source(file.file)
 
-            # run_sync ensures this CPU/IO bound sync call doesn't block the event loop
-            upload_result = await anyio.to_thread.run_sync(
-                lambda: cloudinary.uploader.upload(
-                    content,
-                    folder="civic-connect/complaints",
-                    resource_type="image",
-                    fetch_format="auto",
-                    quality="auto"
+    async def upload_source(self, source) -> str:
+        """
+        Uploads bytes, a file object or a local file path (e.g. a disk-spooled upload).
+        The SDK's plain upload() reads files whole into memory, so files and paths go through
+        upload_large(), which holds at most one chunk at a time.
+        """
+        options = {
+            "folder": "civic-connect/complaints",
+            "resource_type": "image",
+            "fetch_format": "auto",
+            "quality": "auto",
+        }
+        try:
+            uploader = await self.uploader_provider.aget()
+            if isinstance(source, (bytes, bytearray)):
+                upload = partial(uploader.upload, source, **options)
+            else:
+                upload = partial(
+                    uploader.upload_large, source, chunk_size=settings.CLOUDINARY_CHUNK_MB * 1024 * 1024, **options
                 )
-            )
+            # run_sync ensures this CPU/IO bound sync call doesn't block the event loop
+            upload_result = await anyio.to_thread.run_sync(upload)
             
             return upload_result.get("secure_url")
         except Exception as e:
-            print(f"Cloudinary Upload Failed: {e}")
+            logger.error(f"Cloudinary Upload Failed: {e}")
             raise e
 
 cloudinary_service = CloudinaryService()
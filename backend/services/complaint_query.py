@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import anyio
+
+# Supported filter shapes. Each (scope, filter) pair with createdAt DESC ordering has a composite
+# index in firestore.indexes.json; anything outside this set is rejected rather than scanned.
+SCOPE_FIELDS = ("userId", "assignedTo")
+FILTER_FIELDS = ("status", "category", "priority")
+MAX_PAGE_SIZE = 100
+
+class InvalidQuery(Exception):
+    pass
+
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "id": doc_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), data["id"]
+    except Exception:
+        raise InvalidQuery("Malformed cursor")
+
+def _as_datetime(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return None
+
+def _serialize(doc_id: str, data: dict) -> dict:
+    item = {"id": doc_id, **data}
+    for key in ("createdAt", "updatedAt", "resolvedAt"):
+        value = _as_datetime(item.get(key))
+        if value is not None:
+            item[key] = value.isoformat()
+    return item
+
+class FirestoreComplaintStore:
+    def __init__(self, db):
+        self.db = db
+
+    def list_page(self, filters: dict, start: datetime | None, end: datetime | None, limit: int, cursor: tuple | None):
+        query = self.db.collection('complaints')
+        for field, value in filters.items():
+            query = query.where(field, '==', value)
+        if start is not None:
+            query = query.where('createdAt', '>=', start)
+        if end is not None:
+            query = query.where('createdAt', '<', end)
+        # Document ID as tie-breaker keeps the cursor stable when timestamps collide
+        query = query.order_by('createdAt', direction='DESCENDING').order_by('__name__', direction='DESCENDING')
+        if cursor is not None:
+            query = query.start_after({'createdAt': cursor[0], '__name__': cursor[1]})
+
+        # One extra document tells us whether another page exists
+        docs = list(query.limit(limit + 1).stream())
+        page = docs[:limit]
+        next_cursor = None
+        if len(docs) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last.get('createdAt'), last.id)
+        return [_serialize(doc.id, doc.to_dict()) for doc in page], next_cursor
+
+    def get(self, doc_id: str) -> dict | None:
+        return self.db.collection('complaints').document(doc_id).get().to_dict()
+
+class InMemoryComplaintStore:
+    """
+    Read model with the same paging semantics as FirestoreComplaintStore, for tests and mock mode.
+    """
+
+    def __init__(self, documents: dict[str, dict] | None = None):
+        self.documents = documents if documents is not None else {}
+
+    def add(self, doc_id: str, data: dict):
+        self.documents[doc_id] = data
+
+    def get(self, doc_id: str) -> dict | None:
+        return self.documents.get(doc_id)
+
+    def list_page(self, filters: dict, start: datetime | None, end: datetime | None, limit: int, cursor: tuple | None):
+        rows = []
+        for doc_id, data in self.documents.items():
+            if any(data.get(field) != value for field, value in filters.items()):
+                continue
+            created = _as_datetime(data.get('createdAt'))
+            if created is None:
+                continue
+            if start is not None and created < start:
+                continue
+            if end is not None and created >= end:
+                continue
+            if cursor is not None and (created, doc_id) >= (cursor[0], cursor[1]):
+                continue
+            rows.append((created, doc_id, data))
+
+        rows.sort(key=lambda row: (row[0], row[1]), reverse=True)
+        page = rows[:limit]
+        next_cursor = encode_cursor(page[-1][0], page[-1][1]) if len(rows) > limit else None
+        return [_serialize(doc_id, data) for _, doc_id, data in page], next_cursor
+
+class ComplaintQueryService:
+    def __init__(self, store=None):
+        self.store = store or InMemoryComplaintStore()
+
+    def bind(self, store):
+        self.store = store
+
+    @staticmethod
+    def build_filters(**params) -> dict:
+        filters = {field: params[field] for field in SCOPE_FIELDS + FILTER_FIELDS if params.get(field)}
+        if sum(field in filters for field in SCOPE_FIELDS) > 1:
+            raise InvalidQuery("Filter by at most one of: userId, assignedTo")
+        if sum(field in filters for field in FILTER_FIELDS) > 1:
+            raise InvalidQuery("Filter by at most one of: status, category, priority")
+        return filters
+
+    async def list_page(self, filters: dict, start: datetime | None = None, end: datetime | None = None, limit: int = 20, cursor: str | None = None) -> dict:
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise InvalidQuery(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        start, end = _as_datetime(start), _as_datetime(end)
+        decoded = decode_cursor(cursor) if cursor else None
+        # Firestore queries are blocking RPCs
+        items, next_cursor = await anyio.to_thread.run_sync(
+            self.store.list_page, filters, start, end, limit, decoded
+        )
+        return {"items": items, "nextCursor": next_cursor}
+
+    async def get(self, doc_id: str) -> dict | None:
+        """
+        The complaint document, or None if it doesn't exist.
+        """
+        return await anyio.to_thread.run_sync(self.store.get, doc_id)
+
+complaint_query_service = ComplaintQueryService()
@@ -0,0 +1,160 @@
+import logging
+import math
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import anyio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEGREE = 111_320.0
+
+# Catch-all categories say nothing about what the issue is, so two of them nearby aren't duplicates
+UNMATCHED_CATEGORIES = ("others",)
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6_371_000 * math.asin(math.sqrt(a))
+
+class GeoDuplicateIndex:
+    """
+    In-memory grid index of recent complaints for near-duplicate detection.
+    Cells are `radius_m / 111320` degrees on both axes. That is radius_m north-south but only
+    radius_m * cos(lat) east-west, so a search scans one row either side and ceil(1 / cos(lat))
+    columns either side to cover the radius.
+    Searches prune the cells they touch; add() also sweeps every cell once per sweep_interval
+    seconds so complaints in areas nobody searches still expire.
+    """
+
+    def __init__(self, radius_m: float = 150.0, window_hours: float = 72.0, sweep_interval: float = 300.0):
+        self.radius_m = radius_m
+        self.window = window_hours * 3600
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.time()
+        self.cell_deg = radius_m / METERS_PER_DEGREE
+        # cell -> list of (created_ts, complaint_id, lat, lng, category), appended in arrival order
+        self._cells: dict[tuple[int, int], list[tuple]] = defaultdict(list)
+        self._ids: set[str] = set()
+        self.size = 0
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def add(self, complaint_id: str, lat: float, lng: float, category: str, created_ts: float | None = None):
+        now = time.time()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+        if category in UNMATCHED_CATEGORIES:
+            return
+        created_ts = now if created_ts is None else created_ts
+        self._cells[self._cell(lat, lng)].append((created_ts, complaint_id, lat, lng, category))
+        self._ids.add(complaint_id)
+        self.size += 1
+
+    def __contains__(self, complaint_id: str) -> bool:
+        return complaint_id in self._ids
+
+    def find_duplicates(self, lat: float, lng: float, category: str, now: float | None = None) -> list[dict]:
+        """
+        Complaints of the same category within radius_m and the time window, nearest first.
+        Always empty for UNMATCHED_CATEGORIES.
+        """
+        if category in UNMATCHED_CATEGORIES:
+            return []
+        now = time.time() if now is None else now
+        cutoff = now - self.window
+        row, col = self._cell(lat, lng)
+        span = self._column_span(lat)
+        matches = []
+        for cell in ((row + dr, col + dc) for dr in (-1, 0, 1) for dc in range(-span, span + 1)):
+            entries = self._cells.get(cell)
+            if not entries:
+                continue
+            self._prune(cell, entries, cutoff)
+            for created_ts, complaint_id, e_lat, e_lng, e_category in entries:
+                # Registered complaints can arrive out of order, so _prune may have left some behind
+                if e_category != category or created_ts < cutoff:
+                    continue
+                distance = haversine_m(lat, lng, e_lat, e_lng)
+                if distance <= self.radius_m:
+                    matches.append({"id": complaint_id, "distance_m": round(distance, 1), "created_ts": created_ts})
+        matches.sort(key=lambda m: m["distance_m"])
+        return matches
+
+    def _column_span(self, lat: float) -> int:
+        # Columns are narrowest at the search circle's edge furthest from the equator
+        edge_lat = min(abs(lat) + self.cell_deg, 89.0)
+        return math.ceil(1 / math.cos(math.radians(edge_lat)))
+
+    def _prune(self, cell: tuple[int, int], entries: list, cutoff: float):
+        # Entries are mostly time-ordered, so expired ones cluster at the front
+        expired = 0
+        while expired < len(entries) and entries[expired][0] < cutoff:
+            expired += 1
+        if expired:
+            self._ids.difference_update(entry[1] for entry in entries[:expired])
+            del entries[:expired]
+            self.size -= expired
+            if not entries:
+                del self._cells[cell]
+
+    def sweep(self, now: float | None = None):
+        """
+        Drops every expired entry from every cell, including out-of-order ones _prune stops at.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.window
+        for cell, entries in list(self._cells.items()):
+            kept = [entry for entry in entries if entry[0] >= cutoff]
+            if len(kept) == len(entries):
+                continue
+            self._ids.difference_update(entry[1] for entry in entries if entry[0] < cutoff)
+            self.size -= len(entries) - len(kept)
+            if kept:
+                self._cells[cell] = kept
+            else:
+                del self._cells[cell]
+        self._last_sweep = now
+
+    async def warm_load(self, db):
+        """
+        Loads complaints created within the window from Firestore at startup.
+        """
+        if db is None:
+            return
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.window)
+
+        def _load():
+            docs = db.collection('complaints').where('createdAt', '>=', cutoff).order_by('createdAt').stream()
+            loaded = []
+            for doc in docs:
+                data = doc.to_dict()
+                location = data.get('location') or {}
+                if location.get('latitude') is None or location.get('longitude') is None:
+                    continue
+                created = data.get('createdAt')
+                created_ts = created.timestamp() if hasattr(created, 'timestamp') else None
+                loaded.append((doc.id, location['latitude'], location['longitude'], data.get('category', 'others'), created_ts))
+            return loaded
+
+        try:
+            loaded = await anyio.to_thread.run_sync(_load)
+        except Exception as e:
+            logger.error(f"Duplicate index warm-load failed: {e}")
+            return
+        for entry in loaded:
+            self.add(*entry)
+        logger.info("Duplicate index warm-loaded", extra={"complaints": len(loaded)})
+
+    def stats(self) -> dict:
+        return {"size": self.size, "cells": len(self._cells)}
+
+geo_index = GeoDuplicateIndex(
+    radius_m=settings.DUPLICATE_RADIUS_M,
+    window_hours=settings.DUPLICATE_WINDOW_HOURS,
+)
@@ -0,0 +1,78 @@
+import io
+import logging
+
+import anyio
+from PIL import Image, ImageOps
+
+from config import settings
+from services.ingest_service import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+class ImageService:
+    """
+    Shrinks uploaded photos to what the vision model can actually use before they are base64-encoded.
+    Pillow releases the GIL while decoding/resampling, so a bounded thread pool is enough here.
+    """
+
+    def __init__(self):
+        self.max_side = settings.IMAGE_MAX_SIDE
+        self.quality = settings.IMAGE_QUALITY
+        self.format = settings.IMAGE_FORMAT.upper()
+        self.limiter = anyio.CapacityLimiter(settings.IMAGE_WORKERS)
+
+    def _preprocess_sync(self, source: bytes | str) -> tuple[bytes, str]:
+        # source is either the raw bytes or a path to a spooled upload
+        with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+            # Let libjpeg decode at a reduced scale instead of the full 12 MP frame
+            img.draft("RGB", (self.max_side, self.max_side))
+            # Phone cameras store orientation in EXIF rather than rotating pixels
+            img = ImageOps.exif_transpose(img)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img.thumbnail((self.max_side, self.max_side), Image.Resampling.LANCZOS)
+
+            out = io.BytesIO()
+            if self.format == "WEBP":
+                img.save(out, format="WEBP", quality=self.quality, method=4)
+                return out.getvalue(), "image/webp"
+            img.save(out, format="JPEG", quality=self.quality, optimize=True)
+            return out.getvalue(), "image/jpeg"
+
+    async def preprocess(self, contents: bytes, content_type: str | None = None) -> tuple[bytes, str]:
+        """
+        Returns (image bytes, mime type) ready for the vision model.
+        Falls back to the original upload if it can't be decoded or re-encoding doesn't make it smaller.
+        """
+        original = (contents, content_type or "image/jpeg")
+        try:
+            processed, mime_type = await anyio.to_thread.run_sync(
+                self._preprocess_sync, contents, limiter=self.limiter
+            )
+        except Exception as e:
+            logger.warning(f"Image preprocessing skipped: {e}")
+            return original
+
+        if len(processed) >= len(contents):
+            return original
+        return processed, mime_type
+
+    async def preprocess_upload(self, upload: SpooledUpload) -> tuple[bytes, str]:
+        """
+        Same as preprocess() for a shared upload. Disk-spooled uploads are decoded straight from the
+        temp file so the full-size original is only read into memory if preprocessing can't help.
+        """
+        if not upload.on_disk:
+            return await self.preprocess(await upload.read_bytes(), upload.content_type)
+
+        try:
+            processed, mime_type = await anyio.to_thread.run_sync(
+                self._preprocess_sync, upload.path, limiter=self.limiter
+            )
+            if len(processed) < upload.size:
+                return processed, mime_type
+        except Exception as e:
+            logger.warning(f"Image preprocessing skipped: {e}")
+        return await upload.read_bytes(), upload.content_type or "image/jpeg"
+
+image_service = ImageService()
@@ -0,0 +1,190 @@
+import hashlib
+import importlib.util
+import io
+import os
+import tempfile
+import wave
+
+import anyio
+from fastapi import UploadFile
+
+from config import settings
+
+CHUNK_SIZE = 1024 * 1024
+HEAD_SIZE = 64
+
+class UploadTooLarge(Exception):
+    pass
+
+class InvalidAudio(Exception):
+    pass
+
+class SpooledUpload:
+    """
+    A multipart upload read exactly once, then shared by several consumers.
+    Small bodies stay in memory; larger ones are spooled to a temp file on disk.
+    Every reader() is independent, so consumers can run concurrently without fighting over one file offset.
+    """
+
+    def __init__(self, filename: str | None, content_type: str | None):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        # First bytes of the body, kept for format sniffing without reopening the spool
+        self.head = b""
+        # sha256 of the body as received, hashed while it streams in (None for from_path uploads)
+        self.digest: str | None = None
+        self._memory: bytes | None = None
+        self._path: str | None = None
+
+    @classmethod
+    async def receive(cls, upload: UploadFile, spool_threshold: int | None = None, max_bytes: int | None = None) -> "SpooledUpload":
+        spool_threshold = settings.INGEST_SPOOL_THRESHOLD_MB * CHUNK_SIZE if spool_threshold is None else spool_threshold
+        spooled = cls(upload.filename, upload.content_type)
+        buffer = bytearray()
+        hasher = hashlib.sha256()
+        disk_file = None
+        try:
+            while chunk := await upload.read(CHUNK_SIZE):
+                hasher.update(chunk)
+                if len(spooled.head) < HEAD_SIZE:
+                    spooled.head += chunk[:HEAD_SIZE - len(spooled.head)]
+                spooled.size += len(chunk)
+                if max_bytes is not None and spooled.size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+
+                if disk_file is None and spooled.size > spool_threshold:
+                    disk_file = tempfile.NamedTemporaryFile(prefix="civic-upload-", delete=False)
+                    spooled._path = disk_file.name
+                    await anyio.to_thread.run_sync(disk_file.write, bytes(buffer))
+                    buffer = bytearray()
+
+                if disk_file is not None:
+                    await anyio.to_thread.run_sync(disk_file.write, chunk)
+                else:
+                    buffer += chunk
+        except BaseException:
+            if disk_file is not None:
+                disk_file.close()
+            spooled.close()
+            raise
+
+        if disk_file is not None:
+            disk_file.close()
+        else:
+            spooled._memory = bytes(buffer)
+        spooled.digest = hasher.hexdigest()
+        return spooled
+
+    @classmethod
+    def from_path(cls, path: str, filename: str | None = None, content_type: str | None = None) -> "SpooledUpload":
+        """
+        Takes ownership of an already spooled file (e.g. a queued job's recording); close() deletes it.
+        """
+        spooled = cls(filename, content_type)
+        spooled._path = path
+        spooled.size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            spooled.head = f.read(HEAD_SIZE)
+        return spooled
+
+    @property
+    def on_disk(self) -> bool:
+        return self._path is not None
+
+    @property
+    def path(self) -> str | None:
+        return self._path
+
+    def reader(self):
+        """
+        A fresh binary file object positioned at 0. In-memory bodies share the underlying bytes (no copy).
+        """
+        if self._path is not None:
+            return open(self._path, "rb")
+        return io.BytesIO(self._memory or b"")
+
+    async def read_bytes(self) -> bytes:
+        if self._path is None:
+            return self._memory or b""
+
+        def _read():
+            with open(self._path, "rb") as f:
+                return f.read()
+        return await anyio.to_thread.run_sync(_read)
+
+    def close(self):
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+        self._memory = None
+
+def sniff_audio_format(head: bytes) -> str | None:
+    """
+    Container format from the leading magic bytes; None if it isn't a recording format we accept.
+    """
+    if head.startswith(b"\x1aE\xdf\xa3"):
+        return "webm"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head.startswith(b"#!AMR"):
+        return "amr"
+    if head.startswith(b"ID3") or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        # MPEG audio frame sync; ADTS AAC shares it
+        return "mpeg"
+    return None
+
+def _probe_duration(upload: SpooledUpload, audio_format: str) -> float | None:
+    """
+    Recording length in seconds. WAV is read from its header; other containers need PyAV
+    (installed with faster-whisper), otherwise the length is unknown and only the size cap applies.
+    """
+    if audio_format == "wav":
+        try:
+            with upload.reader() as source, wave.open(source) as wav:
+                return wav.getnframes() / wav.getframerate()
+        # wave raises a bare RuntimeError when a chunk header claims more data than the file holds
+        except (wave.Error, EOFError, ZeroDivisionError, RuntimeError) as e:
+            raise InvalidAudio(f"Unreadable WAV recording: {e}") from e
+    if importlib.util.find_spec("av") is None:
+        return None
+
+    import av
+
+    try:
+        with upload.reader() as source, av.open(source) as container:
+            if container.duration:
+                return container.duration / av.time_base
+            # Browser (MediaRecorder) WebM has no duration in its header: demux packet timestamps, no decoding
+            stream = container.streams.audio[0]
+            end = 0
+            for packet in container.demux(stream):
+                if packet.pts is not None:
+                    end = max(end, packet.pts + (packet.duration or 0))
+            return float(end * stream.time_base)
+    except (av.AVError, IndexError) as e:
+        raise InvalidAudio(f"Unreadable {audio_format} recording: {e}") from e
+
+async def validate_audio(upload: SpooledUpload, max_seconds: float) -> dict:
+    """
+    Checks a spooled recording before any storage or transcription work starts.
+    Raises InvalidAudio (empty/unsupported/corrupt) or UploadTooLarge (longer than max_seconds).
+    """
+    if upload.size == 0:
+        raise InvalidAudio("Empty audio file")
+    audio_format = sniff_audio_format(upload.head)
+    if audio_format is None:
+        raise InvalidAudio("Unsupported audio format")
+    duration = await anyio.to_thread.run_sync(_probe_duration, upload, audio_format)
+    if duration is not None and duration > max_seconds:
+        raise UploadTooLarge(f"Recording is {duration:.0f}s long, the limit is {max_seconds:.0f}s")
+    return {"format": audio_format, "duration": duration}
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+from config import settings
+from services.observability import JOB_WAIT
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    pass
+
+class JobBackend:
+    """
+    Queue + job status storage. Subclass to plug in a shared store; payloads and statuses
+    must stay JSON-serializable so they can cross process boundaries.
+    """
+
+    async def put(self, job_id: str, kind: str, payload: dict):
+        raise NotImplementedError
+
+    async def get(self) -> tuple[str, str, dict]:
+        raise NotImplementedError
+
+    async def depth(self) -> int:
+        raise NotImplementedError
+
+    async def set_status(self, job_id: str, status: dict):
+        raise NotImplementedError
+
+    async def get_status(self, job_id: str) -> dict | None:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class InMemoryJobBackend(JobBackend):
+    """
+    Bounded asyncio.Queue; statuses expire `result_ttl` seconds after their last update.
+    """
+
+    def __init__(self, max_size: int = 1000, result_ttl: float = 3600.0):
+        self.max_size = max_size
+        self.result_ttl = result_ttl
+        self._queue: asyncio.Queue | None = None
+        self._statuses: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def _get_queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        return self._queue
+
+    async def put(self, job_id: str, kind: str, payload: dict):
+        try:
+            self._get_queue().put_nowait((job_id, kind, payload))
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"Job queue full ({self.max_size} pending)")
+
+    async def get(self) -> tuple[str, str, dict]:
+        return await self._get_queue().get()
+
+    async def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def set_status(self, job_id: str, status: dict):
+        now = time.time()
+        self._statuses[job_id] = (now + self.result_ttl, status)
+        self._statuses.move_to_end(job_id)
+        while self._statuses:
+            oldest_id, (expires_at, _) = next(iter(self._statuses.items()))
+            if expires_at > now:
+                break
+            del self._statuses[oldest_id]
+
+    async def get_status(self, job_id: str) -> dict | None:
+        entry = self._statuses.get(job_id)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+class RedisJobBackend(JobBackend):
+    """
+    List-based queue on any Redis-compatible server (Redis, Valkey, KeyDB...), so several API
+    processes on one host can share the work. Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, max_size: int = 1000, result_ttl: float = 3600.0, prefix: str = "civic:jobs"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.max_size = max_size
+        self.result_ttl = int(result_ttl)
+        self.queue_key = f"{prefix}:queue"
+        self.status_prefix = f"{prefix}:status:"
+
+    async def put(self, job_id: str, kind: str, payload: dict):
+        if await self.client.llen(self.queue_key) >= self.max_size:
+            raise JobQueueFull(f"Job queue full ({self.max_size} pending)")
+        await self.client.lpush(self.queue_key, json.dumps({"id": job_id, "kind": kind, "payload": payload}))
+
+    async def get(self) -> tuple[str, str, dict]:
+        while True:
+            # Short blocking pops so cancellation at shutdown is noticed promptly
+            item = await self.client.brpop(self.queue_key, timeout=1)
+            if item is not None:
+                job = json.loads(item[1])
+                return job["id"], job["kind"], job["payload"]
+
+    async def depth(self) -> int:
+        return await self.client.llen(self.queue_key)
+
+    async def set_status(self, job_id: str, status: dict):
+        await self.client.set(self.status_prefix + job_id, json.dumps(status), ex=self.result_ttl)
+
+    async def get_status(self, job_id: str) -> dict | None:
+        raw = await self.client.get(self.status_prefix + job_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def close(self):
+        await self.client.aclose()
+
+class JobQueue:
+    """
+    Background job runner: `workers` asyncio tasks pull jobs from the backend and dispatch them
+    to the handler registered for their kind. Job status moves queued -> running -> succeeded/failed.
+    """
+
+    def __init__(self, backend: JobBackend, workers: int = 4):
+        self.backend = backend
+        self.workers = workers
+        self.handlers: dict[str, callable] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._depth = 0
+        self.counters = {"enqueued": 0, "succeeded": 0, "failed": 0, "running": 0, "wait_seconds_total": 0.0, "last_wait_seconds": 0.0}
+
+    def register(self, kind: str, handler):
+        """
+        `handler(payload) -> dict` is awaited by a worker; its return value becomes the job result.
+        """
+        self.handlers[kind] = handler
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.backend.close()
+
+    async def submit(self, kind: str, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        status = {"jobId": job_id, "kind": kind, "status": "queued", "enqueuedAt": time.time()}
+        # Status goes first so a worker that picks the job up immediately always finds it
+        await self.backend.set_status(job_id, status)
+        try:
+            await self.backend.put(job_id, kind, payload)
+        except JobQueueFull as e:
+            await self.backend.set_status(job_id, {**status, "status": "failed", "error": str(e)})
+            raise
+        self.counters["enqueued"] += 1
+        await self.refresh_depth()
+        return job_id
+
+    async def status(self, job_id: str) -> dict | None:
+        return await self.backend.get_status(job_id)
+
+    async def _worker(self):
+        while True:
+            try:
+                job_id, kind, payload = await self.backend.get()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job queue backend error: {e}")
+                await asyncio.sleep(1)
+                continue
+            try:
+                await self._run_job(job_id, kind, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} status update failed: {e}")
+
+    async def _run_job(self, job_id: str, kind: str, payload: dict):
+        await self.refresh_depth()
+        status = await self.backend.get_status(job_id) or {"jobId": job_id, "kind": kind, "enqueuedAt": time.time()}
+        wait = max(0.0, time.time() - status["enqueuedAt"])
+        JOB_WAIT.labels(kind).observe(wait)
+        self.counters["wait_seconds_total"] += wait
+        self.counters["last_wait_seconds"] = wait
+
+        status = {**status, "status": "running", "startedAt": time.time(), "waitSeconds": round(wait, 3)}
+        await self.backend.set_status(job_id, status)
+        self.counters["running"] += 1
+        try:
+            result = await self.handlers[kind](payload)
+            status = {**status, "status": "succeeded", "result": result}
+            self.counters["succeeded"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} ({kind}) failed: {e}")
+            status = {**status, "status": "failed", "error": str(e)}
+            self.counters["failed"] += 1
+        finally:
+            self.counters["running"] -= 1
+        status["finishedAt"] = time.time()
+        await self.backend.set_status(job_id, status)
+
+    async def refresh_depth(self) -> int:
+        self._depth = await self.backend.depth()
+        return self._depth
+
+    def stats(self) -> dict:
+        return {**self.counters, "depth": self._depth, "workers": self.workers}
+
+def _build_backend() -> JobBackend:
+    if settings.JOB_QUEUE_URL:
+        return RedisJobBackend(settings.JOB_QUEUE_URL, settings.JOB_QUEUE_MAX_SIZE, settings.JOB_RESULT_TTL)
+    return InMemoryJobBackend(settings.JOB_QUEUE_MAX_SIZE, settings.JOB_RESULT_TTL)
+
+job_queue = JobQueue(_build_backend(), workers=settings.JOB_WORKERS)
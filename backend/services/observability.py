@@ -0,0 +1,128 @@
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily
+
+from config import settings
+
+try:
+    from opentelemetry import trace
+    _tracer = trace.get_tracer("civic-connect")
+except ImportError:
+    _tracer = None
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is emitted as a JSON field
+_RESERVED_LOG_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_LOG_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging():
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if settings.LOG_JSON else logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # httpx logs every request at INFO, which drowns out our own events
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+registry = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "civic_http_request_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], registry=registry,
+)
+STAGE_LATENCY = Histogram(
+    "civic_pipeline_stage_seconds", "Latency of individual pipeline stages",
+    ["stage"], registry=registry,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+LLM_TOKENS = Counter(
+    "civic_llm_tokens_total", "Tokens reported by the NVIDIA API usage block",
+    ["model", "kind"], registry=registry,
+)
+UPSTREAM_RESPONSES = Counter(
+    "civic_upstream_responses_total", "NVIDIA API attempts by route and outcome (HTTP status, 'error' or 'circuit_open')",
+    ["route", "status"], registry=registry,
+)
+JOB_WAIT = Histogram(
+    "civic_job_wait_seconds", "Time background jobs spend queued before a worker picks them up",
+    ["kind"], registry=registry,
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+RATE_LIMITED = Counter(
+    "civic_rate_limited_total", "Requests rejected with 429 by admission control ('client' bucket or 'global' in-flight cap)",
+    ["reason"], registry=registry,
+)
+
+class _StatsCollector:
+    """
+    Exposes the services' own counters/gauges at scrape time instead of mirroring every update.
+    """
+
+    def __init__(self):
+        self.sources: dict[str, callable] = {}
+
+    def collect(self):
+        for name, stats_fn in self.sources.items():
+            try:
+                stats = stats_fn()
+            except Exception:
+                continue
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                gauge = GaugeMetricFamily(f"civic_{name}_{key}", f"{name} {key}")
+                gauge.add_metric([], value)
+                yield gauge
+
+_stats_collector = _StatsCollector()
+registry.register(_stats_collector)
+
+def register_stats(name: str, stats_fn):
+    """
+    Publishes a service's stats() dict (numeric values only) as civic_<name>_<key> gauges.
+    """
+    _stats_collector.sources[name] = stats_fn
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def span(name: str, **attributes):
+    """
+    OpenTelemetry span when the SDK is installed, otherwise a no-op.
+    """
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def record_usage(model: str, data: dict):
+    usage = data.get("usage") or {}
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            LLM_TOKENS.labels(model, kind.removesuffix("_tokens")).inc(usage[kind])
+
+@contextmanager
+def observe_stage(stage: str):
+    start = time.perf_counter()
+    with span(f"stage.{stage}"):
+        try:
+            yield
+        finally:
+            STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
@@ -0,0 +1,234 @@
+import json
+import re
+from typing import Literal
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Repairs below run on the text *between* JSON strings only, so string contents are never rewritten
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_UNQUOTED_KEY = re.compile(r"([{,]\s*)([A-Za-z_][A-Za-z0-9_]*)(\s*:)")
+_SINGLE_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_PY_LITERALS = re.compile(r"\b(True|False|None)\b")
+_PY_LITERAL_MAP = {"True": "true", "False": "false", "None": "null"}
+_STRUCTURAL = re.compile(r'[{}"\\]')
+_BRACKETS = re.compile(r'[{}\[\]"\\]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\Z)', re.DOTALL)
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+class OutputParseError(ValueError):
+    pass
+
+def iter_json_objects(text: str):
+    """
+    Yields every top-level balanced {...} span in `text`, skipping braces inside strings.
+    Unlike a greedy r'\\{.*\\}' this stops at the matching brace, so chatter after the object
+    (or a second object) doesn't end up in the candidate.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped_at = -1
+    # Only structural characters matter, so jump between them instead of walking every character
+    for match in _STRUCTURAL.finditer(text):
+        char, i = match.group(), match.start()
+        if in_string:
+            if char == "\\":
+                if escaped_at != i:
+                    escaped_at = i + 1
+            elif char == '"' and escaped_at != i:
+                in_string = False
+            continue
+        if char == '"' and depth > 0:
+            in_string = True
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+def _split_strings(text: str) -> list[tuple[bool, str]]:
+    # [(is_string, segment)] with double-quoted strings (quotes included) kept intact
+    segments, last = [], 0
+    for match in _STRING.finditer(text):
+        if match.start() > last:
+            segments.append((False, text[last:match.start()]))
+        segments.append((True, match.group()))
+        last = match.end()
+    if last < len(text):
+        segments.append((False, text[last:]))
+    return segments
+
+def _close_truncated(text: str) -> str:
+    """
+    Closes an object cut off mid-way (max_tokens hit): open string, dangling key/comma, open brackets.
+    """
+    stack, in_string, escaped_at = [], False, -1
+    for match in _BRACKETS.finditer(text):
+        char, i = match.group(), match.start()
+        if in_string:
+            if char == "\\":
+                if escaped_at != i:
+                    escaped_at = i + 1
+            elif char == '"' and escaped_at != i:
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(":"):
+        text += " null"
+    text = text.rstrip(",")
+    return text + "".join(reversed(stack))
+
+def repair_json(candidate: str) -> str:
+    """
+    Fixes the mistakes LLMs commonly make in JSON: smart quotes, single-quoted strings,
+    unquoted keys, trailing commas, Python literals and truncated output.
+    """
+    candidate = candidate.translate(_SMART_QUOTES).strip()
+    # Single-quoted strings become real strings first, so the next pass leaves their contents alone
+    candidate = "".join(
+        segment if is_string else _SINGLE_QUOTED.sub(lambda m: json.dumps(m.group(1).replace("\\'", "'"), ensure_ascii=False), segment)
+        for is_string, segment in _split_strings(candidate)
+    )
+    repaired = []
+    for is_string, segment in _split_strings(candidate):
+        if not is_string:
+            segment = _UNQUOTED_KEY.sub(r'\1"\2"\3', segment)
+            segment = _PY_LITERALS.sub(lambda m: _PY_LITERAL_MAP[m.group(1)], segment)
+            segment = _TRAILING_COMMA.sub(r"\1", segment)
+        repaired.append(segment)
+    return _close_truncated("".join(repaired))
+
+def _try_loads(candidate: str) -> dict | None:
+    for attempt in (lambda: candidate, lambda: repair_json(candidate)):
+        try:
+            value = json.loads(attempt())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+def parse_json_object(text: str) -> dict:
+    """
+    First JSON object in an LLM response, tolerating code fences, surrounding chatter,
+    common syntax slips and truncation. Raises OutputParseError if nothing usable is found.
+    """
+    if not text:
+        raise OutputParseError("Empty model output")
+
+    # Fast path: well-behaved output is a bare JSON object
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            value = json.loads(stripped)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+
+    fenced = _FENCE.search(text)
+    sources = [fenced.group(1), text] if fenced else [text]
+    for source in sources:
+        for candidate in iter_json_objects(source):
+            value = _try_loads(candidate)
+            if value is not None:
+                return value
+        # No balanced object: the response may have been cut off before the closing brace
+        start = source.find("{")
+        if start != -1:
+            value = _try_loads(source[start:])
+            if value is not None:
+                return value
+    raise OutputParseError(f"No JSON object found in model output: {text[:200]!r}")
+
+CATEGORIES = ("road", "garbage", "drainage", "water", "streetlight", "others")
+PRIORITIES = ("low", "medium", "high", "critical")
+
+_CATEGORY_ALIASES = {
+    "roads": "road", "pothole": "road", "potholes": "road",
+    "trash": "garbage", "waste": "garbage", "sanitation": "garbage",
+    "drain": "drainage", "drains": "drainage", "sewage": "drainage", "sewer": "drainage",
+    "water supply": "water", "water_supply": "water",
+    "street light": "streetlight", "street_light": "streetlight", "streetlights": "streetlight", "electricity": "streetlight",
+    "other": "others",
+}
+_PRIORITY_ALIASES = {"urgent": "critical", "emergency": "critical", "severe": "high", "normal": "medium", "moderate": "medium", "minor": "low"}
+
+Category = Literal["road", "garbage", "drainage", "water", "streetlight", "others"]
+Priority = Literal["low", "medium", "high", "critical"]
+
+class _ComplaintFields(BaseModel):
+    category: Category
+    priority: Priority = "medium"
+
+    @field_validator("category", mode="before")
+    @classmethod
+    def _normalize_category(cls, value):
+        value = str(value or "").strip().lower()
+        value = _CATEGORY_ALIASES.get(value, value)
+        # An out-of-vocabulary category still gets routed rather than failing the whole parse
+        return value if value in CATEGORIES else "others"
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, value):
+        value = str(value or "").strip().lower()
+        value = _PRIORITY_ALIASES.get(value, value)
+        return value if value in PRIORITIES else "medium"
+
+    @field_validator("summary", "location_details", "translation", "title", "description", mode="before", check_fields=False)
+    @classmethod
+    def _coerce_text(cls, value):
+        # Models sometimes emit null or a nested object for free-text fields
+        if value is None:
+            return ""
+        return value.strip() if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+class ExtractionResult(_ComplaintFields):
+    summary: str = Field(min_length=1)
+    location_details: str = ""
+
+class TranslateExtractResult(ExtractionResult):
+    translation: str = Field(min_length=1)
+
+class ImageAnalysisResult(_ComplaintFields):
+    title: str = Field(min_length=1)
+    description: str = ""
+
+class ConversationResult(_ComplaintFields):
+    title: str = ""
+    description: str = ""
+
+def parse_model(text: str, model: type[BaseModel]) -> dict:
+    """
+    parse_json_object + schema validation; returns the validated fields as a plain dict.
+    Well-formed output is parsed and validated in one pydantic-core pass; the repair pipeline
+    only runs when that fails.
+    """
+    # Fast path: usually everything from the first "{" to the last "}" is one valid object (bare,
+    # fenced or wrapped in chatter). A span covering two objects or stray braces isn't valid JSON,
+    # so it just falls through to the full pipeline
+    text = text or ""
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            return model.model_validate_json(text[start:end + 1]).model_dump()
+        except ValidationError:
+            pass
+
+    data = parse_json_object(text)
+    try:
+        return model.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise OutputParseError(f"Model output failed {model.__name__} validation: {e.errors()}") from e
@@ -0,0 +1,31 @@
+import time
+from contextlib import contextmanager
+
+from services.observability import observe_stage
+
+class StageTimer:
+    """
+    Records wall-clock duration (ms) of named pipeline stages.
+    Stages may overlap when they run concurrently; 'total' is measured from construction.
+    Each stage is also exported as a Prometheus histogram sample and (if enabled) an OpenTelemetry span.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            with observe_stage(name):
+                yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def run(self, name: str, awaitable):
+        with self.stage(name):
+            return await awaitable
+
+    def report(self) -> dict:
+        return {**self.timings, "total": round((time.perf_counter() - self.started) * 1000, 2)}
@@ -0,0 +1,71 @@
+import logging
+import threading
+import time
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+_providers: dict[str, "LazyProvider"] = {}
+
+class LazyProvider:
+    """
+    Builds an expensive client (and imports its SDK) on first use instead of at module import,
+    so a fresh worker starts serving before every third-party library is loaded.
+    Thread-safe: the blocking SDK calls that use these clients run in worker threads.
+    """
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self.factory = factory
+        self.init_seconds: float | None = None
+        self._value = None
+        self._lock = threading.Lock()
+        _providers[name] = self
+
+    @property
+    def initialized(self) -> bool:
+        return self.init_seconds is not None
+
+    def get(self):
+        if self.init_seconds is None:
+            with self._lock:
+                if self.init_seconds is None:
+                    start = time.perf_counter()
+                    self._value = self.factory()
+                    self.init_seconds = time.perf_counter() - start
+                    logger.info(f"Initialized {self.name} in {self.init_seconds * 1000:.0f} ms")
+        return self._value
+
+    async def aget(self):
+        if self.initialized:
+            return self._value
+        return await anyio.to_thread.run_sync(self.get)
+
+    def override(self, value):
+        """
+        Replaces the client without running the factory (local stand-ins, benchmarks).
+        """
+        with self._lock:
+            self._value = value
+            self.init_seconds = 0.0
+
+async def warm_up(names: list[str] | None = None):
+    """
+    Initializes the named providers (all by default) concurrently in worker threads.
+    A failing factory is logged, not raised, so warm-up never takes the worker down.
+    """
+    async def init(provider: LazyProvider):
+        try:
+            await provider.aget()
+        except Exception as e:
+            logger.error(f"Warm-up of {provider.name} failed: {e}")
+
+    async with anyio.create_task_group() as tg:
+        for name, provider in _providers.items():
+            if names is None or name in names:
+                tg.start_soon(init, provider)
+
+def stats() -> dict:
+    # -1 marks a provider nobody has needed yet
+    return {f"{name}_init_seconds": p.init_seconds if p.initialized else -1 for name, p in _providers.items()}
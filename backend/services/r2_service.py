@@ -1,41 +1,82 @@
-import boto3
-from botocore.exceptions import NoCredentialsError
+import logging
+import anyio
 from config import settings
 import uuid
 from fastapi import UploadFile
+from services.providers import LazyProvider
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+def _build_s3_client():
+    # boto3 alone costs ~150 ms of import time, so it's only loaded once an upload (or warm-up) needs it
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+
+    # Long recordings are streamed as multipart chunks instead of a single PUT
+    transfer_config = TransferConfig(
+        multipart_threshold=settings.R2_MULTIPART_THRESHOLD_MB * MB,
+        multipart_chunksize=settings.R2_MULTIPART_CHUNKSIZE_MB * MB,
+        max_concurrency=4,
+    )
+    try:
+        client = boto3.client(
+            's3',
+            endpoint_url=settings.R2_ENDPOINT_URL or f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
+            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+            region_name="auto", 
+        )
+    except Exception as e:
+        logger.error(f"R2 Service Init Failed (Mock Mode Active): {e}")
+        client = None
+    return client, transfer_config
 
 class R2Service:
     def __init__(self):
-        try:
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
-                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name="auto", 
-            )
-        except Exception as e:
-            print(f"R2 Service Init Failed (Mock Mode Active): {e}")
-            self.s3_client = None
+        self.client_provider = LazyProvider("r2", _build_s3_client)
+        # Caps how many uploads occupy worker threads at once
+        self.upload_limiter = anyio.CapacityLimiter(settings.R2_UPLOAD_CONCURRENCY)
+
+    @property
+    def s3_client(self):
+        return self.client_provider.get()[0]
+
+    @property
+    def transfer_config(self):
+        return self.client_provider.get()[1]
 
     async def upload_audio(self, file: UploadFile) -> str:
         """
         Uploads audio file to R2 and returns public URL.
         """
-        file_extension = file.filename.split(".")[-1]
+        return await self.upload_audio_source(file.file, file.filename)
+
+    async def upload_audio_source(self, source, filename: str | None) -> str:
+        """
+        Uploads a binary file object (e.g. one SpooledUpload reader) and returns the public URL.
+        The blocking boto3 transfer runs in a bounded worker thread so the event loop stays free.
+        """
+        file_extension = (filename or "recording.webm").split(".")[-1]
         file_name = f"{uuid.uuid4()}.{file_extension}"
         
-        if self.s3_client:
+        s3_client, transfer_config = await self.client_provider.aget()
+        if s3_client:
             try:
                 # Actual Upload Logic
-                self.s3_client.upload_fileobj(
-                    file.file,
-                    settings.R2_BUCKET_NAME,
-                    file_name
+                await anyio.to_thread.run_sync(
+                    lambda: s3_client.upload_fileobj(
+                        source,
+                        settings.R2_BUCKET_NAME,
+                        file_name,
+                        Config=transfer_config
+                    ),
+                    limiter=self.upload_limiter
                 )
                 return f"{settings.R2_PUBLIC_URL_BASE}/{file_name}"
             except Exception as e:
-                print(f"Upload failed: {e}")
+                logger.error(f"Upload failed: {e}")
                 # Fallback to mock URL for demo purposes if creds fail
                 return f"https://mock-r2-storage.com/{file_name}"
         else:
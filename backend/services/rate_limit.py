@@ -0,0 +1,201 @@
+import ipaddress
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+
+from config import settings
+from services.observability import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+class RateLimited(Exception):
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"Rate limited ({reason}), retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+        self.reason = reason
+
+class RateLimitBackend:
+    """
+    Token-bucket state. Subclass to share buckets between worker processes.
+    """
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """
+        Spends `cost` tokens from the bucket if it has them and returns 0, otherwise returns
+        the seconds until it will.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process buckets, least recently used dropped beyond `max_keys` (a dropped bucket is simply full again).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+_TOKEN_BUCKET_LUA = """
+local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then tokens = tokens - cost else retry_after = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in any Redis-compatible server, updated atomically by a Lua script so every worker
+    process sees the same budget. Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "civic:ratelimit:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._script = self.client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        result = await self._script(keys=[self.prefix + key], args=[rate, burst, cost, time.time()])
+        return float(result)
+
+    async def close(self):
+        await self.client.aclose()
+
+def parse_networks(spec: str) -> tuple:
+    """
+    Comma-separated IPs and CIDR ranges, e.g. "10.0.0.0/8, 127.0.0.1".
+    """
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip())
+
+TRUSTED_PROXIES = parse_networks(settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+def _is_trusted(host: str, proxies: tuple) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in proxies)
+
+def client_key(request: Request, user_id: str | None = None, trusted_proxies: tuple = TRUSTED_PROXIES) -> str:
+    """
+    Bucket key: the user ID when the caller has been authenticated, otherwise the client IP.
+    Never pass an ID the client merely claims (a form field or query parameter).
+    X-Forwarded-For is anyone's to write, so it only counts when the connection comes from one of
+    `trusted_proxies`; then the nearest hop that isn't itself a trusted proxy is the client.
+    (Alternatively run uvicorn with --proxy-headers --forwarded-allow-ips and leave this list empty.)
+    """
+    if user_id:
+        return f"user:{user_id}"
+    host = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and _is_trusted(host, trusted_proxies):
+        for hop in reversed([h.strip() for h in forwarded.split(",") if h.strip()]):
+            host = hop
+            if not _is_trusted(hop, trusted_proxies):
+                break
+    return f"ip:{host}"
+
+class AdmissionController:
+    """
+    Front-door admission for the LLM-backed endpoints: a token bucket per client plus a cap on
+    requests in flight in this process. Both reject immediately with RateLimited (served as 429)
+    instead of letting work queue up behind the NVIDIA concurrency limit.
+    """
+
+    def __init__(self, backend: RateLimitBackend, rate: float, burst: float, max_in_flight: int, enabled: bool = True):
+        self.backend = backend
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.enabled = enabled
+        self.in_flight = 0
+        self.counters = {"admitted": 0, "rejected_client": 0, "rejected_global": 0}
+
+    async def check_client(self, key: str, cost: float = 1.0):
+        if not self.enabled:
+            return
+        try:
+            retry_after = await self.backend.take(key, self.rate, self.burst, cost)
+        except Exception as e:
+            # A shared-state outage shouldn't take the API down with it
+            logger.warning(f"Rate limit backend unavailable, admitting request: {e}")
+            return
+        if retry_after > 0:
+            self.counters["rejected_client"] += 1
+            RATE_LIMITED.labels("client").inc()
+            raise RateLimited(retry_after, "client")
+
+    def acquire_slot(self):
+        if self.enabled and self.in_flight >= self.max_in_flight:
+            self.counters["rejected_global"] += 1
+            RATE_LIMITED.labels("global").inc()
+            raise RateLimited(1.0, "global")
+        self.in_flight += 1
+        self.counters["admitted"] += 1
+
+    def release_slot(self):
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def guard(self, key: str, cost: float = 1.0):
+        await self.check_client(key, cost)
+        self.acquire_slot()
+        try:
+            yield
+        finally:
+            self.release_slot()
+
+    @staticmethod
+    def retry_after_header(exc: RateLimited) -> str:
+        return str(max(1, math.ceil(exc.retry_after)))
+
+    def stats(self) -> dict:
+        return {**self.counters, "in_flight": self.in_flight, "max_in_flight": self.max_in_flight}
+
+    async def close(self):
+        await self.backend.close()
+
+def _build_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_URL:
+        return RedisRateLimitBackend(settings.RATE_LIMIT_URL)
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+admission = AdmissionController(
+    _build_backend(),
+    rate=settings.RATE_LIMIT_RATE,
+    burst=settings.RATE_LIMIT_BURST,
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
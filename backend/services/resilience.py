@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+
+import httpx
+
+from config import settings
+from services.observability import UPSTREAM_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and fast-fails calls for `reset_timeout` seconds,
+    then lets a single probe through (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """
+        Ends a half-open probe that finished without a verdict (cancelled, or failed before reaching
+        the upstream) so the next call can probe instead of the breaker staying half-open for good.
+        """
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit breaker OPEN after {self.failures} failures; fast-failing for {self.reset_timeout}s")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+        return ordered[index]
+
+class ResilientCaller:
+    """
+    Wraps single upstream attempts with a global concurrency cap, retries (exponential backoff + jitter)
+    on 429/5xx/connection errors, a circuit breaker, and optional hedging: if an attempt runs past the
+    recent latency percentile for its route, a second identical request races it.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        max_concurrency: int = 16,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+    ):
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency: dict[str, LatencyTracker] = {}
+        self.counters = {"calls": 0, "retries": 0, "short_circuited": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.replace(".", "", 1).isdigit():
+                return min(float(retry_after), self.backoff_max)
+        # Full jitter keeps synchronized clients from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def call(self, send, route: str = "default") -> httpx.Response:
+        """
+        `send` is a zero-argument coroutine function performing one HTTP attempt.
+        Returns the final response (possibly a non-retryable error status); raises CircuitOpenError or
+        the last transport error when the upstream is unavailable.
+        """
+        self.counters["calls"] += 1
+        tracker = self.latency.setdefault(route, LatencyTracker())
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self.counters["short_circuited"] += 1
+                UPSTREAM_RESPONSES.labels(route, "circuit_open").inc()
+                raise CircuitOpenError("NVIDIA API circuit is open")
+
+            probing = self.breaker.state == "half_open"
+            response = None
+            try:
+                async with self.semaphore:
+                    started = time.perf_counter()
+                    response = await self._attempt(send, tracker)
+            except httpx.TimeoutException:
+                UPSTREAM_RESPONSES.labels(route, "timeout").inc()
+                # Already waited a full timeout; retrying would multiply the user's wait
+                self.breaker.record_failure()
+                self.counters["failures"] += 1
+                raise
+            except httpx.TransportError:
+                UPSTREAM_RESPONSES.labels(route, "error").inc()
+                self.breaker.record_failure()
+                self.counters["failures"] += 1
+                if attempt == self.max_retries:
+                    raise
+            except BaseException:
+                # Any other error or a cancellation says nothing about the upstream; free the probe slot
+                if probing:
+                    self.breaker.release_probe()
+                raise
+            else:
+                UPSTREAM_RESPONSES.labels(route, str(response.status_code)).inc()
+                if response.status_code not in RETRYABLE_STATUS:
+                    tracker.record(time.perf_counter() - started)
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                self.counters["failures"] += 1
+                if attempt == self.max_retries:
+                    return response
+
+            self.counters["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, response))
+
+    async def _attempt(self, send, tracker: LatencyTracker) -> httpx.Response:
+        hedge_after = None
+        if self.hedge_enabled and len(tracker.samples) >= self.hedge_min_samples:
+            hedge_after = tracker.percentile(self.hedge_percentile)
+        if hedge_after is None:
+            return await send()
+
+        primary = asyncio.create_task(send())
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        self.counters["hedges"] += 1
+        hedge = asyncio.create_task(send())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+            # Both attempts failed; surface the primary's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {**self.counters, "breaker_state": self.breaker.state, "breaker_open": int(self.breaker.state == "open")}
+
+nvidia_caller = ResilientCaller(
+    CircuitBreaker(settings.NVIDIA_BREAKER_THRESHOLD, settings.NVIDIA_BREAKER_RESET),
+    max_retries=settings.NVIDIA_MAX_RETRIES,
+    backoff_base=settings.NVIDIA_BACKOFF_BASE,
+    backoff_max=settings.NVIDIA_BACKOFF_MAX,
+    max_concurrency=settings.NVIDIA_MAX_CONCURRENCY,
+    hedge_enabled=settings.NVIDIA_HEDGE_ENABLED,
+    hedge_percentile=settings.NVIDIA_HEDGE_PERCENTILE,
+)
@@ -0,0 +1,132 @@
+import time
+import uuid
+from collections import OrderedDict
+
+from config import settings
+
+class SessionStore:
+    """
+    Storage backend for chat histories. Subclass to plug in a shared store (e.g. Redis).
+    """
+
+    async def get(self, session_id: str) -> list | None:
+        raise NotImplementedError
+
+    async def set(self, session_id: str, history: list):
+        raise NotImplementedError
+
+    async def delete(self, session_id: str):
+        raise NotImplementedError
+
+class InMemorySessionStore(SessionStore):
+    """
+    Per-process store with idle-TTL expiry and a cap on live sessions (least recently used go first).
+    """
+
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = 10000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, tuple[float, list]] = OrderedDict()
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at > now and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    async def get(self, session_id: str) -> list | None:
+        now = time.time()
+        self._evict(now)
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        self._sessions[session_id] = (now + self.ttl, entry[1])
+        self._sessions.move_to_end(session_id)
+        return entry[1]
+
+    async def set(self, session_id: str, history: list):
+        now = time.time()
+        self._sessions[session_id] = (now + self.ttl, history)
+        self._sessions.move_to_end(session_id)
+        self._evict(now)
+
+    async def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting; Telugu runs denser but errs safe
+    return len(text) // 4 + 1
+
+def trim_history(history: list, token_budget: int) -> list:
+    """
+    Keeps the most recent turns that fit in token_budget.
+    The newest user turn (the one being answered) and anything after it are always kept, as is the
+    first user turn (usually the problem statement), truncated if needed.
+    """
+    if not history:
+        return history
+
+    total = sum(estimate_tokens(str(turn.get("content", ""))) for turn in history)
+    if total <= token_budget:
+        return history
+
+    last_user = max((i for i, turn in enumerate(history) if turn.get("role") == "user"), default=len(history))
+    if last_user == 0:
+        # The current turn is the first one; there is nothing older to drop
+        return history
+    tail = history[last_user:]
+
+    first = history[0]
+    first_content = str(first.get("content", ""))
+    first_budget = token_budget // 4
+    if estimate_tokens(first_content) > first_budget:
+        first = {**first, "content": first_content[: first_budget * 4] + "..."}
+    remaining = token_budget - estimate_tokens(str(first["content"]))
+    remaining -= sum(estimate_tokens(str(turn.get("content", ""))) for turn in tail)
+
+    middle = []
+    for turn in reversed(history[1:len(history) - len(tail)]):
+        cost = estimate_tokens(str(turn.get("content", "")))
+        if cost > remaining:
+            break
+        middle.append(turn)
+        remaining -= cost
+    middle.reverse()
+
+    # Chat templates expect user/assistant alternation after the system prompt: drop older turns
+    # to restore it, and fold the first turn into the current one if nothing is left between them
+    while middle and middle[0].get("role") == first.get("role"):
+        middle = middle[1:]
+    if not middle and tail and tail[0].get("role") == first.get("role"):
+        merged = {**tail[0], "content": f"{first['content']}\n\n{tail[0].get('content', '')}"}
+        return [merged] + tail[1:]
+    return [first] + middle + tail
+
+class SessionService:
+    def __init__(self, store: SessionStore, token_budget: int = 1500):
+        self.store = store
+        self.token_budget = token_budget
+
+    def new_session_id(self) -> str:
+        return uuid.uuid4().hex
+
+    async def load(self, session_id: str) -> list:
+        return list(await self.store.get(session_id) or [])
+
+    async def save(self, session_id: str, history: list):
+        await self.store.set(session_id, history)
+
+    async def end(self, session_id: str):
+        await self.store.delete(session_id)
+
+    def window(self, history: list) -> list:
+        """
+        The slice of history actually sent to the model.
+        """
+        return trim_history(history, self.token_budget)
+
+session_service = SessionService(
+    InMemorySessionStore(ttl=settings.CHAT_SESSION_TTL, max_sessions=settings.CHAT_SESSION_MAX),
+    token_budget=settings.CHAT_HISTORY_TOKEN_BUDGET,
+)
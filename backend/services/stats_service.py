@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import anyio
+
+from config import settings
+from services.write_queue import write_queue
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("status", "category", "priority", "ward", "assignee")
+
+# One document holds every counter, so a dashboard refresh is a single read
+COUNTERS_COLLECTION, COUNTERS_DOC = "stats", "complaints"
+
+def dimension_values(complaint: dict) -> dict:
+    location = complaint.get("location") or {}
+    return {
+        "status": complaint.get("status", "pending"),
+        "category": complaint.get("category", "others"),
+        "priority": complaint.get("priority", "medium"),
+        "ward": location.get("area") or "unknown",
+        "assignee": complaint.get("assignedTo") or "unassigned",
+    }
+
+def _count(query) -> int:
+    return query.count().get()[0][0].value
+
+class StatsService:
+    """
+    Complaint counters by status, category, priority, ward (location.area) and assignee, kept in the
+    stats/complaints document. Every complaint write made through this API queues a set(merge=True)
+    of Increment deltas on the write queue, so all workers share one set of counters.
+    Dashboards read that document (plus a count() of employees) through a snapshot cached for
+    `cache_ttl` seconds; once warm, a stale snapshot is served while a background refresh runs.
+    rebuild() recounts from a full scan, on first start and when an admin asks for it.
+    """
+
+    def __init__(self, cache_ttl: float = 60.0):
+        self.cache_ttl = cache_ttl
+        self.db = None
+        self._snapshot: dict | None = None
+        self._snapshot_at = 0.0
+        self._refresh: asyncio.Task | None = None
+
+    def bind(self, db):
+        self.db = db
+
+    def _counters_ref(self):
+        return self.db.collection(COUNTERS_COLLECTION).document(COUNTERS_DOC)
+
+    async def record_created(self, complaint: dict):
+        await self._record(Counter(), 1, Counter(dimension_values(complaint).items()))
+
+    async def record_registered(self, complaint_id: str, complaint: dict):
+        """
+        Counts a complaint created outside this API, once. The statsCounted flag is written directly
+        rather than queued, so a repeated registration reads it back.
+        """
+        if self.db is None or complaint.get("statsCounted"):
+            return
+        ref = self.db.collection('complaints').document(complaint_id)
+        await anyio.to_thread.run_sync(lambda: ref.update({"statsCounted": True}))
+        await self.record_created(complaint)
+
+    async def record_updated(self, before: dict, after: dict):
+        removed = Counter(dimension_values(before).items())
+        added = Counter(dimension_values(after).items())
+        await self._record(removed, 0, added)
+
+    async def record_deleted(self, complaint: dict):
+        await self._record(Counter(dimension_values(complaint).items()), -1, Counter())
+
+    async def _record(self, removed: Counter, total_delta: int, added: Counter):
+        if self.db is None:
+            return
+        from firebase_admin import firestore
+
+        deltas = Counter(added)
+        deltas.subtract(removed)
+        data = {}
+        for (dim, value), delta in deltas.items():
+            if delta:
+                data.setdefault(dim, {})[value] = firestore.Increment(delta)
+        if total_delta:
+            data["total"] = firestore.Increment(total_delta)
+        if data:
+            await write_queue.enqueue_merge(COUNTERS_COLLECTION, COUNTERS_DOC, data)
+
+    async def snapshot(self) -> dict:
+        """
+        Shape matches the frontend's DashboardStats, plus per-dimension breakdowns.
+        """
+        if self.db is None:
+            return self._build({}, 0)
+        if self._snapshot is not None and time.monotonic() - self._snapshot_at < self.cache_ttl:
+            return self._snapshot
+        if self._refresh is None:
+            self._refresh = asyncio.create_task(self._load())
+        if self._snapshot is None:
+            # Shield so a client disconnecting doesn't cancel the refresh other requests are waiting on
+            return await asyncio.shield(self._refresh)
+        return self._snapshot
+
+    async def _load(self) -> dict:
+        def _read():
+            counters = self._counters_ref().get().to_dict() or {}
+            employees = _count(self.db.collection('users').where('role', '==', 'employee'))
+            return counters, employees
+
+        try:
+            counters, employees = await anyio.to_thread.run_sync(_read)
+            self._snapshot = self._build(counters, employees)
+            self._snapshot_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"Stats refresh failed: {e}")
+            if self._snapshot is None:
+                raise
+        finally:
+            self._refresh = None
+        return self._snapshot
+
+    async def ensure_counters(self):
+        """
+        Builds the counters document on first start; afterwards the write paths keep it current.
+        """
+        if self.db is None:
+            return
+        try:
+            exists = await anyio.to_thread.run_sync(lambda: self._counters_ref().get().exists)
+            if not exists:
+                await self.rebuild()
+        except Exception as e:
+            logger.error(f"Stats counters check failed: {e}")
+
+    async def rebuild(self) -> dict:
+        """
+        Recounts every complaint and overwrites the counters document. Corrects drift from writes
+        made outside this API (the Firebase console, older clients).
+        """
+        def _scan():
+            counts = {dim: Counter() for dim in DIMENSIONS}
+            total = 0
+            fields = ["status", "category", "priority", "location.area", "assignedTo"]
+            for doc in self.db.collection('complaints').select(fields).stream():
+                total += 1
+                for dim, value in dimension_values(doc.to_dict()).items():
+                    counts[dim][value] += 1
+            counters = {"total": total, **{dim: dict(counts[dim]) for dim in DIMENSIONS}}
+            self._counters_ref().set(counters)
+            return counters
+
+        counters = await anyio.to_thread.run_sync(_scan)
+        self._snapshot = None
+        logger.info("Stats counters rebuilt", extra={"complaints": counters["total"]})
+        return counters
+
+    @staticmethod
+    def _build(counters: dict, employees: int) -> dict:
+        status = counters.get("status") or {}
+        return {
+            "totalComplaints": counters.get("total", 0),
+            "pendingComplaints": status.get("pending", 0),
+            "inProgressComplaints": status.get("in_progress", 0),
+            "resolvedComplaints": status.get("resolved", 0),
+            "fieldWorkers": employees,
+            **{
+                f"by{dim.capitalize()}": {k: v for k, v in (counters.get(dim) or {}).items() if v > 0}
+                for dim in DIMENSIONS
+            },
+        }
+
+stats_service = StatsService(cache_ttl=settings.STATS_CACHE_TTL)
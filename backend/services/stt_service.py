@@ -0,0 +1,244 @@
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import anyio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SUPPORTED_LANGUAGES = ("en", "te")
+
+class STTEngine:
+    """
+    Speech-to-text backend. Pooled engines are constructed inside worker processes;
+    load() is where the model weights get read, once per worker.
+    """
+
+    name = "base"
+    pooled = True
+
+    def load(self):
+        pass
+
+    def transcribe_file(self, path: str | None, language: str) -> str:
+        raise NotImplementedError
+
+class MockSTTEngine(STTEngine):
+    name = "mock"
+    pooled = False
+
+    TRANSCRIPTS = {
+        "te": "ఈ రోజు మా వీధిలో డ్రైనేజీ పారుతోంది, దయచేసి బాగు చేయండి.",
+        "en": "There is a severe drainage overflow in our street, please fix it.",
+    }
+
+    def transcribe_file(self, path: str | None, language: str) -> str:
+        logger.warning("Mocking Transcription (STT engine not configured)")
+        return self.TRANSCRIPTS.get(language, self.TRANSCRIPTS["en"])
+
+def iter_audio_chunks(path: str, chunk_seconds: float, sample_rate: int = SAMPLE_RATE):
+    """
+    Decodes any container/codec PyAV understands to 16 kHz mono float32, yielding `chunk_seconds`
+    of samples at a time, so memory is bounded by the chunk rather than the recording length.
+    """
+    import av
+    import numpy as np
+
+    chunk_samples = int(chunk_seconds * sample_rate)
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    pending, pending_samples = [], 0
+
+    def _drain(final: bool):
+        nonlocal pending, pending_samples
+        while pending_samples >= chunk_samples or (final and pending_samples):
+            buffer = np.concatenate(pending)
+            chunk, rest = buffer[:chunk_samples], buffer[chunk_samples:]
+            pending, pending_samples = ([rest] if rest.size else []), rest.size
+            yield chunk.astype(np.float32) / 32768.0
+
+    with av.open(path) as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                samples = resampled.to_ndarray().reshape(-1)
+                pending.append(samples)
+                pending_samples += samples.size
+            yield from _drain(final=False)
+        # Flush whatever the resampler is still buffering
+        for resampled in resampler.resample(None):
+            samples = resampled.to_ndarray().reshape(-1)
+            pending.append(samples)
+            pending_samples += samples.size
+    yield from _drain(final=True)
+
+class FasterWhisperEngine(STTEngine):
+    """
+    Whisper on CPU via CTranslate2 (int8 by default). Each chunk is transcribed on its own,
+    with the previous chunk's text as the prompt so sentences read on across chunk boundaries.
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, compute_type: str, cpu_threads: int, chunk_seconds: float):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.chunk_seconds = chunk_seconds
+        self.model = None
+
+    def load(self):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(self.model_size, device="cpu", compute_type=self.compute_type, cpu_threads=self.cpu_threads)
+
+    def transcribe_file(self, path: str | None, language: str) -> str:
+        texts = []
+        for chunk in iter_audio_chunks(path, self.chunk_seconds):
+            segments, _ = self.model.transcribe(
+                chunk,
+                language=language,
+                beam_size=1,
+                vad_filter=True,
+                condition_on_previous_text=False,
+                initial_prompt=texts[-1] if texts else None,
+            )
+            texts.extend(text for text in (segment.text.strip() for segment in segments) if text)
+        return " ".join(texts)
+
+def build_engine(name: str) -> STTEngine:
+    if name == "faster-whisper":
+        return FasterWhisperEngine(settings.STT_MODEL, settings.STT_COMPUTE_TYPE, settings.STT_CPU_THREADS, settings.STT_CHUNK_SECONDS)
+    if name == "mock":
+        return MockSTTEngine()
+    raise ValueError(f"Unknown STT engine: {name}")
+
+# Per-process engine, set up by the pool initializer
+_worker_engine: STTEngine | None = None
+
+def _init_worker(engine_name: str):
+    global _worker_engine
+    _worker_engine = build_engine(engine_name)
+    _worker_engine.load()
+
+def _warm_worker() -> int:
+    # The initializer has already loaded the model by the time this runs
+    return os.getpid()
+
+def _transcribe_in_worker(path: str, language: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    text = _worker_engine.transcribe_file(path, language)
+    return text, time.perf_counter() - start
+
+class STTService:
+    """
+    Runs transcription in a pool of worker processes so CPU-bound decoding never holds the
+    event loop's GIL. Workers are spawned (not forked) to stay clear of the gRPC/threads state
+    in the API process, and each loads the model once.
+    A worker dying (OOM kill, native crash) breaks the whole pool; it is then replaced and the
+    job retried once.
+    """
+
+    def __init__(self, engine_name: str = "faster-whisper", workers: int = 2):
+        if engine_name == "faster-whisper" and importlib.util.find_spec("faster_whisper") is None:
+            logger.warning("faster-whisper not installed. Running STT in Mock mode.")
+            engine_name = "mock"
+        self.engine_name = engine_name
+        self.engine = build_engine(engine_name)
+        self.workers = workers
+        self.pool: ProcessPoolExecutor | None = None
+        self.counters = {"completed": 0, "failed": 0, "in_flight": 0, "compute_seconds": 0.0, "pool_restarts": 0}
+
+    def startup(self):
+        if self.engine.pooled and self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.engine_name,),
+            )
+
+    async def warm_up(self):
+        """
+        Starts every worker and waits for each to load the model. ProcessPoolExecutor only spawns
+        workers as jobs are submitted, so without this the first requests on each worker would pay
+        for the model load (and download, on a fresh host).
+        """
+        if not self.engine.pooled:
+            return
+        self.startup()
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        # Submitting them together spawns one worker per job: none is idle yet to take a second one
+        pids = await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_worker) for _ in range(self.workers)))
+        logger.info(f"STT warmed up {len(set(pids))} workers in {time.perf_counter() - start:.1f} s")
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor):
+        # Concurrent jobs all see the same broken pool; only the first one replaces it
+        if self.pool is broken:
+            logger.error("STT worker pool broke (a worker died); starting a new one")
+            self.counters["pool_restarts"] += 1
+            self.shutdown()
+            self.startup()
+
+    async def _run_in_pool(self, path: str, language: str) -> tuple[str, float]:
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            return await loop.run_in_executor(pool, _transcribe_in_worker, path, language)
+        except BrokenProcessPool:
+            self._replace_broken_pool(pool)
+        return await loop.run_in_executor(self.pool, _transcribe_in_worker, path, language)
+
+    async def transcribe(self, audio, language: str) -> str:
+        """
+        `audio` is a path or a binary file object. File objects are copied to a temp file
+        first, since worker processes can only be handed a path.
+        """
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language for transcription: {language}")
+        if not self.engine.pooled:
+            return self.engine.transcribe_file(None, language)
+
+        self.startup()
+        path, temp_path = audio, None
+        if not isinstance(audio, (str, os.PathLike)):
+            path = temp_path = await anyio.to_thread.run_sync(self._spool_to_disk, audio)
+
+        self.counters["in_flight"] += 1
+        try:
+            text, compute_seconds = await self._run_in_pool(os.fspath(path), language)
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        finally:
+            self.counters["in_flight"] -= 1
+            if temp_path is not None:
+                os.unlink(temp_path)
+        self.counters["completed"] += 1
+        self.counters["compute_seconds"] += compute_seconds
+        return text
+
+    @staticmethod
+    def _spool_to_disk(file_obj) -> str:
+        with tempfile.NamedTemporaryFile(prefix="civic-audio-", delete=False) as out:
+            shutil.copyfileobj(file_obj, out, 1024 * 1024)
+        return out.name
+
+    def stats(self) -> dict:
+        return {**self.counters, "workers": self.workers if self.engine.pooled else 0}
+
+stt_service = STTService(engine_name=settings.STT_ENGINE, workers=settings.STT_WORKERS)
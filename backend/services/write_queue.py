@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import anyio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+FIRESTORE_BATCH_LIMIT = 500
+
+class WriteQueueFull(Exception):
+    pass
+
+# Firestore errors that fail the same way on every attempt (e.g. update() of a missing document)
+_PERMANENT_ERRORS = ("NotFound", "InvalidArgument", "FailedPrecondition", "PermissionDenied", "AlreadyExists", "OutOfRange")
+
+def _is_permanent(e: Exception) -> bool:
+    return isinstance(e, (ValueError, TypeError)) or type(e).__name__ in _PERMANENT_ERRORS
+
+def _encode_field(value):
+    # Field transforms (SERVER_TIMESTAMP, Increment, ArrayUnion) aren't JSON; record what they would have done
+    if isinstance(value, datetime):
+        return value.isoformat()
+    for attr in ("values", "value"):
+        if hasattr(value, attr):
+            return {"$transform": type(value).__name__, attr: getattr(value, attr)}
+    return {"$transform": type(value).__name__}
+
+class DeadLetterLog:
+    """
+    Writes that still failed after retrying on their own, appended as JSON lines to path so they can be
+    inspected and replayed. With no path the most recent `keep` records are held in memory only.
+    """
+
+    def __init__(self, path: str = "", keep: int = 1000):
+        self.path = path
+        self.records: deque[dict] = deque(maxlen=keep)
+
+    def _append(self, lines: list[str]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def add(self, items: list, error: Exception):
+        failed_at = datetime.now(timezone.utc).isoformat()
+        records = [
+            {
+                "op": op,
+                "path": doc_ref.path,
+                "data": data,
+                "error": f"{type(error).__name__}: {error}",
+                "failedAt": failed_at,
+            }
+            for op, doc_ref, data in items
+        ]
+        self.records.extend(records)
+        if self.path:
+            lines = [json.dumps(r, default=_encode_field, ensure_ascii=False) + "\n" for r in records]
+            await anyio.to_thread.run_sync(self._append, lines)
+
+class FirestoreWriteQueue:
+    """
+    Write-behind queue for Firestore documents.
+    IDs are assigned locally at enqueue time; a background task commits queued writes in batches
+    of up to 500 once the batch is full or flush_interval has passed since its first write.
+    A batch is all-or-nothing, so when one fails for good its writes are replayed one at a time and
+    only the ones that still fail go to the dead-letter log.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = FIRESTORE_BATCH_LIMIT,
+        flush_interval: float = 0.5,
+        max_queue: int = 5000,
+        put_timeout: float = 2.0,
+        max_retries: int = 3,
+        dead_letters: DeadLetterLog | None = None,
+    ):
+        self.max_batch = min(max_batch, FIRESTORE_BATCH_LIMIT)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.dead_letters = dead_letters or DeadLetterLog()
+        self.db = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.counters = {"enqueued": 0, "written": 0, "batches": 0, "retries": 0, "split_batches": 0, "dead_lettered": 0}
+
+    def start(self, db):
+        self.db = db
+        if db is None or self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Drains everything still queued, then stops the flusher.
+        """
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def enqueue(self, collection: str, data: dict) -> str:
+        """
+        Assigns a document ID and queues the write. Raises WriteQueueFull if no slot frees up within put_timeout.
+        """
+        if self._task is None:
+            raise RuntimeError("FirestoreWriteQueue is not started")
+
+        # document() with no argument generates the auto-ID client-side, no round trip
+        doc_ref = self.db.collection(collection).document()
+        await self._put(("set", doc_ref, data))
+        return doc_ref.id
+
+    async def enqueue_update(self, collection: str, doc_id: str, data: dict):
+        """
+        Queues a partial update (field transforms like Increment/ArrayUnion are allowed).
+        """
+        if self._task is None:
+            raise RuntimeError("FirestoreWriteQueue is not started")
+        await self._put(("update", self.db.collection(collection).document(doc_id), data))
+
+    async def enqueue_merge(self, collection: str, doc_id: str, data: dict):
+        """
+        Queues set(merge=True): nested maps are merged key by key and the document is created if missing.
+        Map keys are taken literally, unlike update() field paths, so they may contain dots.
+        """
+        if self._task is None:
+            raise RuntimeError("FirestoreWriteQueue is not started")
+        await self._put(("merge", self.db.collection(collection).document(doc_id), data))
+
+    async def enqueue_delete(self, collection: str, doc_id: str):
+        if self._task is None:
+            raise RuntimeError("FirestoreWriteQueue is not started")
+        await self._put(("delete", self.db.collection(collection).document(doc_id), None))
+
+    async def _put(self, item: tuple):
+        try:
+            await asyncio.wait_for(self._queue.put(item), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            raise WriteQueueFull(f"Write queue full ({self.max_queue} pending)")
+        self.counters["enqueued"] += 1
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._commit(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _commit(self, items: list):
+        error = await self._commit_with_retries(items)
+        if error is None:
+            return
+        if len(items) > 1 and _is_permanent(error):
+            # One bad write fails the whole batch; find it by committing the rest individually
+            self.counters["split_batches"] += 1
+            logger.warning(f"Firestore batch of {len(items)} rejected ({error}); retrying writes individually")
+            for index, item in enumerate(items):
+                error = await self._commit_with_retries([item])
+                if error is None:
+                    continue
+                if _is_permanent(error):
+                    await self._dead_letter([item], error)
+                else:
+                    # Firestore itself is failing now; don't spend retries on every remaining write
+                    await self._dead_letter(items[index:], error)
+                    return
+            return
+        await self._dead_letter(items, error)
+
+    async def _commit_with_retries(self, items: list) -> Exception | None:
+        """
+        Commits items as one batch. Returns None on success, otherwise the last error once retries
+        are exhausted (permanent errors are not retried).
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                write_batch = self.db.batch()
+                for op, doc_ref, data in items:
+                    if op == "update":
+                        write_batch.update(doc_ref, data)
+                    elif op == "merge":
+                        write_batch.set(doc_ref, data, merge=True)
+                    elif op == "delete":
+                        write_batch.delete(doc_ref)
+                    else:
+                        write_batch.set(doc_ref, data)
+                # commit() is a blocking RPC; keep it off the event loop
+                await anyio.to_thread.run_sync(write_batch.commit)
+                self.counters["written"] += len(items)
+                self.counters["batches"] += 1
+                return None
+            except Exception as e:
+                if attempt == self.max_retries or _is_permanent(e):
+                    return e
+                self.counters["retries"] += 1
+                await asyncio.sleep(min(0.2 * 2 ** attempt, 5.0) * random.uniform(0.5, 1.5))
+
+    async def _dead_letter(self, items: list, error: Exception):
+        self.counters["dead_lettered"] += len(items)
+        logger.error(f"{len(items)} Firestore write(s) failed and were dead-lettered: {error}")
+        try:
+            await self.dead_letters.add(items, error)
+        except Exception as e:
+            logger.error(f"Could not record dead-lettered writes: {e}")
+
+    def stats(self) -> dict:
+        return {**self.counters, "depth": self.depth()}
+
+write_queue = FirestoreWriteQueue(
+    max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+    flush_interval=settings.WRITE_QUEUE_FLUSH_INTERVAL,
+    max_queue=settings.WRITE_QUEUE_MAX_SIZE,
+    put_timeout=settings.WRITE_QUEUE_PUT_TIMEOUT,
+    max_retries=settings.WRITE_QUEUE_MAX_RETRIES,
+    dead_letters=DeadLetterLog(settings.WRITE_QUEUE_DEAD_LETTER_PATH),
+)
@@ -0,0 +1,9 @@
+"""
+Run from backend/:  python -m pytest tests
+"""
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
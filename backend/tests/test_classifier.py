@@ -0,0 +1,140 @@
+"""
+Local complaint classifier: features, training only on trusted labels, agreement with the LLM labels in
+fixtures/complaints_labeled.jsonl, model files and LocalClassifierService's escalation thresholds.
+"""
+import json
+import pathlib
+import random
+
+import pytest
+
+from services.classifier import (
+    MODEL_VERSION, ComplaintClassifier, LocalClassifierService, complaint_texts, summarize, tokenize
+)
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "complaints_labeled.jsonl"
+
+
+def load_labelled() -> list[dict]:
+    with open(FIXTURE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def service() -> LocalClassifierService:
+    # No model file: the keyword seeds alone
+    return LocalClassifierService("", threshold=0.5, priority_threshold=0.0)
+
+
+def test_tokenize_stems_english_and_splits_telugu_into_trigrams():
+    features = tokenize("Potholes near the bus stop")
+    assert {"w:pothole", "w:bus", "w:stop", "b:pothole_bus", "b:bus_stop"} <= features
+    assert "w:the" not in features
+
+    assert {"t:చెత్త", "c:<చె", "c:త్త"} <= tokenize("చెత్త")
+
+
+def test_complaint_texts_uses_translation_only_when_it_differs():
+    same = {"metadata": {"transcriptOriginal": "no water", "transcriptEnglish": "no water"}}
+    translated = {"metadata": {"transcriptOriginal": "నీటి సరఫరా లేదు", "transcriptEnglish": "no water supply"}}
+    assert complaint_texts(same) == ["no water"]
+    assert complaint_texts(translated) == ["నీటి సరఫరా లేదు", "no water supply"]
+    assert complaint_texts({"description": "   "}) == []
+
+
+@pytest.mark.parametrize("source", ["local", "fallback"])
+def test_training_skips_labels_the_llm_did_not_make(source):
+    text = "street light not working dark at night"
+    # Enough mislabelled copies to flip the prediction if they were learned from
+    untrusted = [{"category": "garbage", "priority": "low", "description": text, "metadata": {"classifiedBy": source}}] * 50
+    trusted = [{"category": "streetlight", "priority": "high", "description": text, "metadata": {"classifiedBy": "llm"}}]
+
+    classifier = ComplaintClassifier.train(untrusted + trusted)
+
+    assert classifier.trained_on == 1
+    assert classifier.classify(text)["category"] == "streetlight"
+
+
+def test_cross_validated_agreement_with_llm_labels():
+    records = load_labelled()
+    random.Random(7).shuffle(records)
+    agree = 0
+    for fold in range(5):
+        train = [r for i, r in enumerate(records) if i % 5 != fold]
+        classifier = ComplaintClassifier.train(train)
+        for record in records[fold::5]:
+            text = record["metadata"].get("transcriptEnglish") or record.get("description", "")
+            agree += classifier.classify(text)["category"] == record["category"]
+
+    assert agree / len(records) >= 0.7
+
+
+def test_unknown_text_falls_back_to_defaults():
+    result = ComplaintClassifier.train([]).classify("zzz qqq")
+    assert result == {"category": "others", "confidence": 0.0, "priority": "medium", "priority_confidence": 0.0}
+
+
+def test_saved_model_round_trips(tmp_path):
+    path = tmp_path / "classifier.json"
+    classifier = ComplaintClassifier.train(load_labelled())
+    classifier.save(str(path))
+
+    loaded = ComplaintClassifier.load(str(path))
+
+    text = "garbage not collected for a week near the school"
+    assert loaded.trained_on == classifier.trained_on
+    assert loaded.classify(text) == classifier.classify(text)
+
+
+def test_model_file_from_another_version_is_refused(tmp_path):
+    path = tmp_path / "classifier.json"
+    path.write_text(json.dumps({"version": MODEL_VERSION + 1}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        ComplaintClassifier.load(str(path))
+
+
+def test_unreadable_model_file_falls_back_to_seeds(tmp_path):
+    path = tmp_path / "classifier.json"
+    path.write_text("not json", encoding="utf-8")
+    service = LocalClassifierService(str(path))
+    assert service.provider.get().trained_on == 0
+
+
+def test_confident_prediction_is_returned_in_extraction_shape(service):
+    text = "Garbage not collected. The dustbin is overflowing."
+    result = service.try_classify(text, "Ward 4")
+
+    assert result["category"] == "garbage"
+    assert result["summary"] == "Garbage not collected."
+    assert result["location_details"] == "Ward 4"
+    assert result["source"] == "local"
+    assert service.stats() == {"local": 1, "escalated": 0}
+
+
+def test_low_confidence_escalates(service):
+    service.threshold = 1.01
+    assert service.try_classify("pothole on the road") is None
+    assert service.stats() == {"local": 0, "escalated": 1}
+
+
+def test_low_priority_confidence_escalates(service):
+    service.priority_threshold = 1.01
+    assert service.try_classify("pothole on the road") is None
+    assert service.counters["escalated"] == 1
+
+
+@pytest.mark.parametrize("text", ["", "   ", None])
+def test_blank_text_is_not_classified(service, text):
+    assert service.try_classify(text) is None
+    assert service.stats() == {"local": 0, "escalated": 0}
+
+
+def test_disabled_service_never_classifies(service):
+    service.enabled = False
+    assert service.try_classify("pothole on the road") is None
+
+
+def test_summarize_cuts_long_first_sentences_at_a_word():
+    assert summarize("Short one. Second sentence.") == "Short one."
+    summary = summarize("word " * 60, max_chars=30)
+    assert summary.endswith("...") and len(summary) <= 33
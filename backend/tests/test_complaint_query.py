@@ -0,0 +1,113 @@
+"""
+GET /api/v1/complaints against the in-memory read model: caller checks, cursor validation and paging.
+"""
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+import main
+from benchmarks.fake_firestore import FakeFirestore
+from services.auth_service import AuthService
+from services.complaint_query import ComplaintQueryService, InMemoryComplaintStore
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+ROLES = {"citizen-1": "citizen", "citizen-2": "citizen", "employee-1": "employee", "admin-1": "admin"}
+
+
+@pytest.fixture
+def store(monkeypatch) -> InMemoryComplaintStore:
+    store = InMemoryComplaintStore()
+    for i in range(25):
+        store.add(f"c{i:02d}", {
+            "userId": "citizen-1" if i % 2 else "citizen-2",
+            "assignedTo": "employee-1" if i % 5 == 0 else None,
+            "status": "pending",
+            "createdAt": START + timedelta(minutes=i),
+        })
+    monkeypatch.setattr(main, "complaint_query_service", ComplaintQueryService(store))
+
+    firestore = FakeFirestore()
+    firestore.documents["users"] = {uid: {"role": role} for uid, role in ROLES.items()}
+    # The bearer token is the uid; there is no Firebase project to verify against
+    auth = AuthService(verifier=lambda token: {"uid": token})
+    auth.bind(firestore)
+    monkeypatch.setattr(main, "auth_service", auth)
+    return store
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://api") as client:
+        yield client
+
+
+async def list_as(client: httpx.AsyncClient, uid: str | None, **params) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {uid}"} if uid else {}
+    return await client.get("/api/v1/complaints", params=params, headers=headers)
+
+
+async def test_missing_token_is_unauthorized(store, client):
+    response = await list_as(client, None)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+async def test_citizen_sees_only_own_complaints(store, client):
+    response = await list_as(client, "citizen-1", limit=50)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 12
+    assert {item["userId"] for item in items} == {"citizen-1"}
+
+
+async def test_citizen_cannot_list_other_users(store, client):
+    assert (await list_as(client, "citizen-1", userId="citizen-2")).status_code == 403
+    assert (await list_as(client, "citizen-1", assignedTo="employee-1")).status_code == 403
+
+
+async def test_staff_can_filter_by_user_and_assignee(store, client):
+    response = await list_as(client, "admin-1", userId="citizen-2", limit=50)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 13
+
+    response = await list_as(client, "employee-1", assignedTo="employee-1")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == ["c20", "c15", "c10", "c05", "c00"]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bm90LWpzb24", "WyJ4Il0"])
+async def test_malformed_cursor_is_rejected(store, client, cursor):
+    response = await list_as(client, "admin-1", cursor=cursor)
+    assert response.status_code == 400
+
+
+async def test_conflicting_filters_are_rejected(store, client):
+    response = await list_as(client, "admin-1", userId="citizen-1", assignedTo="employee-1")
+    assert response.status_code == 400
+
+
+async def test_cursor_pages_cover_everything_once_newest_first(store, client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await list_as(client, "admin-1", **params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"c{i:02d}" for i in reversed(range(25))]
+
+
+async def test_cursor_skips_complaints_added_above_it(store, client):
+    first = (await list_as(client, "admin-1", limit=5)).json()
+    # A newer complaint arriving between pages must not shift the next page
+    store.add("late", {"userId": "citizen-1", "status": "pending", "createdAt": START + timedelta(days=1)})
+    second = (await list_as(client, "admin-1", limit=5, cursor=first["nextCursor"])).json()
+
+    assert [item["id"] for item in second["items"]] == ["c19", "c18", "c17", "c16", "c15"]
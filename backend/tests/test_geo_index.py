@@ -0,0 +1,111 @@
+"""
+GeoDuplicateIndex: radius matching across grid cells (including at high latitude), the time window,
+catch-all categories, sweeping and the Firestore warm-load.
+"""
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.fake_firestore import FakeFirestore
+from services.geo_index import METERS_PER_DEGREE, GeoDuplicateIndex
+
+pytestmark = pytest.mark.anyio
+
+NOW = 1_800_000_000.0
+HOUR = 3600.0
+
+
+def offset(lat: float, lng: float, north_m: float = 0.0, east_m: float = 0.0) -> tuple[float, float]:
+    return (
+        lat + north_m / METERS_PER_DEGREE,
+        lng + east_m / (METERS_PER_DEGREE * math.cos(math.radians(lat))),
+    )
+
+
+@pytest.fixture
+def index() -> GeoDuplicateIndex:
+    index = GeoDuplicateIndex(radius_m=150, window_hours=72)
+    # Keep add() from sweeping on its own, so tests control when it happens
+    index.sweep_interval = math.inf
+    return index
+
+
+@pytest.mark.parametrize("lat", [12.97, -33.9, 65.0, 78.2])
+def test_neighbours_within_radius_match_in_every_direction(index, lat):
+    lng = 77.59
+    for i, (north, east) in enumerate([(140, 0), (-140, 0), (0, 140), (0, -140), (95, 95)]):
+        index.add(f"near-{i}", *offset(lat, lng, north, east), "roads", created_ts=NOW)
+    index.add("far", *offset(lat, lng, 0, 170), "roads", created_ts=NOW)
+
+    matches = index.find_duplicates(lat, lng, "roads", now=NOW)
+
+    assert {m["id"] for m in matches} == {f"near-{i}" for i in range(5)}
+    assert all(m["distance_m"] <= 150 for m in matches)
+
+
+def test_matches_are_nearest_first_and_same_category_only(index):
+    index.add("sixty", *offset(12.97, 77.59, 60), "roads", created_ts=NOW)
+    index.add("twenty", *offset(12.97, 77.59, 20), "roads", created_ts=NOW)
+    index.add("water", *offset(12.97, 77.59, 10), "water", created_ts=NOW)
+
+    matches = index.find_duplicates(12.97, 77.59, "roads", now=NOW)
+
+    assert [m["id"] for m in matches] == ["twenty", "sixty"]
+
+
+def test_catch_all_category_is_neither_indexed_nor_matched(index):
+    index.add("misc", 12.97, 77.59, "others", created_ts=NOW)
+
+    assert "misc" not in index
+    assert index.size == 0
+    assert index.find_duplicates(12.97, 77.59, "others", now=NOW) == []
+
+
+def test_search_prunes_expired_complaints(index):
+    index.add("old", 12.97, 77.59, "roads", created_ts=NOW - 73 * HOUR)
+    index.add("recent", 12.97, 77.59, "roads", created_ts=NOW - HOUR)
+
+    assert [m["id"] for m in index.find_duplicates(12.97, 77.59, "roads", now=NOW)] == ["recent"]
+    assert "old" not in index
+    assert index.size == 1
+
+
+def test_out_of_order_expired_entry_is_skipped_then_swept(index):
+    index.add("recent", 12.97, 77.59, "roads", created_ts=NOW - HOUR)
+    # Registered late: older than the window but behind a live entry, so pruning stops before it
+    index.add("late", 12.97, 77.59, "roads", created_ts=NOW - 80 * HOUR)
+
+    assert [m["id"] for m in index.find_duplicates(12.97, 77.59, "roads", now=NOW)] == ["recent"]
+    assert "late" in index
+
+    index.sweep(NOW)
+
+    assert "late" not in index
+    assert index.size == 1
+
+
+def test_add_sweeps_cells_nobody_searches(index):
+    index.sweep_interval = 0
+    index.add("stale", 12.97, 77.59, "roads", created_ts=0.0)
+    index.add("other-area", 28.61, 77.21, "roads")
+
+    assert "stale" not in index
+    assert index.stats() == {"size": 1, "cells": 1}
+
+
+async def test_warm_load_reads_complaints_inside_the_window(index):
+    now = datetime.now(timezone.utc)
+    db = FakeFirestore()
+    db.documents["complaints"] = {
+        "a": {"category": "roads", "createdAt": now - timedelta(hours=2), "location": {"latitude": 12.97, "longitude": 77.59}},
+        "b": {"category": "roads", "createdAt": now - timedelta(hours=100), "location": {"latitude": 12.97, "longitude": 77.59}},
+        "c": {"category": "roads", "createdAt": now - timedelta(hours=1), "location": {"area": "Ward 4"}},
+    }
+
+    await index.warm_load(db)
+
+    assert "a" in index
+    assert "b" not in index
+    assert "c" not in index
+    assert index.size == 1
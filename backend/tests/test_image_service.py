@@ -0,0 +1,85 @@
+"""
+ImageService.preprocess: downscaling, EXIF orientation and falling back to the original upload.
+"""
+import io
+import random
+
+import pytest
+from PIL import Image
+
+from services.image_service import ImageService
+from services.ingest_service import SpooledUpload
+
+pytestmark = pytest.mark.anyio
+
+
+def photo(width: int, height: int, orientation: int | None = None) -> bytes:
+    # Noise compresses badly, like a real camera frame, so downscaling always pays off
+    rng = random.Random(width * height)
+    img = Image.frombytes("RGB", (width, height), bytes(rng.getrandbits(8) for _ in range(width * height * 3)))
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=95, exif=exif.tobytes())
+    return out.getvalue()
+
+
+def size_of(contents: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(contents)) as img:
+        return img.size
+
+
+@pytest.fixture
+def service() -> ImageService:
+    service = ImageService()
+    service.max_side = 256
+    service.format = "JPEG"
+    return service
+
+
+async def test_large_photo_is_downscaled_to_max_side(service):
+    original = photo(800, 600)
+    processed, mime_type = await service.preprocess(original, "image/jpeg")
+
+    assert mime_type == "image/jpeg"
+    assert size_of(processed) == (256, 192)
+    assert len(processed) < len(original)
+
+
+async def test_exif_orientation_is_applied(service):
+    # Orientation 6: stored landscape, displayed rotated 90 degrees clockwise
+    processed, _ = await service.preprocess(photo(800, 400, orientation=6), "image/jpeg")
+    assert size_of(processed) == (128, 256)
+
+
+async def test_webp_output(service):
+    service.format = "WEBP"
+    processed, mime_type = await service.preprocess(photo(800, 600), "image/jpeg")
+    assert mime_type == "image/webp"
+    assert processed[8:12] == b"WEBP"
+
+
+async def test_undecodable_upload_is_passed_through(service):
+    assert await service.preprocess(b"not an image", "image/png") == (b"not an image", "image/png")
+
+
+async def test_original_is_kept_when_reencoding_does_not_shrink_it(service):
+    # A flat-colour PNG is a few dozen bytes; the JPEG headers alone are larger
+    out = io.BytesIO()
+    Image.new("RGB", (32, 32), "gray").save(out, format="PNG")
+    original = out.getvalue()
+    assert await service.preprocess(original, "image/png") == (original, "image/png")
+
+
+async def test_disk_spooled_upload_is_decoded_from_the_file(service, tmp_path):
+    path = tmp_path / "upload.jpg"
+    path.write_bytes(photo(800, 600))
+    upload = SpooledUpload.from_path(str(path), "upload.jpg", "image/jpeg")
+    try:
+        processed, mime_type = await service.preprocess_upload(upload)
+    finally:
+        upload.close()
+
+    assert mime_type == "image/jpeg"
+    assert size_of(processed) == (256, 192)
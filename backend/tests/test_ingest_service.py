@@ -0,0 +1,129 @@
+"""
+SpooledUpload (memory vs disk spooling, size cap, digest) and the audio checks run before any storage
+or transcription work.
+"""
+import hashlib
+import io
+import os
+import tempfile
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from benchmarks.synthetic_audio import wav_recording
+from services.ingest_service import (
+    CHUNK_SIZE, HEAD_SIZE, InvalidAudio, SpooledUpload, UploadTooLarge, sniff_audio_format, validate_audio
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def multipart(body: bytes, content_type: str = "audio/wav") -> UploadFile:
+    return UploadFile(file=io.BytesIO(body), filename="recording.wav", headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+async def test_small_upload_stays_in_memory(spool_dir):
+    body = wav_recording(10_000, seed=1)
+    upload = await SpooledUpload.receive(multipart(body), spool_threshold=CHUNK_SIZE)
+
+    assert not upload.on_disk
+    assert list(spool_dir.iterdir()) == []
+    assert (upload.size, upload.head) == (len(body), body[:HEAD_SIZE])
+    assert upload.content_type == "audio/wav"
+    assert await upload.read_bytes() == body
+
+
+async def test_large_upload_is_spooled_to_disk_and_deleted_on_close(spool_dir):
+    body = wav_recording(3 * CHUNK_SIZE + 123, seed=2)
+    upload = await SpooledUpload.receive(multipart(body), spool_threshold=CHUNK_SIZE)
+
+    assert upload.on_disk
+    assert os.path.dirname(upload.path) == str(spool_dir)
+    assert await upload.read_bytes() == body
+    assert upload.head == body[:HEAD_SIZE]
+
+    upload.close()
+    assert list(spool_dir.iterdir()) == []
+
+
+async def test_readers_are_independent():
+    upload = await SpooledUpload.receive(multipart(b"0123456789"))
+    with upload.reader() as first, upload.reader() as second:
+        assert first.read(4) == b"0123"
+        assert second.read() == b"0123456789"
+
+
+@pytest.mark.parametrize("spool_threshold", [0, 10 * CHUNK_SIZE])
+async def test_digest_is_sha256_of_the_body(spool_threshold):
+    body = wav_recording(2 * CHUNK_SIZE, seed=3)
+    upload = await SpooledUpload.receive(multipart(body), spool_threshold=spool_threshold)
+    try:
+        assert upload.digest == hashlib.sha256(body).hexdigest()
+    finally:
+        upload.close()
+
+
+async def test_oversized_upload_is_rejected_and_spool_removed(spool_dir):
+    body = wav_recording(3 * CHUNK_SIZE, seed=4)
+    with pytest.raises(UploadTooLarge):
+        await SpooledUpload.receive(multipart(body), spool_threshold=0, max_bytes=2 * CHUNK_SIZE)
+    assert list(spool_dir.iterdir()) == []
+
+
+async def test_from_path_takes_ownership_of_the_file(tmp_path):
+    path = tmp_path / "queued.wav"
+    body = wav_recording(5_000, seed=5)
+    path.write_bytes(body)
+
+    upload = SpooledUpload.from_path(str(path), "queued.wav", "audio/wav")
+
+    assert (upload.size, upload.head, upload.digest) == (len(body), body[:HEAD_SIZE], None)
+    upload.close()
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("head,expected", [
+    (b"\x1aE\xdf\xa3\x01\x00", "webm"),
+    (b"OggS\x00\x02", "ogg"),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+    (b"RIFF\x24\x00\x00\x00AVI LIST", None),
+    (b"fLaC\x00\x00", "flac"),
+    (b"\x00\x00\x00\x20ftypM4A ", "mp4"),
+    (b"#!AMR\n", "amr"),
+    (b"ID3\x04\x00", "mpeg"),
+    (b"\xff\xf1\x50\x80", "mpeg"),
+    (b"%PDF-1.7", None),
+    (b"", None),
+])
+def test_sniff_audio_format(head, expected):
+    assert sniff_audio_format(head) == expected
+
+
+async def test_wav_duration_is_read_from_the_header():
+    # 32 KB per second of 16 kHz mono 16-bit audio
+    upload = await SpooledUpload.receive(multipart(wav_recording(32_000 * 3 + 44, seed=6)))
+    assert await validate_audio(upload, max_seconds=60) == {"format": "wav", "duration": 3.0}
+
+
+async def test_recording_over_the_length_limit_is_too_large():
+    upload = await SpooledUpload.receive(multipart(wav_recording(32_000 * 3 + 44, seed=7)))
+    with pytest.raises(UploadTooLarge):
+        await validate_audio(upload, max_seconds=2)
+
+
+@pytest.mark.parametrize("body", [
+    b"",
+    b"definitely not audio",
+    b"RIFF\x24\x00\x00\x00WAVEjunkjunkjunk",
+])
+async def test_empty_unknown_or_corrupt_audio_is_invalid(body):
+    upload = await SpooledUpload.receive(multipart(body))
+    with pytest.raises(InvalidAudio):
+        await validate_audio(upload, max_seconds=60)
@@ -0,0 +1,106 @@
+"""
+JobQueue on the in-memory backend: status transitions, counters, a full queue and result expiry.
+"""
+import asyncio
+
+import pytest
+
+from services.job_queue import InMemoryJobBackend, JobQueue, JobQueueFull
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for_status(queue: JobQueue, job_id: str, *statuses: str) -> dict:
+    for _ in range(200):
+        status = await queue.status(job_id)
+        if status and status["status"] in statuses:
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+
+async def double(payload: dict) -> dict:
+    return {"value": payload["value"] * 2}
+
+
+async def explode(payload: dict) -> dict:
+    raise RuntimeError("handler failed")
+
+
+async def test_job_runs_to_success_and_records_result():
+    queue = JobQueue(InMemoryJobBackend(), workers=2)
+    queue.register("double", double)
+    queue.start()
+    try:
+        job_id = await queue.submit("double", {"value": 21})
+        status = await wait_for_status(queue, job_id, "succeeded", "failed")
+    finally:
+        await queue.stop()
+
+    assert status["status"] == "succeeded"
+    assert status["result"] == {"value": 42}
+    assert status["startedAt"] <= status["finishedAt"]
+    assert queue.counters["enqueued"] == 1
+    assert queue.counters["succeeded"] == 1
+    assert queue.counters["running"] == 0
+
+
+async def test_handler_error_marks_job_failed_and_worker_survives():
+    queue = JobQueue(InMemoryJobBackend(), workers=1)
+    queue.register("explode", explode)
+    queue.register("double", double)
+    queue.start()
+    try:
+        failed = await wait_for_status(queue, await queue.submit("explode", {}), "succeeded", "failed")
+        succeeded = await wait_for_status(queue, await queue.submit("double", {"value": 1}), "succeeded", "failed")
+    finally:
+        await queue.stop()
+
+    assert failed["status"] == "failed"
+    assert failed["error"] == "handler failed"
+    assert succeeded["status"] == "succeeded"
+    assert queue.counters["failed"] == 1
+    assert queue.counters["succeeded"] == 1
+
+
+async def test_job_waits_queued_until_workers_start():
+    queue = JobQueue(InMemoryJobBackend(), workers=1)
+    queue.register("double", double)
+    job_id = await queue.submit("double", {"value": 2})
+
+    assert (await queue.status(job_id))["status"] == "queued"
+    assert queue.stats()["depth"] == 1
+
+    queue.start()
+    try:
+        status = await wait_for_status(queue, job_id, "succeeded", "failed")
+    finally:
+        await queue.stop()
+    assert status["waitSeconds"] >= 0
+    assert queue.stats()["depth"] == 0
+
+
+async def test_full_queue_rejects_and_marks_job_failed():
+    backend = InMemoryJobBackend(max_size=1)
+    queue = JobQueue(backend, workers=1)
+    await queue.submit("double", {"value": 1})
+
+    with pytest.raises(JobQueueFull):
+        await queue.submit("double", {"value": 2})
+
+    statuses = [entry[1] for entry in backend._statuses.values()]
+    assert [status["status"] for status in statuses] == ["queued", "failed"]
+    assert queue.counters["enqueued"] == 1
+
+
+async def test_statuses_expire_after_result_ttl():
+    backend = InMemoryJobBackend(result_ttl=0.05)
+    await backend.set_status("old", {"status": "succeeded"})
+    assert await backend.get_status("old") == {"status": "succeeded"}
+
+    await asyncio.sleep(0.1)
+    await backend.set_status("new", {"status": "queued"})
+
+    assert await backend.get_status("old") is None
+    # Expired entries are pruned on the next write, not just hidden
+    assert list(backend._statuses) == ["new"]
@@ -0,0 +1,119 @@
+"""
+parse_model over the captured model outputs in fixtures/llm_outputs.jsonl (append real captures there
+as they turn up), plus a seeded fuzz pass over mutated copies of them: the parser may only ever raise
+OutputParseError, and mutations that keep the JSON intact (fences, chatter, whitespace) must not change
+the result.
+"""
+import json
+import pathlib
+import random
+
+import pytest
+
+from services.output_parser import (
+    CATEGORIES, ConversationResult, ExtractionResult, ImageAnalysisResult, OutputParseError,
+    TranslateExtractResult, iter_json_objects, parse_model
+)
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures" / "llm_outputs.jsonl"
+MODELS = {
+    "extraction": ExtractionResult,
+    "translate_extract": TranslateExtractResult,
+    "image": ImageAnalysisResult,
+    "conversation": ConversationResult,
+}
+
+
+def load_fixtures() -> list[tuple[str, str]]:
+    with open(FIXTURES, encoding="utf-8") as f:
+        return [(row["kind"], row["output"]) for row in map(json.loads, f) if row]
+
+
+OUTPUTS = load_fixtures()
+
+
+def reindent(output: str) -> str:
+    # Re-serializes a bare JSON object with different whitespace; anything else is left as is
+    try:
+        return json.dumps(json.loads(output), indent=4, ensure_ascii=False)
+    except json.JSONDecodeError:
+        return output
+
+
+# Mutations that keep the JSON object intact; the parse result must not change
+PRESERVING = [
+    lambda s, r: f"```json\n{s}\n```",
+    lambda s, r: f"Here is the JSON you asked for:\n{s}\nLet me know if anything is missing.",
+    lambda s, r: f"{s} {{\"unrelated\": true}}",
+    lambda s, r: reindent(s),
+]
+# Mutations that damage the output; any result is acceptable as long as only OutputParseError escapes
+DAMAGING = [
+    lambda s, r: s[: r.randint(0, len(s))],
+    lambda s, r: s.replace('"', "'"),
+    lambda s, r: s.replace("}", ",}"),
+    lambda s, r: s.replace('"', "", 2),
+    lambda s, r: "".join(c for c in s if r.random() > 0.02),
+    lambda s, r: s + r.choice(["}", "]", "\"", "```", "{"]),
+    lambda s, r: s.replace("{", "{{", 1),
+]
+
+
+def try_parse(output: str, kind: str) -> dict | None:
+    try:
+        return parse_model(output, MODELS[kind])
+    except OutputParseError:
+        return None
+
+
+@pytest.mark.parametrize("kind,output", OUTPUTS)
+def test_captured_output_parses_unless_it_has_no_json(kind, output):
+    if "{" not in output:
+        with pytest.raises(OutputParseError):
+            parse_model(output, MODELS[kind])
+        return
+    result = parse_model(output, MODELS[kind])
+    assert result["category"] in CATEGORIES
+
+
+def test_aliases_and_casing_are_normalized():
+    result = parse_model('{category: "Street Light", summary: "Pole down", priority: "URGENT"}', ExtractionResult)
+    assert result == {"category": "streetlight", "priority": "critical", "summary": "Pole down", "location_details": ""}
+
+
+def test_unknown_category_is_routed_to_others():
+    result = parse_model('{"category": "parks", "title": "Broken swing"}', ImageAnalysisResult)
+    assert result["category"] == "others"
+
+
+def test_braces_inside_strings_and_trailing_chatter():
+    output = '{"category": "road", "summary": "Road caved in {2m}", "priority": "high"} Note: {see above}'
+    assert parse_model(output, ExtractionResult)["summary"] == "Road caved in {2m}"
+
+
+def test_truncated_output_is_closed():
+    result = parse_model('```json\n{"category": "water", "title": "Leak", "description": "Pipe bur', ConversationResult)
+    assert result["category"] == "water"
+    assert result["description"] == "Pipe bur"
+
+
+@pytest.mark.parametrize("output", ["", None, "[1, 2]", '{"summary": "no category"}'])
+def test_unusable_output_raises_parse_error(output):
+    with pytest.raises(OutputParseError):
+        parse_model(output, ExtractionResult)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fuzzed_outputs_only_raise_parse_errors(seed):
+    rng = random.Random(seed)
+    # Truncated outputs legitimately change meaning when text is appended, so they only get the damage checks
+    complete = [(kind, output) for kind, output in OUTPUTS if next(iter_json_objects(output), None) is not None]
+    for _ in range(200):
+        kind, output = rng.choice(OUTPUTS)
+        preserving = (kind, output) in complete and rng.random() < 0.4
+        mutated = rng.choice(PRESERVING if preserving else DAMAGING)(output, rng)
+
+        result = try_parse(mutated, kind)
+
+        if preserving and (baseline := try_parse(output, kind)) is not None:
+            assert result == baseline, mutated
@@ -0,0 +1,134 @@
+"""
+Token buckets, admission control and how the rate-limit key is chosen (trusted proxies, verified uids).
+"""
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+import main
+from benchmarks.fake_firestore import FakeFirestore
+from services.auth_service import AuthService
+from services.rate_limit import (
+    AdmissionController, InMemoryRateLimitBackend, RateLimitBackend, RateLimited, client_key, parse_networks
+)
+
+pytestmark = pytest.mark.anyio
+
+PROXIES = parse_networks("10.0.0.0/8, 127.0.0.1")
+
+
+def request(host: str, forwarded: str | None = None, authorization: str | None = None) -> Request:
+    headers = []
+    if forwarded is not None:
+        headers.append((b"x-forwarded-for", forwarded.encode()))
+    if authorization is not None:
+        headers.append((b"authorization", authorization.encode()))
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (host, 50000)})
+
+
+class BrokenBackend(RateLimitBackend):
+    async def take(self, key, rate, burst, cost=1.0):
+        raise ConnectionError("redis down")
+
+
+async def test_bucket_allows_burst_then_reports_wait():
+    backend = InMemoryRateLimitBackend()
+    assert [await backend.take("k", rate=0.5, burst=3) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await backend.take("k", rate=0.5, burst=3) == pytest.approx(2.0, abs=0.01)
+    # Each key has its own bucket
+    assert await backend.take("other", rate=0.5, burst=3) == 0.0
+
+
+async def test_bucket_refills_at_rate():
+    backend = InMemoryRateLimitBackend()
+    await backend.take("k", rate=100, burst=1)
+    assert await backend.take("k", rate=100, burst=1) > 0
+    await asyncio.sleep(0.05)
+    assert await backend.take("k", rate=100, burst=1) == 0.0
+
+
+async def test_least_recently_used_buckets_are_dropped():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        await backend.take(key, rate=1, burst=1)
+    assert len(backend) == 2
+    assert set(backend._buckets) == {"a", "c"}
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers():
+    assert client_key(request("203.0.113.9", forwarded="198.51.100.1"), trusted_proxies=PROXIES) == "ip:203.0.113.9"
+
+
+def test_nearest_untrusted_hop_is_the_client():
+    forwarded = "198.51.100.1, 192.0.2.44, 10.1.2.3"
+    assert client_key(request("127.0.0.1", forwarded=forwarded), trusted_proxies=PROXIES) == "ip:192.0.2.44"
+
+
+def test_user_id_takes_precedence_over_address():
+    assert client_key(request("127.0.0.1"), "uid-1", trusted_proxies=PROXIES) == "user:uid-1"
+
+
+@pytest.fixture
+def auth(monkeypatch) -> AuthService:
+    firestore = FakeFirestore()
+    firestore.documents["users"] = {"citizen-1": {"role": "citizen"}}
+
+    def verify(token: str) -> dict:
+        if token != "good-token":
+            raise ValueError("bad signature")
+        return {"uid": "citizen-1"}
+
+    auth = AuthService(verifier=verify)
+    auth.bind(firestore)
+    monkeypatch.setattr(main, "auth_service", auth)
+    return auth
+
+
+async def test_verified_key_uses_the_token_uid(auth):
+    assert await main.verified_client_key(request("203.0.113.9", authorization="Bearer good-token")) == "user:citizen-1"
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer forged", "Basic abc"])
+async def test_unverified_callers_are_keyed_by_address(auth, authorization):
+    assert await main.verified_client_key(request("203.0.113.9", authorization=authorization)) == "ip:203.0.113.9"
+
+
+async def test_admission_rejects_clients_over_their_budget():
+    admission = AdmissionController(InMemoryRateLimitBackend(), rate=0.1, burst=1, max_in_flight=10)
+    await admission.check_client("ip:a")
+    with pytest.raises(RateLimited) as exc:
+        await admission.check_client("ip:a")
+
+    assert exc.value.reason == "client"
+    assert AdmissionController.retry_after_header(exc.value) == "10"
+    assert admission.counters["rejected_client"] == 1
+
+
+async def test_admission_caps_requests_in_flight():
+    admission = AdmissionController(InMemoryRateLimitBackend(), rate=100, burst=100, max_in_flight=1)
+    async with admission.guard("ip:a"):
+        with pytest.raises(RateLimited) as exc:
+            async with admission.guard("ip:b"):
+                pass
+        assert exc.value.reason == "global"
+
+    # The slot is released on exit, including after a rejection
+    assert admission.in_flight == 0
+    async with admission.guard("ip:b"):
+        assert admission.stats()["in_flight"] == 1
+
+
+async def test_backend_outage_admits_requests():
+    admission = AdmissionController(BrokenBackend(), rate=1, burst=1, max_in_flight=1)
+    await admission.check_client("ip:a")
+    await admission.check_client("ip:a")
+    assert admission.counters["rejected_client"] == 0
+
+
+async def test_disabled_admission_never_rejects():
+    admission = AdmissionController(InMemoryRateLimitBackend(), rate=0.001, burst=1, max_in_flight=0, enabled=False)
+    for _ in range(3):
+        async with admission.guard("ip:a"):
+            pass
+    assert admission.counters["admitted"] == 3
@@ -0,0 +1,117 @@
+"""
+ResilientCaller and AIService against the fault-injecting stub NIM, served in-process over ASGI.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.stub_nim import create_stub_app
+from services import resilience
+from services.ai_service import AIService
+from services.resilience import CircuitBreaker, ResilientCaller
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [{"role": "user", "content": "Summarise: garbage not collected for a week"}]
+
+
+def make_service(stub, failure_threshold: int = 100, reset_timeout: float = 60.0, **caller_kwargs) -> AIService:
+    service = AIService()
+    service.api_key = "test"
+    service.invoke_url = "http://stub/v1/chat/completions"
+    service.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub))
+    caller_kwargs.setdefault("backoff_base", 0.001)
+    service.resilience = ResilientCaller(CircuitBreaker(failure_threshold, reset_timeout), **caller_kwargs)
+    return service
+
+
+async def test_retries_stop_at_limit():
+    stub = create_stub_app(fail_rate=1.0, fail_status=503)
+    service = make_service(stub, max_retries=2)
+
+    assert await service._call_nvidia_api(MESSAGES) is None
+    assert stub.state.requests == 3
+    assert service.resilience.counters["retries"] == 2
+    await service.shutdown()
+
+
+async def test_breaker_opens_and_serves_fallback():
+    stub = create_stub_app(fail_rate=1.0, fail_status=503)
+    service = make_service(stub, failure_threshold=3, max_retries=0)
+
+    for _ in range(3):
+        assert await service._call_nvidia_api(MESSAGES) is None
+    assert service.resilience.breaker.state == "open"
+
+    # Open breaker: the fallback is served without touching the upstream
+    assert await service.translate("breaker fallback check", "te", "en") == "[Mock Translation] breaker fallback check"
+    assert stub.state.requests == 3
+    assert service.resilience.counters["short_circuited"] == 1
+    await service.shutdown()
+
+
+async def test_half_open_probe_recovers():
+    stub = create_stub_app(fail_rate=1.0, fail_status=503)
+    service = make_service(stub, failure_threshold=1, reset_timeout=0.05, max_retries=0)
+
+    assert await service._call_nvidia_api(MESSAGES) is None
+    assert service.resilience.breaker.state == "open"
+
+    stub.state.faults.update(fail_rate=0.0)
+    await asyncio.sleep(0.06)
+    assert await service._call_nvidia_api(MESSAGES) == "Stub response"
+    assert service.resilience.breaker.state == "closed"
+    await service.shutdown()
+
+
+async def test_half_open_probe_resolved_by_client_error():
+    stub = create_stub_app(fail_rate=1.0, fail_status=503)
+    service = make_service(stub, failure_threshold=1, reset_timeout=0.05, max_retries=0)
+    await service._call_nvidia_api(MESSAGES)
+
+    # A 400 means the upstream is answering; neither path may leave the probe stuck in flight
+    stub.state.faults.update(fail_status=400)
+    await asyncio.sleep(0.06)
+    assert [delta async for delta in service._stream_nvidia_api(MESSAGES)] == []
+    assert service.resilience.breaker.state == "closed"
+
+    service.resilience.breaker.record_failure()
+    await asyncio.sleep(0.06)
+    assert await service._call_nvidia_api(MESSAGES) is None
+    assert service.resilience.breaker.state == "closed"
+    await service.shutdown()
+
+
+async def test_cancelled_probe_is_released():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    caller = ResilientCaller(breaker, max_retries=0)
+    breaker.record_failure()
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    probe = asyncio.create_task(caller.call(hang))
+    await asyncio.sleep(0.01)
+    assert not breaker.allow()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.allow()
+
+
+async def test_retry_after_is_honoured(monkeypatch):
+    stub = create_stub_app(fail_rate=1.0, fail_status=429, retry_after=0.3)
+    service = make_service(stub, max_retries=2, backoff_max=4.0)
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(seconds):
+        delays.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(resilience.asyncio, "sleep", record_sleep)
+    assert await service._call_nvidia_api(MESSAGES) is None
+    assert delays == [0.3, 0.3]
+    assert stub.state.requests == 3
+    await service.shutdown()
@@ -0,0 +1,38 @@
+"""
+STTService's worker pool with the mock engine run pooled: language checks and recovery from a dead worker.
+"""
+import os
+import signal
+
+import pytest
+
+from services.stt_service import MockSTTEngine, STTService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def service():
+    service = STTService(engine_name="mock", workers=2)
+    # The mock engine normally runs in-process; pool it to exercise the worker processes
+    service.engine.pooled = True
+    yield service
+    service.shutdown()
+
+
+async def test_unsupported_language_is_rejected_before_the_pool(service):
+    with pytest.raises(ValueError):
+        await service.transcribe("unused.wav", "fr")
+    assert service.pool is None
+
+
+async def test_killed_worker_is_replaced_and_job_retried(service):
+    await service.warm_up()
+    for pid in list(service.pool._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    text = await service.transcribe("unused.wav", "en")
+
+    assert text == MockSTTEngine.TRANSCRIPTS["en"]
+    assert service.counters["pool_restarts"] == 1
+    assert service.counters["failed"] == 0
@@ -0,0 +1,99 @@
+"""
+FirestoreWriteQueue against the in-memory Firestore fake: batching, the per-write replay of a rejected
+batch, merge/delete ops and the dead-letter log.
+"""
+import json
+
+import pytest
+from google.cloud.firestore_v1.transforms import Increment
+
+from benchmarks.fake_firestore import FakeFirestore
+from services.write_queue import DeadLetterLog, FirestoreWriteQueue
+
+pytestmark = pytest.mark.anyio
+
+
+def make_queue(db: FakeFirestore, **options) -> FirestoreWriteQueue:
+    queue = FirestoreWriteQueue(flush_interval=options.pop("flush_interval", 0.05), **options)
+    queue.start(db)
+    return queue
+
+
+async def test_enqueue_before_start_is_an_error():
+    queue = FirestoreWriteQueue()
+    with pytest.raises(RuntimeError):
+        await queue.enqueue("complaints", {"n": 1})
+
+
+async def test_writes_are_committed_in_batches_of_max_batch():
+    db = FakeFirestore()
+    queue = make_queue(db, max_batch=4)
+    ids = [await queue.enqueue("complaints", {"n": i}) for i in range(10)]
+    await queue.stop()
+
+    stored = db.documents["complaints"]
+    assert sorted(stored) == sorted(ids)
+    assert {stored[doc_id]["n"] for doc_id in ids} == set(range(10))
+    assert db.commits == 3
+    assert queue.counters["written"] == 10
+    assert queue.counters["dead_lettered"] == 0
+
+
+async def test_rejected_batch_dead_letters_only_the_bad_write():
+    db = FakeFirestore()
+    queue = make_queue(db)
+    first = await queue.enqueue("complaints", {"n": 1})
+    await queue.enqueue_update("complaints", "missing", {"status": "resolved"})
+    second = await queue.enqueue("complaints", {"n": 2})
+    await queue.stop()
+
+    assert set(db.documents["complaints"]) == {first, second}
+    assert queue.counters["split_batches"] == 1
+    assert queue.counters["dead_lettered"] == 1
+    [record] = queue.dead_letters.records
+    assert record["op"] == "update"
+    assert record["path"] == "complaints/missing"
+    assert record["error"].startswith("NotFound")
+
+
+async def test_transient_failures_dead_letter_the_batch_after_retries():
+    db = FakeFirestore(fail_rate=1.0)
+    queue = make_queue(db, max_retries=0)
+    await queue.enqueue("complaints", {"n": 1})
+    await queue.enqueue("complaints", {"n": 2})
+    await queue.stop()
+
+    assert "complaints" not in db.documents
+    # Not a permanent error, so the batch isn't split into single writes
+    assert queue.counters["split_batches"] == 0
+    assert queue.counters["dead_lettered"] == 2
+
+
+async def test_merge_increments_nested_counters_and_delete_removes():
+    db = FakeFirestore()
+    db.documents["stats"] = {"complaints": {"total": 2, "status": {"pending": 2}}}
+    db.documents["complaints"] = {"c1": {"status": "pending"}}
+    queue = make_queue(db)
+    await queue.enqueue_merge("stats", "complaints", {"status": {"pending": Increment(-1), "resolved": Increment(1)}})
+    await queue.enqueue_merge("stats", "complaints", {"category": {"road.potholes": Increment(1)}})
+    await queue.enqueue_delete("complaints", "c1")
+    await queue.stop()
+
+    assert db.documents["stats"]["complaints"] == {
+        "total": 2,
+        "status": {"pending": 1, "resolved": 1},
+        "category": {"road.potholes": 1},
+    }
+    assert db.documents["complaints"] == {}
+
+
+async def test_dead_letters_are_appended_to_the_log_file(tmp_path):
+    path = tmp_path / "dead_letters.jsonl"
+    queue = make_queue(FakeFirestore(), dead_letters=DeadLetterLog(str(path)))
+    await queue.enqueue_update("complaints", "missing", {"upvotes": Increment(1)})
+    await queue.stop()
+
+    [line] = path.read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    assert record["path"] == "complaints/missing"
+    assert record["data"] == {"upvotes": {"$transform": "Increment", "value": 1}}
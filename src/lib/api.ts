@@ -0,0 +1,43 @@
+import { auth } from '@/lib/firebase';
+import { Complaint } from '@/types';
+
+// Firebase ID token for backend endpoints that check who is calling
+export async function authHeaders(): Promise<Record<string, string>> {
+  const token = await auth.currentUser?.getIdToken();
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
+
+// Backend call as the signed-in user; throws with the server's detail on a non-2xx response
+export async function apiRequest(path: string, init: RequestInit = {}): Promise<any> {
+  const apiBaseUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+  const res = await fetch(`${apiBaseUrl}${path}`, {
+    ...init,
+    headers: { ...(init.body ? { 'Content-Type': 'application/json' } : {}), ...(await authHeaders()), ...init.headers },
+  });
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({}));
+    throw new Error(body.detail || `Request failed (${res.status})`);
+  }
+  return res.json();
+}
+
+export interface ComplaintPage {
+  items: Complaint[];
+  nextCursor: string | null;
+}
+
+// The list API sends timestamps as ISO strings
+export const toComplaint = (item: any): Complaint => ({
+  ...item,
+  createdAt: item.createdAt ? new Date(item.createdAt) : undefined,
+  updatedAt: item.updatedAt ? new Date(item.updatedAt) : undefined,
+  resolvedAt: item.resolvedAt ? new Date(item.resolvedAt) : undefined
+});
+
+// One newest-first page from /api/v1/complaints; pass the previous page's nextCursor to continue
+export async function fetchComplaintPage(filters: Record<string, string>, cursor: string | null, pageSize = 20): Promise<ComplaintPage> {
+  const params = new URLSearchParams({ ...filters, limit: String(pageSize) });
+  if (cursor) params.set('cursor', cursor);
+  const page: { items: any[]; nextCursor: string | null } = await apiRequest(`/api/v1/complaints?${params}`);
+  return { items: page.items.map(toComplaint), nextCursor: page.nextCursor };
+}
@@ -3,8 +3,11 @@ import { useAuth } from '@/contexts/AuthContext';
 import { useLanguage } from '@/contexts/LanguageContext';
 import { Layout } from '@/components/layout/Layout';
 import { db } from '@/lib/firebase';
-import { collection, query, orderBy, onSnapshot, doc, updateDoc, deleteDoc } from 'firebase/firestore';
-import { Complaint, User, UserRole, ComplaintStatus, CATEGORY_LABELS, STATUS_LABELS } from '@/types';
+import {
+  collection, query, orderBy, where, limit, startAfter, getDocs, doc, updateDoc, QueryDocumentSnapshot
+} from 'firebase/firestore';
+import { apiRequest, fetchComplaintPage } from '@/lib/api';
+import { Complaint, User, UserRole, ComplaintStatus, DashboardStats, CATEGORY_LABELS, STATUS_LABELS } from '@/types';
 import { Button } from '@/components/ui/button';
 import { toast } from 'sonner';
 import {
@@ -39,58 +42,107 @@ const statusConfig: Record<ComplaintStatus, { icon: any; color: string; bgClass:
   closed: { icon: CheckCircle2, color: 'text-status-closed', bgClass: 'bg-gray-100 text-gray-800' },
 };
 
+const PAGE_SIZE = 20;
+const USERS_PAGE_SIZE = 50;
+
+const toUser = (snapshot: QueryDocumentSnapshot): User => ({
+  id: snapshot.id,
+  ...snapshot.data(),
+  createdAt: snapshot.data().createdAt?.toDate()
+}) as User;
+
 export default function AdminDashboard() {
   const { user } = useAuth();
   const { language } = useLanguage();
   const [activeTab, setActiveTab] = useState<'complaints' | 'users'>('complaints');
   const [complaints, setComplaints] = useState<Complaint[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingComplaints, setLoadingComplaints] = useState(false);
   const [users, setUsers] = useState<User[]>([]);
-  const [loading, setLoading] = useState(true);
+  const [lastUserDoc, setLastUserDoc] = useState<QueryDocumentSnapshot | null>(null);
+  const [hasMoreUsers, setHasMoreUsers] = useState(true);
+  const [employees, setEmployees] = useState<User[]>([]);
+  const [stats, setStats] = useState<DashboardStats | null>(null);
 
   // Filters
   const [statusFilter, setStatusFilter] = useState<ComplaintStatus | 'all'>('all');
   const [searchQuery, setSearchQuery] = useState('');
 
+  const apiBaseUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+  // Aggregated counts from the backend, so the page never has to load every complaint to count them
   useEffect(() => {
-    // Only Admin
     if (user?.role !== 'admin') return;
+    const fetchStats = () => {
+      fetch(`${apiBaseUrl}/api/v1/stats`)
+        .then(res => (res.ok ? res.json() : Promise.reject(res.status)))
+        .then((data: DashboardStats) => setStats(data))
+        .catch(err => console.warn('Stats unavailable:', err));
+    };
+    fetchStats();
+    const intervalId = setInterval(fetchStats, 30000);
+    return () => clearInterval(intervalId);
+  }, [user]);
 
-    // Fetch Complaints
-    const qComplaints = query(collection(db, 'complaints'), orderBy('createdAt', 'desc'));
-    const unsubComplaints = onSnapshot(qComplaints, (snapshot) => {
-      const data = snapshot.docs.map(doc => ({
-        id: doc.id,
-        ...doc.data(),
-        createdAt: doc.data().createdAt?.toDate(),
-        updatedAt: doc.data().updatedAt?.toDate()
-      })) as Complaint[];
-      setComplaints(data);
-    });
+  // Newest-first pages from the backend list API; the status filter is applied server-side
+  const loadComplaints = async (cursor: string | null) => {
+    setLoadingComplaints(true);
+    try {
+      const page = await fetchComplaintPage(statusFilter !== 'all' ? { status: statusFilter } : {}, cursor, PAGE_SIZE);
+      const items = page.items;
+      setComplaints(prev => (cursor ? [...prev, ...items] : items));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error(err);
+      toast.error("Failed to load complaints");
+    } finally {
+      setLoadingComplaints(false);
+    }
+  };
 
-    // Fetch Users
-    const qUsers = query(collection(db, 'users'), orderBy('createdAt', 'desc'));
-    const unsubUsers = onSnapshot(qUsers, (snapshot) => {
-      const data = snapshot.docs.map(doc => ({
-        id: doc.id,
-        ...doc.data(),
-        createdAt: doc.data().createdAt?.toDate()
-      })) as User[];
-      setUsers(data);
-      setLoading(false);
-    });
+  useEffect(() => {
+    if (user?.role !== 'admin') return;
+    loadComplaints(null);
+  }, [user, statusFilter]);
 
-    return () => {
-      unsubComplaints();
-      unsubUsers();
-    };
+  // Employees for the assignment picker
+  useEffect(() => {
+    if (user?.role !== 'admin') return;
+    getDocs(query(collection(db, 'users'), where('role', '==', 'employee')))
+      .then(snapshot => setEmployees(snapshot.docs.map(toUser)))
+      .catch(err => console.error('Failed to load employees:', err));
   }, [user]);
 
+  const loadUsers = async (after: QueryDocumentSnapshot | null) => {
+    try {
+      const constraints = [orderBy('createdAt', 'desc'), ...(after ? [startAfter(after)] : []), limit(USERS_PAGE_SIZE)];
+      const snapshot = await getDocs(query(collection(db, 'users'), ...constraints));
+      setUsers(prev => (after ? [...prev, ...snapshot.docs.map(toUser)] : snapshot.docs.map(toUser)));
+      setLastUserDoc(snapshot.docs[snapshot.docs.length - 1] ?? after);
+      setHasMoreUsers(snapshot.docs.length === USERS_PAGE_SIZE);
+    } catch (err) {
+      console.error(err);
+      toast.error("Failed to load users");
+    }
+  };
+
+  useEffect(() => {
+    if (user?.role !== 'admin' || activeTab !== 'users' || users.length > 0) return;
+    loadUsers(null);
+  }, [user, activeTab]);
+
+  // No live listener, so apply our own writes to the loaded page
+  const patchComplaint = (complaintId: string, changes: Partial<Complaint>) => {
+    setComplaints(prev => prev.map(c => (c.id === complaintId ? { ...c, ...changes } : c)));
+  };
+
   const handleUpdateStatus = async (complaintId: string, newStatus: ComplaintStatus) => {
     try {
-      await updateDoc(doc(db, 'complaints', complaintId), {
-        status: newStatus,
-        updatedAt: new Date()
+      await apiRequest(`/api/v1/complaints/${complaintId}`, {
+        method: 'PATCH',
+        body: JSON.stringify({ status: newStatus })
       });
+      patchComplaint(complaintId, { status: newStatus });
       toast.success("Status updated successfully");
     } catch (err) {
       toast.error("Failed to update status");
@@ -99,11 +151,11 @@ export default function AdminDashboard() {
 
   const handleAssign = async (complaintId: string, employeeId: string) => {
     try {
-      await updateDoc(doc(db, 'complaints', complaintId), {
-        assignedTo: employeeId,
-        status: 'in_progress',
-        updatedAt: new Date()
+      await apiRequest(`/api/v1/complaints/${complaintId}`, {
+        method: 'PATCH',
+        body: JSON.stringify({ assignedTo: employeeId, status: 'in_progress' })
       });
+      patchComplaint(complaintId, { assignedTo: employeeId, status: 'in_progress' });
       toast.success("Assigned to employee");
     } catch (e) {
       toast.error("Failed to assign");
@@ -113,7 +165,8 @@ export default function AdminDashboard() {
   const handleDeleteComplaint = async (complaintId: string) => {
     if (!confirm("Are you sure you want to delete this complaint? This cannot be undone.")) return;
     try {
-      await deleteDoc(doc(db, 'complaints', complaintId));
+      await apiRequest(`/api/v1/complaints/${complaintId}`, { method: 'DELETE' });
+      setComplaints(prev => prev.filter(c => c.id !== complaintId));
       toast.success("Complaint deleted");
     } catch (e) {
       toast.error("Failed to delete complaint");
@@ -123,6 +176,12 @@ export default function AdminDashboard() {
   const handleUpdateRole = async (targetUserId: string, newRole: UserRole) => {
     try {
       await updateDoc(doc(db, 'users', targetUserId), { role: newRole });
+      const target = users.find(u => u.id === targetUserId);
+      setUsers(prev => prev.map(u => (u.id === targetUserId ? { ...u, role: newRole } : u)));
+      setEmployees(prev => {
+        const others = prev.filter(u => u.id !== targetUserId);
+        return newRole === 'employee' && target ? [...others, { ...target, role: newRole }] : others;
+      });
       toast.success(`User role updated to ${newRole}`);
     } catch (e) {
       toast.error("Failed to update user role");
@@ -136,8 +195,6 @@ export default function AdminDashboard() {
     return matchStatus && matchSearch;
   });
 
-  const employees = users.filter(u => u.role === 'employee');
-
   if (!user || user.role !== 'admin') {
     return (
       <Layout>
@@ -186,24 +243,24 @@ export default function AdminDashboard() {
             <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
               <div className="card-civic p-4 text-center">
                 <h3 className="text-muted-foreground text-sm font-medium">Total</h3>
-                <p className="text-2xl font-bold">{complaints.length}</p>
+                <p className="text-2xl font-bold">{stats?.totalComplaints ?? '—'}</p>
               </div>
               <div className="card-civic p-4 text-center border-yellow-500/20 bg-yellow-500/5">
                 <h3 className="text-yellow-600 text-sm font-medium">Pending</h3>
                 <p className="text-2xl font-bold text-yellow-700">
-                  {complaints.filter(c => c.status === 'pending').length}
+                  {stats?.pendingComplaints ?? '—'}
                 </p>
               </div>
               <div className="card-civic p-4 text-center border-blue-500/20 bg-blue-500/5">
                 <h3 className="text-blue-600 text-sm font-medium">In Progress</h3>
                 <p className="text-2xl font-bold text-blue-700">
-                  {complaints.filter(c => c.status === 'in_progress').length}
+                  {stats?.inProgressComplaints ?? '—'}
                 </p>
               </div>
               <div className="card-civic p-4 text-center border-green-500/20 bg-green-500/5">
                 <h3 className="text-green-600 text-sm font-medium">Resolved</h3>
                 <p className="text-2xl font-bold text-green-700">
-                  {complaints.filter(c => c.status === 'resolved').length}
+                  {stats?.resolvedComplaints ?? '—'}
                 </p>
               </div>
             </div>
@@ -290,7 +347,7 @@ export default function AdminDashboard() {
                       </Select>
                     ) : (
                       <div className="text-xs text-muted-foreground bg-blue-50 p-1 rounded border border-blue-100">
-                        Assigned to: {users.find(u => u.id === complaint.assignedTo)?.name || 'Unknown'}
+                        Assigned to: {employees.find(u => u.id === complaint.assignedTo)?.name || 'Unknown'}
                       </div>
                     )}
 
@@ -312,11 +369,17 @@ export default function AdminDashboard() {
                   </div>
                 </div>
               ))}
-              {filteredComplaints.length === 0 && (
+              {filteredComplaints.length === 0 && !loadingComplaints && (
                 <div className="text-center py-12 text-muted-foreground">
                   No complaints found matching filters.
                 </div>
               )}
+              {nextCursor && (
+                <Button variant="outline" disabled={loadingComplaints} onClick={() => loadComplaints(nextCursor)}>
+                  <ChevronDown className="mr-2 h-4 w-4" />
+                  {loadingComplaints ? 'Loading...' : 'Load more'}
+                </Button>
+              )}
             </div>
           </div>
         )}
@@ -378,6 +441,12 @@ export default function AdminDashboard() {
                 </table>
               </div>
             </div>
+            {hasMoreUsers && users.length > 0 && (
+              <Button variant="outline" onClick={() => loadUsers(lastUserDoc)}>
+                <ChevronDown className="mr-2 h-4 w-4" />
+                Load more
+              </Button>
+            )}
           </div>
         )}
       </div>
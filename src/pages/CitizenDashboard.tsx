@@ -12,7 +12,7 @@ import {
   STATUS_LABELS
 } from '@/types';
 import { db } from '@/lib/firebase';
-import { collection, query, where, onSnapshot, orderBy } from 'firebase/firestore';
+import { collection, query, where, getCountFromServer } from 'firebase/firestore';
 import {
   Plus,
   FileText,
@@ -25,7 +25,8 @@ import {
   TrendingUp,
   Mic,
   Pencil,
-  Trash2
+  Trash2,
+  ChevronDown
 } from 'lucide-react';
 import {
   Dialog,
@@ -37,7 +38,8 @@ import {
 } from "@/components/ui/dialog";
 import { Input } from '@/components/ui/input';
 import { Textarea } from '@/components/ui/textarea';
-import { doc, deleteDoc, updateDoc } from 'firebase/firestore';
+import { doc, updateDoc } from 'firebase/firestore';
+import { apiRequest, fetchComplaintPage } from '@/lib/api';
 import { toast } from 'sonner';
 
 const statusConfig: Record<ComplaintStatus, { icon: typeof Clock; color: string; bgClass: string }> = {
@@ -61,6 +63,7 @@ export default function CitizenDashboard() {
     avgResolutionTime: 0,
   });
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   // Edit State
   const [editingComplaint, setEditingComplaint] = useState<Complaint | null>(null);
@@ -74,44 +77,48 @@ export default function CitizenDashboard() {
     }
 
     if (!user) return;
+    loadComplaints(null);
+    loadStats();
+  }, [isAuthenticated, navigate, user]);
 
-    const q = query(
-      collection(db, 'complaints'),
-      where('userId', '==', user.id)
-      // orderBy('createdAt', 'desc') // Requires index for compound query with where
-    );
-
-    const unsubscribe = onSnapshot(q, (snapshot) => {
-      const fetchedComplaints = snapshot.docs.map(doc => {
-        const data = doc.data();
-        return {
-          id: doc.id,
-          ...data,
-          createdAt: data.createdAt?.toDate() || new Date(),
-          updatedAt: data.updatedAt?.toDate() || new Date(),
-          resolvedAt: data.resolvedAt?.toDate(),
-        } as Complaint;
-      });
-
-      // Sort manually until index is created
-      fetchedComplaints.sort((a, b) => b.createdAt.getTime() - a.createdAt.getTime());
-
-      setComplaints(fetchedComplaints);
-
-      // Calculate stats
-      const newStats = {
-        totalComplaints: fetchedComplaints.length,
-        pendingComplaints: fetchedComplaints.filter(c => c.status === 'pending').length,
-        inProgressComplaints: fetchedComplaints.filter(c => c.status === 'in_progress').length,
-        resolvedComplaints: fetchedComplaints.filter(c => c.status === 'resolved' || c.status === 'closed').length,
-        avgResolutionTime: 0, // Placeholder calculation
-      };
-      setStats(newStats);
+  // Newest-first pages from the backend list API, which only ever returns the caller's own complaints
+  const loadComplaints = async (cursor: string | null) => {
+    setLoading(true);
+    try {
+      const page = await fetchComplaintPage({}, cursor);
+      setComplaints(prev => (cursor ? [...prev, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error(err);
+      toast.error("Failed to load complaints");
+    } finally {
       setLoading(false);
-    });
+    }
+  };
 
-    return () => unsubscribe();
-  }, [isAuthenticated, navigate, user]);
+  // Count queries are billed per 1000 index entries, so the cards stay right without loading every complaint
+  const loadStats = async () => {
+    if (!user) return;
+    const mine = (...statuses: ComplaintStatus[]) => getCountFromServer(query(
+      collection(db, 'complaints'),
+      where('userId', '==', user.id),
+      ...(statuses.length ? [where('status', 'in', statuses)] : [])
+    )).then(snapshot => snapshot.data().count);
+    try {
+      const [total, pending, inProgress, resolved] = await Promise.all([
+        mine(), mine('pending'), mine('in_progress'), mine('resolved', 'closed')
+      ]);
+      setStats({
+        totalComplaints: total,
+        pendingComplaints: pending,
+        inProgressComplaints: inProgress,
+        resolvedComplaints: resolved,
+        avgResolutionTime: 0, // Placeholder calculation
+      });
+    } catch (err) {
+      console.warn('Complaint counts unavailable:', err);
+    }
+  };
 
   if (!user) return null;
 
@@ -126,7 +133,9 @@ export default function CitizenDashboard() {
   const handleDeleteClick = async (id: string) => {
     if (!confirm("Are you sure you want to delete this complaint?")) return;
     try {
-      await deleteDoc(doc(db, 'complaints', id));
+      await apiRequest(`/api/v1/complaints/${id}`, { method: 'DELETE' });
+      setComplaints(prev => prev.filter(c => c.id !== id));
+      loadStats();
       toast.success("Complaint deleted successfully");
     } catch (e) {
       toast.error("Failed to delete complaint");
@@ -147,6 +156,8 @@ export default function CitizenDashboard() {
         description: editForm.description,
         updatedAt: new Date()
       });
+      const changes = { title: editForm.title, description: editForm.description };
+      setComplaints(prev => prev.map(c => (c.id === editingComplaint.id ? { ...c, ...changes } : c)));
       toast.success("Complaint updated");
       setEditingComplaint(null);
     } catch (e) {
@@ -342,6 +353,12 @@ export default function CitizenDashboard() {
                   </div>
                 );
               })}
+              {nextCursor && (
+                <Button variant="outline" className="w-full" disabled={loading} onClick={() => loadComplaints(nextCursor)}>
+                  <ChevronDown className="mr-2 h-4 w-4" />
+                  {loading ? 'Loading...' : 'Load more'}
+                </Button>
+              )}
             </div>
           )}
         </div>
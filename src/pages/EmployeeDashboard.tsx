@@ -1,15 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/contexts/AuthContext';
 import { Layout } from '@/components/layout/Layout';
-import { db } from '@/lib/firebase';
-import {
-  collection,
-  query,
-  where,
-  onSnapshot,
-  doc,
-  updateDoc,
-} from 'firebase/firestore';
+import { apiRequest, fetchComplaintPage } from '@/lib/api';
 import { Complaint, ComplaintStatus } from '@/types';
 import { Button } from '@/components/ui/button';
 import { toast } from 'sonner';
@@ -22,7 +14,8 @@ import {
   X,
   Upload,
   QrCode,
-  AlertTriangle
+  AlertTriangle,
+  ChevronDown
 } from 'lucide-react';
 import { Html5QrcodeScanner } from 'html5-qrcode';
 import { Input } from '@/components/ui/input';
@@ -37,6 +30,13 @@ import {
 } from "@/components/ui/dialog";
 import { Textarea } from '@/components/ui/textarea';
 
+// In-progress tasks first, then newest first
+const sortTasks = (tasks: Complaint[]) => [...tasks].sort((a, b) => {
+  if (a.status === 'in_progress' && b.status !== 'in_progress') return -1;
+  if (a.status !== 'in_progress' && b.status === 'in_progress') return 1;
+  return (b.createdAt?.getTime() ?? 0) - (a.createdAt?.getTime() ?? 0);
+});
+
 export default function EmployeeDashboard() {
   const { user } = useAuth();
   const [complaints, setComplaints] = useState<Complaint[]>([]);
@@ -44,6 +44,8 @@ export default function EmployeeDashboard() {
   const [resolutionNote, setResolutionNote] = useState('');
   const [resolutionImage, setResolutionImage] = useState<string | null>(null);
   const [isSubmitting, setIsSubmitting] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loading, setLoading] = useState(false);
 
   // Scanner State
   const [isScanning, setIsScanning] = useState(false);
@@ -54,35 +56,25 @@ export default function EmployeeDashboard() {
 
   useEffect(() => {
     if (!user || user.role !== 'employee') return;
-
-    // Fetch complaints assigned to this employee
-    const q = query(
-      collection(db, 'complaints'),
-      where('assignedTo', '==', user.id)
-    );
-
-    const unsubscribe = onSnapshot(q, (snapshot) => {
-      const data = snapshot.docs.map((doc) => ({
-        id: doc.id,
-        ...doc.data(),
-        createdAt: doc.data().createdAt?.toDate(),
-        updatedAt: doc.data().updatedAt?.toDate(),
-      })) as Complaint[];
-
-      // Sort by status (in_progress first) then date
-      data.sort((a, b) => {
-        if (a.status === 'in_progress' && b.status !== 'in_progress') return -1;
-        if (a.status !== 'in_progress' && b.status === 'in_progress') return 1;
-        return b.createdAt.getTime() - a.createdAt.getTime();
-      });
-
-      setComplaints(data);
-    });
-
-    return () => unsubscribe();
-    return () => unsubscribe();
+    loadComplaints(null);
   }, [user]);
 
+  // Complaints assigned to this employee, newest first, a page at a time from the backend list API
+  const loadComplaints = async (cursor: string | null) => {
+    if (!user) return;
+    setLoading(true);
+    try {
+      const page = await fetchComplaintPage({ assignedTo: user.id }, cursor);
+      setComplaints(prev => sortTasks(cursor ? [...prev, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error(err);
+      toast.error("Failed to load assigned complaints");
+    } finally {
+      setLoading(false);
+    }
+  };
+
   // Handle Scanner Effect
   useEffect(() => {
     if (isScanning && selectedComplaint) {
@@ -160,12 +152,15 @@ export default function EmployeeDashboard() {
       // In a real app, upload resolutionImage to storage here
       // For now, we just update the doc
 
-      await updateDoc(doc(db, 'complaints', selectedComplaint.id), {
-        status: 'resolved',
-        resolvedAt: new Date(),
-        adminNote: resolutionNote,
-        resolutionImage: resolutionImage
+      // The backend stamps resolvedAt and keeps the dashboard counters in step
+      await apiRequest(`/api/v1/complaints/${selectedComplaint.id}`, {
+        method: 'PATCH',
+        body: JSON.stringify({ status: 'resolved', adminNote: resolutionNote, resolutionImage })
       });
+      const resolvedId = selectedComplaint.id;
+      setComplaints(prev => sortTasks(prev.map(c => (
+        c.id === resolvedId ? { ...c, status: 'resolved', resolvedAt: new Date(), adminNote: resolutionNote } : c
+      ))));
 
       toast.success("Complaint marked as resolved!");
       setSelectedComplaint(null);
@@ -288,6 +283,12 @@ export default function EmployeeDashboard() {
               </div>
             ))
           )}
+          {nextCursor && (
+            <Button variant="outline" disabled={loading} onClick={() => loadComplaints(nextCursor)}>
+              <ChevronDown className="mr-2 h-4 w-4" />
+              {loading ? 'Loading...' : 'Load more'}
+            </Button>
+          )}
         </div>
 
         {/* Resolution Dialog */}
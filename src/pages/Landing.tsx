@@ -3,8 +3,7 @@ import { Link, useNavigate } from 'react-router-dom';
 import { useLanguage } from '@/contexts/LanguageContext';
 import { Button } from '@/components/ui/button';
 import { Layout } from '@/components/layout/Layout';
-import { db } from '@/lib/firebase';
-import { collection, query, where, getCountFromServer } from 'firebase/firestore';
+import { DashboardStats } from '@/types';
 import {
   FileText,
   MessageSquare,
@@ -89,27 +88,16 @@ export default function Landing() {
   useEffect(() => {
     const fetchStats = async () => {
       try {
-        const complaintsColl = collection(db, 'complaints');
-        const usersColl = collection(db, 'users');
-
-        // Total Issues
-        const totalSnapshot = await getCountFromServer(complaintsColl);
-        const totalIssues = totalSnapshot.data().count;
-
-        // Resolved Issues
-        const resolvedQuery = query(complaintsColl, where('status', '==', 'resolved'));
-        const resolvedSnapshot = await getCountFromServer(resolvedQuery);
-        const resolvedIssues = resolvedSnapshot.data().count;
-
-        // Field Workers
-        const employeesQuery = query(usersColl, where('role', '==', 'employee'));
-        const employeesSnapshot = await getCountFromServer(employeesQuery);
-        const employees = employeesSnapshot.data().count;
+        // Precomputed aggregates from the backend instead of several count queries per page view
+        const apiBaseUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+        const response = await fetch(`${apiBaseUrl}/api/v1/stats`);
+        if (!response.ok) throw new Error(`Stats request failed: ${response.status}`);
+        const data: DashboardStats = await response.json();
 
         setStats([
-          { value: `${totalIssues}+`, label: 'Issues Reported' },
-          { value: `${resolvedIssues}+`, label: 'Issues Resolved' },
-          { value: `${employees}+`, label: 'Field Workers' },
+          { value: `${data.totalComplaints}+`, label: 'Issues Reported' },
+          { value: `${data.resolvedComplaints}+`, label: 'Issues Resolved' },
+          { value: `${data.fieldWorkers ?? 0}+`, label: 'Field Workers' },
         ]);
       } catch (error) {
         console.error("Error fetching stats:", error);
@@ -18,6 +18,7 @@ import { Progress } from '@/components/ui/progress';
 import { CATEGORY_LABELS, ComplaintCategory, ComplaintPriority } from '@/types';
 import { toast } from 'sonner';
 import { db } from '@/lib/firebase';
+import { authHeaders } from '@/lib/api';
 import { collection, addDoc, Timestamp } from 'firebase/firestore';
 import {
   MapPin,
@@ -320,7 +321,8 @@ export default function NewComplaint() {
         updatedAt: Timestamp.now(),
       };
 
-      await addDoc(collection(db, 'complaints'), complaintData);
+      const docRef = await addDoc(collection(db, 'complaints'), complaintData);
+      registerComplaintLocation(docRef.id);
 
       toast.success('Complaint submitted successfully!');
       navigate('/dashboard');
@@ -332,6 +334,23 @@ export default function NewComplaint() {
     }
   };
 
+  // Keep the backend's duplicate-detection index current for complaints written directly to Firestore.
+  // The backend reads location and category from the stored complaint.
+  const registerComplaintLocation = async (complaintId: string) => {
+    const apiBaseUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+    const body = new FormData();
+    body.append('complaintId', complaintId);
+    try {
+      await fetch(`${apiBaseUrl}/api/v1/complaints/duplicates/register`, {
+        method: 'POST',
+        body,
+        headers: await authHeaders()
+      });
+    } catch (err) {
+      console.warn('Duplicate index registration failed:', err);
+    }
+  };
+
   // Helper to convert data URL to Blob
   const dataURLtoBlob = async (dataurl: string) => {
     const res = await fetch(dataurl);
@@ -396,8 +415,10 @@ export default function NewComplaint() {
       const timeoutId = setTimeout(() => controller.abort(), 35000); // 35 second timeout
 
       try {
-        console.log(`Sending analysis request to ${apiBaseUrl}/api/v1/analyze-image...`);
-        const response = await fetch(`${apiBaseUrl}/api/v1/analyze-image`, {
+        // Single upload: the backend analyses the photo and stores it on Cloudinary in one request
+        console.log(`Sending analysis request to ${apiBaseUrl}/api/v1/ingest-image...`);
+        const analyzedImage = images[0];
+        const response = await fetch(`${apiBaseUrl}/api/v1/ingest-image`, {
           method: 'POST',
           body: formDataUpload,
           signal: controller.signal
@@ -405,8 +426,13 @@ export default function NewComplaint() {
         clearTimeout(timeoutId);
 
         if (response.ok) {
-          const data = await response.json();
+          const { url, analysis: data } = await response.json();
           console.log('Analysis result:', data);
+          // Swap in the stored URL so submit doesn't upload this photo a second time.
+          // url is null when the backend couldn't store it; submit then uploads it as before.
+          if (url) {
+            setImages(prev => prev.map(img => (img === analyzedImage ? url : img)));
+          }
           setFormData(prev => ({
             ...prev,
             title: data.title || prev.title,
@@ -622,7 +648,7 @@ export default function NewComplaint() {
         try {
           const googleMapsLink = `https://www.google.com/maps?q=${location.latitude},${location.longitude}`;
 
-          await addDoc(collection(db, 'complaints'), {
+          const docRef = await addDoc(collection(db, 'complaints'), {
             userId: user!.id,
             title: finalData.title || 'Voice Report',
             description: finalData.description || 'Reported via Voice Assistant',
@@ -640,6 +666,7 @@ export default function NewComplaint() {
             createdAt: Timestamp.now(),
             updatedAt: Timestamp.now(),
           });
+          registerComplaintLocation(docRef.id);
           setVoiceStep('done');
           toast.success('Complaint submitted successfully!');
           setTimeout(() => navigate('/dashboard'), 3000);
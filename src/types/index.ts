@@ -79,7 +79,14 @@ export interface DashboardStats {
   pendingComplaints: number;
   inProgressComplaints: number;
   resolvedComplaints: number;
-  avgResolutionTime: number;
+  avgResolutionTime?: number;
+  fieldWorkers?: number;
+  byStatus?: Partial<Record<ComplaintStatus, number>>;
+  byCategory?: Partial<Record<ComplaintCategory, number>>;
+  byPriority?: Partial<Record<ComplaintPriority, number>>;
+  // Keyed by location.area ("unknown" when unset) and assignee uid ("unassigned")
+  byWard?: Record<string, number>;
+  byAssignee?: Record<string, number>;
 }
 
 export const CATEGORY_LABELS: Record<ComplaintCategory, { en: string; te: string; icon: string }> = {